@@ -12,6 +12,12 @@ from app.models.user import User
 from app.models.appointment import Appointment
 from app.models.service import Service
 from app.models.notification import Notification
+from app.models.stylist_day_lock import StylistDayLock
+from app.models.daily_appointment_stats import DailyAppointmentStats
+from app.models.appointment_reminder import AppointmentReminder
+from app.models.appointment_series import AppointmentSeries
+from app.models.stylist_schedule import StylistSchedule
+from app.models.schedule_override import ScheduleOverride
 
 # this is the Alembic Config object
 config = context.config
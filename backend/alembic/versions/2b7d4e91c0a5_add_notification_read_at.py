@@ -0,0 +1,32 @@
+"""add notifications.read_at and inbox indexes
+
+Revision ID: 2b7d4e91c0a5
+Revises: f1c94a7e3b58
+Create Date: 2026-10-18 17:05:41.218734
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2b7d4e91c0a5'
+down_revision: Union[str, Sequence[str], None] = 'f1c94a7e3b58'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('notifications', sa.Column('read_at', sa.DateTime(timezone=True), nullable=True))
+    op.create_index('ix_notifications_inbox', 'notifications', ['user_id', 'channel', 'id'], unique=False)
+    op.create_index('ix_notifications_unread', 'notifications', ['user_id', 'channel', 'read_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_notifications_unread', table_name='notifications')
+    op.drop_index('ix_notifications_inbox', table_name='notifications')
+    op.drop_column('notifications', 'read_at')
@@ -0,0 +1,28 @@
+"""add appointments date index for paginated listings
+
+Revision ID: 4e8a1d37b2f9
+Revises: 9c4f2a6d81e3
+Create Date: 2026-10-18 19:10:36.871402
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4e8a1d37b2f9'
+down_revision: Union[str, Sequence[str], None] = '9c4f2a6d81e3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_appointments_date', 'appointments', ['date'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_appointments_date', table_name='appointments')
@@ -0,0 +1,58 @@
+"""add appointment_series and appointments.series_id
+
+Revision ID: 7d2c5b9e4a16
+Revises: 4e8a1d37b2f9
+Create Date: 2026-10-18 20:41:57.093215
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7d2c5b9e4a16'
+down_revision: Union[str, Sequence[str], None] = '4e8a1d37b2f9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('appointment_series',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('client_id', sa.Integer(), nullable=True),
+    sa.Column('client_name', sa.String(length=100), nullable=True),
+    sa.Column('client_phone', sa.String(length=20), nullable=True),
+    sa.Column('client_email', sa.String(length=50), nullable=True),
+    sa.Column('stylist_id', sa.Integer(), nullable=False),
+    sa.Column('service_id', sa.Integer(), nullable=False),
+    sa.Column('start', sa.DateTime(), nullable=False),
+    sa.Column('frequency', sa.String(length=10), nullable=False),
+    sa.Column('interval', sa.Integer(), nullable=False),
+    sa.Column('weekdays', sa.String(length=20), nullable=True),
+    sa.Column('count', sa.Integer(), nullable=True),
+    sa.Column('until', sa.DateTime(), nullable=True),
+    sa.Column('status', sa.String(length=30), nullable=False),
+    sa.Column('created_by', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['client_id'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['stylist_id'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['service_id'], ['services.id'], ),
+    sa.ForeignKeyConstraint(['created_by'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_appointment_series_id'), 'appointment_series', ['id'], unique=False)
+    op.add_column('appointments', sa.Column('series_id', sa.Integer(), nullable=True))
+    op.create_foreign_key('fk_appointments_series_id', 'appointments', 'appointment_series', ['series_id'], ['id'])
+    op.create_index('ix_appointments_series_date', 'appointments', ['series_id', 'date'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('fk_appointments_series_id', 'appointments', type_='foreignkey')
+    op.drop_index('ix_appointments_series_date', table_name='appointments')
+    op.drop_column('appointments', 'series_id')
+    op.drop_index(op.f('ix_appointment_series_id'), table_name='appointment_series')
+    op.drop_table('appointment_series')
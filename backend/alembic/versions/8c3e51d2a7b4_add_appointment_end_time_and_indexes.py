@@ -0,0 +1,60 @@
+"""add appointment end_time and composite indexes
+
+Revision ID: 8c3e51d2a7b4
+Revises: 463ca1b9e6ca
+Create Date: 2026-10-18 09:12:41.318204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import mysql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8c3e51d2a7b4'
+down_revision: Union[str, Sequence[str], None] = '463ca1b9e6ca'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Filas por UPDATE al rellenar end_time, para no bloquear la tabla completa
+BACKFILL_CHUNK_SIZE = 10000
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('appointments', sa.Column('end_time', sa.DateTime(), nullable=True))
+
+    # Rellenar end_time = date + duración del servicio, por rangos de id
+    bind = op.get_bind()
+    max_id = bind.execute(sa.text("SELECT COALESCE(MAX(id), 0) FROM appointments")).scalar()
+    for chunk_start in range(0, max_id + 1, BACKFILL_CHUNK_SIZE):
+        bind.execute(
+            sa.text(
+                "UPDATE appointments a "
+                "JOIN services s ON s.id = a.service_id "
+                "SET a.end_time = TIMESTAMPADD(MINUTE, s.duration_min, a.date) "
+                "WHERE a.id >= :chunk_start AND a.id < :chunk_end"
+            ),
+            {"chunk_start": chunk_start, "chunk_end": chunk_start + BACKFILL_CHUNK_SIZE}
+        )
+
+    op.alter_column('appointments', 'end_time',
+               existing_type=mysql.DATETIME(),
+               nullable=False)
+    op.create_index('ix_appointments_stylist_date', 'appointments', ['stylist_id', 'date', 'end_time', 'status'], unique=False)
+    op.create_index('ix_appointments_client_date', 'appointments', ['client_id', 'date'], unique=False)
+    op.create_index('ix_appointments_status_date', 'appointments', ['status', 'date'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # MySQL descarta los índices automáticos de las FK cuando un índice compuesto
+    # las cubre; se recrean antes de eliminar los compuestos
+    op.create_index('stylist_id', 'appointments', ['stylist_id'], unique=False)
+    op.create_index('client_id', 'appointments', ['client_id'], unique=False)
+    op.drop_index('ix_appointments_status_date', table_name='appointments')
+    op.drop_index('ix_appointments_client_date', table_name='appointments')
+    op.drop_index('ix_appointments_stylist_date', table_name='appointments')
+    op.drop_column('appointments', 'end_time')
@@ -0,0 +1,38 @@
+"""add notifications.created_at for retention
+
+Revision ID: 9c4f2a6d81e3
+Revises: 2b7d4e91c0a5
+Create Date: 2026-10-18 18:22:09.504117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9c4f2a6d81e3'
+down_revision: Union[str, Sequence[str], None] = '2b7d4e91c0a5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('notifications', sa.Column('created_at', sa.DateTime(), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=False))
+    # Las filas existentes toman la fecha de envío o, si no tienen, la de creación de la cita
+    op.execute(
+        """
+        UPDATE notifications n
+        JOIN appointments a ON a.id = n.appointment_id
+        SET n.created_at = COALESCE(n.sent_at, a.created_at, n.created_at)
+        """
+    )
+    op.create_index('ix_notifications_created_at', 'notifications', ['created_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_notifications_created_at', table_name='notifications')
+    op.drop_column('notifications', 'created_at')
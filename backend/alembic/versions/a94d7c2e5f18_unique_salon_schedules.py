@@ -0,0 +1,54 @@
+"""enforce one salon-wide schedule and override per day
+
+Revision ID: a94d7c2e5f18
+Revises: c6e0b3a9d452
+Create Date: 2026-10-19 10:05:12.604117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a94d7c2e5f18'
+down_revision: Union[str, Sequence[str], None] = 'c6e0b3a9d452'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (tabla, columna del día, restricción única anterior, restricción única nueva)
+TABLES = (
+    ('stylist_schedules', 'weekday', 'uq_stylist_schedules_stylist_weekday', 'uq_stylist_schedules_owner_weekday'),
+    ('schedule_overrides', 'day', 'uq_schedule_overrides_stylist_day', 'uq_schedule_overrides_owner_day'),
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+    for table, day_column, old_unique, new_unique in TABLES:
+        # MySQL admite varios NULL bajo un índice único: se dejan solo las
+        # filas más recientes del salón antes de crear la restricción nueva
+        bind.execute(sa.text(
+            f"DELETE t FROM {table} t "
+            f"JOIN {table} newer ON newer.stylist_id IS NULL AND newer.{day_column} = t.{day_column} "
+            f"AND newer.id > t.id "
+            f"WHERE t.stylist_id IS NULL"
+        ))
+        op.add_column(table, sa.Column(
+            'owner_id', sa.Integer(), sa.Computed('COALESCE(stylist_id, 0)', persisted=True), nullable=False
+        ))
+        op.create_unique_constraint(new_unique, table, ['owner_id', day_column])
+        # La restricción anterior también era el índice de la FK de stylist_id
+        op.create_index(f'ix_{table}_stylist_id', table, ['stylist_id'], unique=False)
+        op.drop_constraint(old_unique, table, type_='unique')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table, day_column, old_unique, new_unique in TABLES:
+        op.create_unique_constraint(old_unique, table, ['stylist_id', day_column])
+        op.drop_index(f'ix_{table}_stylist_id', table_name=table)
+        op.drop_constraint(new_unique, table, type_='unique')
+        op.drop_column(table, 'owner_id')
@@ -0,0 +1,34 @@
+"""add stylist_day_locks table
+
+Revision ID: b41d07e9f2c6
+Revises: 8c3e51d2a7b4
+Create Date: 2026-10-18 10:03:17.552091
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b41d07e9f2c6'
+down_revision: Union[str, Sequence[str], None] = '8c3e51d2a7b4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('stylist_day_locks',
+    sa.Column('stylist_id', sa.Integer(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('locked_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['stylist_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('stylist_id', 'day')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('stylist_day_locks')
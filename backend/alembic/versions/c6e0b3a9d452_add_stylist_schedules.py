@@ -0,0 +1,55 @@
+"""add stylist_schedules and schedule_overrides
+
+Revision ID: c6e0b3a9d452
+Revises: 7d2c5b9e4a16
+Create Date: 2026-10-18 23:12:40.518306
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c6e0b3a9d452'
+down_revision: Union[str, Sequence[str], None] = '7d2c5b9e4a16'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('stylist_schedules',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('stylist_id', sa.Integer(), nullable=True),
+    sa.Column('weekday', sa.Integer(), nullable=False),
+    sa.Column('start_time', sa.Time(), nullable=False),
+    sa.Column('end_time', sa.Time(), nullable=False),
+    sa.Column('break_start', sa.Time(), nullable=True),
+    sa.Column('break_end', sa.Time(), nullable=True),
+    sa.ForeignKeyConstraint(['stylist_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('stylist_id', 'weekday', name='uq_stylist_schedules_stylist_weekday')
+    )
+    op.create_index(op.f('ix_stylist_schedules_id'), 'stylist_schedules', ['id'], unique=False)
+    op.create_table('schedule_overrides',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('stylist_id', sa.Integer(), nullable=True),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('start_time', sa.Time(), nullable=True),
+    sa.Column('end_time', sa.Time(), nullable=True),
+    sa.Column('reason', sa.String(length=100), nullable=True),
+    sa.ForeignKeyConstraint(['stylist_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('stylist_id', 'day', name='uq_schedule_overrides_stylist_day')
+    )
+    op.create_index(op.f('ix_schedule_overrides_id'), 'schedule_overrides', ['id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_schedule_overrides_id'), table_name='schedule_overrides')
+    op.drop_table('schedule_overrides')
+    op.drop_index(op.f('ix_stylist_schedules_id'), table_name='stylist_schedules')
+    op.drop_table('stylist_schedules')
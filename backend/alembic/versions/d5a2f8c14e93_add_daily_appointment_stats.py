@@ -0,0 +1,43 @@
+"""add daily_appointment_stats rollup table
+
+Revision ID: d5a2f8c14e93
+Revises: b41d07e9f2c6
+Create Date: 2026-10-18 11:26:08.904417
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd5a2f8c14e93'
+down_revision: Union[str, Sequence[str], None] = 'b41d07e9f2c6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Los datos históricos se cargan con: python -m app.jobs.backfill_daily_stats
+    op.create_table('daily_appointment_stats',
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('stylist_id', sa.Integer(), nullable=False),
+    sa.Column('service_id', sa.Integer(), nullable=False),
+    sa.Column('status', sa.String(length=30), nullable=False),
+    sa.Column('is_walk_in', sa.Boolean(), nullable=False),
+    sa.Column('total', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['service_id'], ['services.id'], ),
+    sa.ForeignKeyConstraint(['stylist_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('day', 'stylist_id', 'service_id', 'status', 'is_walk_in')
+    )
+    op.create_index('ix_daily_appointment_stats_stylist_day', 'daily_appointment_stats', ['stylist_id', 'day'], unique=False)
+    op.create_index('ix_daily_appointment_stats_service_day', 'daily_appointment_stats', ['service_id', 'day'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_daily_appointment_stats_service_day', table_name='daily_appointment_stats')
+    op.drop_index('ix_daily_appointment_stats_stylist_day', table_name='daily_appointment_stats')
+    op.drop_table('daily_appointment_stats')
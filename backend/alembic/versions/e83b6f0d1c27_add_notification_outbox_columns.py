@@ -0,0 +1,34 @@
+"""add notification outbox columns
+
+Revision ID: e83b6f0d1c27
+Revises: d5a2f8c14e93
+Create Date: 2026-10-18 14:02:37.518204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e83b6f0d1c27'
+down_revision: Union[str, Sequence[str], None] = 'd5a2f8c14e93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('notifications', sa.Column('attempts', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('notifications', sa.Column('next_attempt_at', sa.DateTime(), nullable=True))
+    op.add_column('notifications', sa.Column('last_error', sa.String(length=255), nullable=True))
+    op.create_index('ix_notifications_outbox', 'notifications', ['channel', 'status', 'next_attempt_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_notifications_outbox', table_name='notifications')
+    op.drop_column('notifications', 'last_error')
+    op.drop_column('notifications', 'next_attempt_at')
+    op.drop_column('notifications', 'attempts')
@@ -0,0 +1,34 @@
+"""add appointment_reminders table
+
+Revision ID: f1c94a7e3b58
+Revises: e83b6f0d1c27
+Create Date: 2026-10-18 15:47:12.630915
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f1c94a7e3b58'
+down_revision: Union[str, Sequence[str], None] = 'e83b6f0d1c27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('appointment_reminders',
+    sa.Column('appointment_id', sa.Integer(), nullable=False),
+    sa.Column('window_minutes', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['appointment_id'], ['appointments.id'], ),
+    sa.PrimaryKeyConstraint('appointment_id', 'window_minutes')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('appointment_reminders')
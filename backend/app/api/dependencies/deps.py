@@ -4,9 +4,9 @@ from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer, HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.session import get_db_session
+from app.db.session import get_booking_db_session, get_db_session
 from app.models.user import User
-from app.services import AuthService, RoleChecker, UserService, AppointmentService, ServiceService, NotificationService
+from app.services import AuthService, RoleChecker, UserService, AppointmentService, ServiceService, NotificationService, StatsService, AppointmentImportService, AppointmentSeriesService, ScheduleService
 
 http_bearer_scheme = HTTPBearer()
 
@@ -22,12 +22,33 @@ def get_auth_service(
 def get_notification_service(db: Annotated[AsyncSession, Depends(get_db_session)]) -> NotificationService:
     return NotificationService(db)
 
-def get_appointment_service(db: Annotated[AsyncSession, Depends(get_db_session)], notification_service: Annotated[NotificationService, Depends(get_notification_service)]) -> AppointmentService:
-    return AppointmentService(db, notification_service)
+def get_stats_service(db: Annotated[AsyncSession, Depends(get_db_session)]) -> StatsService:
+    return StatsService(db)
+
+# Los servicios que reservan usan su propia sesión en READ COMMITTED (ver
+# get_booking_db_session); notificaciones y estadísticas van en esa misma
+# transacción para que se confirmen junto con la cita
+def get_appointment_service(
+    db: Annotated[AsyncSession, Depends(get_booking_db_session)]
+) -> AppointmentService:
+    return AppointmentService(db, NotificationService(db), StatsService(db))
+
+def get_appointment_import_service(
+    db: Annotated[AsyncSession, Depends(get_booking_db_session)]
+) -> AppointmentImportService:
+    return AppointmentImportService(db, StatsService(db))
+
+def get_appointment_series_service(
+    db: Annotated[AsyncSession, Depends(get_booking_db_session)]
+) -> AppointmentSeriesService:
+    return AppointmentSeriesService(db, NotificationService(db), StatsService(db))
 
 def get_service_service(db: Annotated[AsyncSession, Depends(get_db_session)]) -> ServiceService:
     return ServiceService(db)
 
+def get_schedule_service(db: Annotated[AsyncSession, Depends(get_db_session)]) -> ScheduleService:
+    return ScheduleService(db)
+
 # Dependencia para validar si el usuario está autenticado y obtener su información
 async def get_current_user(
     token: Annotated[HTTPAuthorizationCredentials, Depends(http_bearer_scheme)],
@@ -1,63 +1,171 @@
-from typing import Annotated, Optional
+from datetime import datetime
+from typing import Annotated, Any, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, Response, UploadFile, status
+from fastapi.responses import StreamingResponse
 
 from app.api.dependencies.deps import (
     check_user_role, 
     get_appointment_service, 
+    get_appointment_import_service,
+    get_appointment_series_service,
     get_current_user
 )
 from app.schemas.appointment import (
     AppointmentCreate, 
     AppointmentUpdate, 
     AppointmentInDB,
+    AppointmentBulkStatusUpdate,
+    AppointmentFilters,
+    AppointmentImportResult,
+    AppointmentSeriesCreate,
+    AppointmentSeriesInDB,
+    AppointmentSeriesUpdate,
     AppointmentCreateForClient,
-    AppointmentCreateWalkIn
+    AppointmentCreateWalkIn,
+    AvailabilityResponse,
+    AvailabilityRangeResponse,
+    NextAvailableResponse
 )
-from app.services import AppointmentService
+from app.services import AppointmentService, AppointmentImportService, AppointmentSeriesService
+from app.services.appointment_export import EXPORT_MEDIA_TYPES, ExportFormat, stream_export
+from app.services.appointment_service import DEFAULT_APPOINTMENT_PAGE_SIZE, MAX_APPOINTMENT_PAGE_SIZE
 from app.models.user import User
+from app.db.session import sessionmanager
 
 router = APIRouter(prefix="/appointments", tags=["appointments"])
 
 
+def _set_next_cursor(response: Response, next_cursor: Optional[str]):
+    # La lista sigue siendo el cuerpo; el cursor de la siguiente página va en un header
+    if next_cursor is not None:
+        response.headers["X-Next-Cursor"] = next_cursor
+
+
 @router.get("", response_model=list[AppointmentInDB])
 async def list_appointments(
+    response: Response,
+    filters: Annotated[AppointmentFilters, Depends()],
     appointment_service: Annotated[AppointmentService, Depends(get_appointment_service)],
-    _: Annotated[bool, Depends(check_user_role("admin", "receptionist"))]
+    _: Annotated[bool, Depends(check_user_role("admin", "receptionist"))],
+    cursor: Optional[str] = None,
+    limit: Annotated[int, Query(ge=1, le=MAX_APPOINTMENT_PAGE_SIZE)] = DEFAULT_APPOINTMENT_PAGE_SIZE
 ):
-    """Listar todas las citas"""
-    return await appointment_service.list_appointments()
+    """Listar citas paginadas (siguiente página con ?cursor=<X-Next-Cursor>)"""
+    try:
+        appointments, next_cursor = await appointment_service.list_appointments(filters, cursor, limit)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    _set_next_cursor(response, next_cursor)
+    return appointments
 
 
 @router.get("/my-appointments", response_model=list[AppointmentInDB])
 async def list_my_appointments(
+    response: Response,
+    filters: Annotated[AppointmentFilters, Depends()],
     appointment_service: Annotated[AppointmentService, Depends(get_appointment_service)],
-    current_user: Annotated[User, Depends(get_current_user)]
+    current_user: Annotated[User, Depends(get_current_user)],
+    cursor: Optional[str] = None,
+    limit: Annotated[int, Query(ge=1, le=MAX_APPOINTMENT_PAGE_SIZE)] = DEFAULT_APPOINTMENT_PAGE_SIZE
 ):
-    """Listar citas según rol"""
-    if current_user.role in ["admin", "receptionist"]:
-        return await appointment_service.list_appointments()
-    elif current_user.role == "stylist":
-        return await appointment_service.list_stylist_appointments(current_user.id)
-    elif current_user.role == "client":
-        return await appointment_service.list_user_appointments(current_user.id)
-    else:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Invalid role")
+    """Listar citas según rol, paginadas (siguiente página con ?cursor=<X-Next-Cursor>)"""
+    try:
+        if current_user.role in ["admin", "receptionist"]:
+            appointments, next_cursor = await appointment_service.list_appointments(filters, cursor, limit)
+        elif current_user.role == "stylist":
+            appointments, next_cursor = await appointment_service.list_stylist_appointments(
+                current_user.id, filters, cursor, limit
+            )
+        elif current_user.role == "client":
+            appointments, next_cursor = await appointment_service.list_user_appointments(
+                current_user.id, filters, cursor, limit
+            )
+        else:
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Invalid role")
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    _set_next_cursor(response, next_cursor)
+    return appointments
+
+
+@router.get("/export")
+async def export_appointments(
+    filters: Annotated[AppointmentFilters, Depends()],
+    _: Annotated[bool, Depends(check_user_role("admin", "receptionist"))],
+    format: ExportFormat = "ndjson"
+):
+    """
+    Exportar citas (con nombres de estilista, servicio y cliente) en NDJSON o CSV.
+    Se envían por partes mientras se leen, sin cargar todo el resultado en memoria.
+    """
+    return StreamingResponse(
+        stream_export(sessionmanager.session, filters, format),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="appointments.{format}"'}
+    )
 
 
-@router.get("/availability", response_model=dict)
+@router.get("/availability", response_model=AvailabilityResponse)
 async def get_availability(
     date: str,
     appointment_service: Annotated[AppointmentService, Depends(get_appointment_service)],
     service_id: Optional[int] = None,
-    stylist_id: Optional[int] = None
+    stylist_id: Optional[int] = None,
+    slot_minutes: int = 60
 ):
-   
-    return await appointment_service.get_availability(
-        date_str=date,
-        service_id=service_id,
-        stylist_id=stylist_id
-    )
+    """Slots libres por estilista para un día"""
+    try:
+        return await appointment_service.get_availability(
+            date_str=date,
+            service_id=service_id,
+            stylist_id=stylist_id,
+            slot_minutes=slot_minutes
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+@router.get("/availability/range", response_model=AvailabilityRangeResponse)
+async def get_availability_range(
+    start_date: str,
+    end_date: str,
+    appointment_service: Annotated[AppointmentService, Depends(get_appointment_service)],
+    service_id: Optional[int] = None,
+    stylist_id: Optional[int] = None,
+    slot_minutes: int = 30
+):
+    """Matriz de disponibilidad para un rango de días en una sola petición"""
+    try:
+        return await appointment_service.get_availability_range(
+            start_date_str=start_date,
+            end_date_str=end_date,
+            service_id=service_id,
+            stylist_id=stylist_id,
+            slot_minutes=slot_minutes
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+@router.get("/next-available", response_model=NextAvailableResponse)
+async def get_next_available(
+    service_id: int,
+    appointment_service: Annotated[AppointmentService, Depends(get_appointment_service)],
+    stylist_ids: Annotated[Optional[list[int]], Query()] = None,
+    horizon_days: int = 7,
+    limit: int = 5
+):
+    """Primeros horarios en los que algún estilista (o los indicados) puede atender el servicio"""
+    try:
+        return await appointment_service.find_next_available(
+            service_id=service_id,
+            stylist_ids=stylist_ids,
+            horizon_days=horizon_days,
+            limit=limit
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
 
 @router.get("/{appointment_id}", response_model=AppointmentInDB)
@@ -108,11 +216,14 @@ async def book_appointment(
     if current_user.role != "client":
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Only clients can book")
     
-    return await appointment_service.create_appointment_for_client( 
-        appointment_data=appointment_data,
-        client_id=current_user.id,
-        created_by=current_user.id
-    )
+    try:
+        return await appointment_service.create_appointment_for_client( 
+            appointment_data=appointment_data,
+            client_id=current_user.id,
+            created_by=current_user.id
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
 
 @router.post("/walk-in", response_model=AppointmentInDB, status_code=status.HTTP_201_CREATED)
@@ -125,10 +236,13 @@ async def create_walk_in_appointment(
     if current_user.role not in ["admin", "receptionist"]:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized")
     
-    return await appointment_service.create_walk_in_appointment(
-        appointment_data=appointment_data,
-        created_by=current_user.id
-    )
+    try:
+        return await appointment_service.create_walk_in_appointment(
+            appointment_data=appointment_data,
+            created_by=current_user.id
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
 
 @router.put("/{appointment_id}", response_model=AppointmentInDB)
@@ -147,7 +261,134 @@ async def update_appointment(
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized")
     
     appointment_update.modified_by = current_user.id
-    return await appointment_service.update_appointment(appointment_id, appointment_update)
+    try:
+        return await appointment_service.update_appointment(appointment_id, appointment_update)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+@router.patch("/bulk-status", response_model=list[AppointmentInDB])
+async def bulk_update_appointment_status(
+    bulk_update: AppointmentBulkStatusUpdate,
+    appointment_service: Annotated[AppointmentService, Depends(get_appointment_service)],
+    current_user: Annotated[User, Depends(get_current_user)],
+    _: Annotated[bool, Depends(check_user_role("admin", "receptionist"))]
+):
+    """Cambiar el estado de varias citas"""
+    try:
+        return await appointment_service.bulk_update_status(
+            appointment_ids=bulk_update.appointment_ids,
+            status=bulk_update.status,
+            modified_by=current_user.id
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+@router.post("/import", response_model=AppointmentImportResult)
+async def import_appointments(
+    rows: Annotated[list[dict[str, Any]], Body()],
+    import_service: Annotated[AppointmentImportService, Depends(get_appointment_import_service)],
+    current_user: Annotated[User, Depends(get_current_user)],
+    _: Annotated[bool, Depends(check_user_role("admin", "receptionist"))],
+    dry_run: bool = False
+):
+    """
+    Importar citas en lote (lista JSON con los campos de AppointmentImportRow).
+    Las filas inválidas o con choques de horario se reportan y el resto se importa.
+    """
+    try:
+        parsed, rejected = import_service.parse_rows(rows)
+        return await import_service.import_rows(parsed, rejected, current_user.id, dry_run)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+@router.post("/import/csv", response_model=AppointmentImportResult)
+async def import_appointments_csv(
+    file: UploadFile,
+    import_service: Annotated[AppointmentImportService, Depends(get_appointment_import_service)],
+    current_user: Annotated[User, Depends(get_current_user)],
+    _: Annotated[bool, Depends(check_user_role("admin", "receptionist"))],
+    dry_run: bool = False
+):
+    """Importar citas en lote desde un CSV con encabezado"""
+    try:
+        content = (await file.read()).decode("utf-8-sig")
+        parsed, rejected = import_service.parse_csv(content)
+        return await import_service.import_rows(parsed, rejected, current_user.id, dry_run)
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="El archivo debe estar en UTF-8")
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+def _series_response(series, appointments, skipped=()) -> AppointmentSeriesInDB:
+    response = AppointmentSeriesInDB.model_validate(series)
+    response.appointments = [AppointmentInDB.model_validate(a) for a in appointments]
+    response.skipped = list(skipped)
+    return response
+
+
+@router.post("/series", response_model=AppointmentSeriesInDB, status_code=status.HTTP_201_CREATED)
+async def create_appointment_series(
+    series_in: AppointmentSeriesCreate,
+    series_service: Annotated[AppointmentSeriesService, Depends(get_appointment_series_service)],
+    current_user: Annotated[User, Depends(get_current_user)],
+    _: Annotated[bool, Depends(check_user_role("admin", "receptionist"))]
+):
+    """Crear una serie de citas recurrentes (p. ej. cada dos semanas con el mismo estilista)"""
+    try:
+        series, appointments, skipped = await series_service.create_series(series_in, current_user.id)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    return _series_response(series, appointments, skipped)
+
+
+@router.get("/series/{series_id}", response_model=AppointmentSeriesInDB)
+async def read_appointment_series(
+    series_id: int,
+    series_service: Annotated[AppointmentSeriesService, Depends(get_appointment_series_service)],
+    _: Annotated[bool, Depends(check_user_role("admin", "receptionist"))]
+):
+    """Ver una serie con todas sus citas"""
+    found = await series_service.get_series(series_id)
+    if not found:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Series not found")
+    return _series_response(*found)
+
+
+@router.patch("/series/{series_id}", response_model=AppointmentSeriesInDB)
+async def update_appointment_series(
+    series_id: int,
+    series_update: AppointmentSeriesUpdate,
+    series_service: Annotated[AppointmentSeriesService, Depends(get_appointment_series_service)],
+    current_user: Annotated[User, Depends(get_current_user)],
+    _: Annotated[bool, Depends(check_user_role("admin", "receptionist"))]
+):
+    """Cambiar estilista, servicio u hora de las próximas citas de la serie"""
+    try:
+        found = await series_service.update_series(series_id, series_update, current_user.id)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    if not found:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Series not found")
+    return _series_response(*found)
+
+
+@router.delete("/series/{series_id}")
+async def cancel_appointment_series(
+    series_id: int,
+    series_service: Annotated[AppointmentSeriesService, Depends(get_appointment_series_service)],
+    current_user: Annotated[User, Depends(get_current_user)],
+    _: Annotated[bool, Depends(check_user_role("admin", "receptionist"))],
+    from_date: Optional[datetime] = None
+):
+    """Cancelar las próximas citas de la serie (desde from_date, o la serie completa)"""
+    cancelled = await series_service.cancel_series(series_id, current_user.id, from_date)
+    if cancelled is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Series not found")
+    return {"cancelled": cancelled}
 
 
 @router.patch("/{appointment_id}/status", response_model=AppointmentInDB)
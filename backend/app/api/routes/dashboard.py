@@ -1,10 +1,12 @@
-from typing import Annotated
+from datetime import date
+from typing import Annotated, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, status
 
-from app.api.dependencies.deps import get_current_user
+from app.api.dependencies.deps import check_user_role, get_current_user
 from app.models.user import User
 from app.services.dashboard_service import DashboardService
+from app.services.dashboard_cache import dashboard_cache
 from app.db.session import get_db_session
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -19,26 +21,49 @@ def get_dashboard_service(db: Annotated[AsyncSession, Depends(get_db_session)])
 @router.get("")
 async def get_dashboard(
     current_user: Annotated[User, Depends(get_current_user)],
-    dashboard_service: Annotated[DashboardService, Depends(get_dashboard_service)]
+    dashboard_service: Annotated[DashboardService, Depends(get_dashboard_service)],
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None
 ):
     """
     Obtener dashboard según rol del usuario.
     Retorna datos diferentes para cada rol.
+    start_date/end_date (solo admin) acotan los rankings de estilistas y servicios.
     """
     if current_user.role == "admin":
-        return await dashboard_service.get_admin_dashboard()
+        return await dashboard_cache.get_or_build(
+            dashboard_cache.key("admin", start_date, end_date),
+            lambda: dashboard_service.get_admin_dashboard(start_date=start_date, end_date=end_date)
+        )
     
     elif current_user.role == "receptionist":
-        return await dashboard_service.get_receptionist_dashboard()
+        return await dashboard_cache.get_or_build(
+            dashboard_cache.key("receptionist"),
+            dashboard_service.get_receptionist_dashboard
+        )
     
     elif current_user.role == "stylist":
-        return await dashboard_service.get_stylist_dashboard(current_user.id)
+        return await dashboard_cache.get_or_build(
+            dashboard_cache.key("stylist", current_user.id),
+            lambda: dashboard_service.get_stylist_dashboard(current_user.id)
+        )
     
     elif current_user.role == "client":
-        return await dashboard_service.get_client_dashboard(current_user.id)
+        return await dashboard_cache.get_or_build(
+            dashboard_cache.key("client", current_user.id),
+            lambda: dashboard_service.get_client_dashboard(current_user.id)
+        )
     
     else:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Invalid role"
-        )
\ No newline at end of file
+        )
+
+
+@router.get("/cache-stats")
+async def get_dashboard_cache_stats(
+    _: Annotated[bool, Depends(check_user_role("admin"))]
+):
+    """Aciertos/fallos del cache de dashboards"""
+    return dashboard_cache.stats()
@@ -1,17 +1,34 @@
 # app/api/routes/notifications.py
-from typing import Annotated
-from fastapi import APIRouter, Depends, BackgroundTasks
-from app.api.dependencies.deps import get_db_session
-from app.schemas.notification import NotificationCreate, NotificationInDB
-from app.services.notification_service import NotificationService
+from typing import Annotated, Optional
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
+from app.api.dependencies.deps import (
+    check_user_role,
+    get_current_user,
+    get_db_session,
+    get_notification_service
+)
+from app.db.session import sessionmanager
+from app.models.user import User
+from app.schemas.notification import (
+    NotificationCreate,
+    NotificationInDB,
+    NotificationMarkRead,
+    NotificationPage,
+    UnreadCount
+)
+from app.services.notification_service import MAX_INBOX_PAGE_SIZE, NotificationService
+from app.services.auth_service import AuthService
 from app.services.email_service import EmailService
+from app.services.notification_broker import notification_broker
+from app.services.user_service import UserService
+from app.services.smtp_pool import smtp_pool
 
 router = APIRouter(prefix="/notifications", tags=["notifications"])
 
 @router.post("/", response_model=NotificationInDB)
 async def create_and_send_notification(
     notification_in: NotificationCreate,
-    background_tasks: BackgroundTasks,
     db: Annotated = Depends(get_db_session)
 ):
     notif_service = NotificationService(db)
@@ -27,12 +44,47 @@ async def create_and_send_notification(
         body=notification_in.body
     )
 
-    # Enviar correo en segundo plano si es de tipo email
-    if notification_in.channel == "email":
-        background_tasks.add_task(notif_service.send_email_notification, notif.id)
-    
+    # Los correos "pendiente" los entrega el worker del outbox después del commit
+    await db.commit()
+    await db.refresh(notif)
     return notif
 
+@router.get("/me", response_model=NotificationPage)
+async def list_my_notifications(
+    current_user: Annotated[User, Depends(get_current_user)],
+    notif_service: Annotated[NotificationService, Depends(get_notification_service)],
+    cursor: Annotated[Optional[int], Query(description="next_cursor de la página anterior")] = None,
+    limit: Annotated[int, Query(ge=1, le=MAX_INBOX_PAGE_SIZE)] = 20,
+    unread_only: bool = False
+):
+    """Bandeja de notificaciones web del usuario autenticado, paginada por cursor"""
+    items, next_cursor = await notif_service.list_inbox(current_user.id, cursor, limit, unread_only)
+    return NotificationPage(items=items, next_cursor=next_cursor)
+
+
+@router.get("/me/unread-count", response_model=UnreadCount)
+async def get_my_unread_count(
+    current_user: Annotated[User, Depends(get_current_user)],
+    notif_service: Annotated[NotificationService, Depends(get_notification_service)]
+):
+    """Cantidad de notificaciones web no leídas"""
+    return UnreadCount(unread=await notif_service.count_unread(current_user.id))
+
+
+@router.post("/me/read", response_model=UnreadCount)
+async def mark_my_notifications_read(
+    data: NotificationMarkRead,
+    current_user: Annotated[User, Depends(get_current_user)],
+    notif_service: Annotated[NotificationService, Depends(get_notification_service)]
+):
+    """Marcar como leídas las notificaciones indicadas (o todas hasta up_to_id) y retornar las no leídas restantes"""
+    try:
+        await notif_service.mark_read(current_user.id, data.ids, data.up_to_id)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    return UnreadCount(unread=await notif_service.count_unread(current_user.id))
+
+
 @router.get("/send")
 def send_test_email():
     email_service = EmailService()
@@ -41,4 +93,61 @@ def send_test_email():
         subject="Prueba de notificación",
         body="Este es un correo de prueba enviado desde FastAPI 🚀"
     )
-    return {"status": "enviado"}
\ No newline at end of file
+    return {"status": "enviado"}
+
+
+@router.get("/email-metrics")
+async def get_email_pool_metrics(
+    _: Annotated[bool, Depends(check_user_role("admin"))]
+):
+    """Métricas del pool de conexiones SMTP"""
+    return smtp_pool.metrics()
+
+
+async def _resolve_stream_user(token: str) -> Optional[int]:
+    """Validar el token con una sesión corta para no retener la conexión durante el stream"""
+    async with sessionmanager.session() as db:
+        user = await AuthService(db, UserService(db)).get_user_from_token(token)
+        return user.id if user else None
+
+
+@router.get("/stream")
+async def stream_notifications(
+    request: Request,
+    token: str,
+    last_event_id: Annotated[Optional[int], Header()] = None
+):
+    """
+    Notificaciones web en tiempo real (Server-Sent Events).
+
+    EventSource no permite enviar headers, por eso el token va en ?token=.
+    Al reconectar el navegador envía Last-Event-ID y se reenvían las
+    notificaciones posteriores a ese id.
+    """
+    user_id = await _resolve_stream_user(token)
+    if user_id is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials"
+        )
+
+    async def backlog() -> list[dict]:
+        if last_event_id is None:
+            return []
+        async with sessionmanager.session() as db:
+            missed = await NotificationService(db).list_web_since(user_id, last_event_id)
+            return [NotificationService.to_event(n) for n in missed]
+
+    return StreamingResponse(
+        notification_broker.stream(user_id, request.is_disconnected, backlog),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.get("/stream-stats")
+async def get_stream_stats(
+    _: Annotated[bool, Depends(check_user_role("admin"))]
+):
+    """Conexiones SSE abiertas y eventos publicados"""
+    return notification_broker.stats()
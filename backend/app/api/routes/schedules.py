@@ -0,0 +1,89 @@
+from datetime import date
+from typing import Annotated, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, status
+
+from app.api.dependencies.deps import check_user_role, get_current_user, get_schedule_service
+from app.models.user import User
+from app.schemas.schedule import (
+    ScheduleOverrideInDB,
+    ScheduleOverrideSet,
+    StylistScheduleInDB,
+    StylistScheduleSet
+)
+from app.services import ScheduleService
+
+router = APIRouter(prefix="/schedules", tags=["schedules"])
+
+
+@router.get("/weekly", response_model=list[StylistScheduleInDB])
+async def list_schedules(
+    schedule_service: Annotated[ScheduleService, Depends(get_schedule_service)],
+    _: Annotated[User, Depends(get_current_user)],
+    stylist_id: Optional[int] = None
+):
+    """
+    Horarios semanales de trabajo (stylist_id NULL = horario general del salón).
+    Sin filas configuradas se atiende de 8:00 a 20:00 todos los días.
+    """
+    return await schedule_service.list_schedules(stylist_id)
+
+
+@router.put("/weekly", response_model=StylistScheduleInDB)
+async def set_schedule(
+    schedule: StylistScheduleSet,
+    schedule_service: Annotated[ScheduleService, Depends(get_schedule_service)],
+    _: Annotated[bool, Depends(check_user_role("admin"))]
+):
+    """Crear o reemplazar el horario de un día de la semana"""
+    try:
+        return await schedule_service.set_schedule(schedule)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+@router.delete("/weekly/{schedule_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_schedule(
+    schedule_id: int,
+    schedule_service: Annotated[ScheduleService, Depends(get_schedule_service)],
+    _: Annotated[bool, Depends(check_user_role("admin"))]
+):
+    if not await schedule_service.delete_schedule(schedule_id):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Horario no encontrado")
+    return None
+
+
+@router.get("/overrides", response_model=list[ScheduleOverrideInDB])
+async def list_overrides(
+    schedule_service: Annotated[ScheduleService, Depends(get_schedule_service)],
+    _: Annotated[User, Depends(get_current_user)],
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    stylist_id: Optional[int] = None
+):
+    """Excepciones de horario (feriados, turnos especiales) entre dos fechas"""
+    return await schedule_service.list_overrides(date_from, date_to, stylist_id)
+
+
+@router.put("/overrides", response_model=ScheduleOverrideInDB)
+async def set_override(
+    override: ScheduleOverrideSet,
+    schedule_service: Annotated[ScheduleService, Depends(get_schedule_service)],
+    _: Annotated[bool, Depends(check_user_role("admin"))]
+):
+    """Crear o reemplazar la excepción de una fecha; sin horas el día queda cerrado"""
+    try:
+        return await schedule_service.set_override(override)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+@router.delete("/overrides/{override_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_override(
+    override_id: int,
+    schedule_service: Annotated[ScheduleService, Depends(get_schedule_service)],
+    _: Annotated[bool, Depends(check_user_role("admin"))]
+):
+    if not await schedule_service.delete_override(override_id):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Excepción no encontrada")
+    return None
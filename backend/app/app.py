@@ -1,3 +1,4 @@
+import asyncio
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, HTTPException
@@ -5,10 +6,13 @@ from fastapi.responses import FileResponse
 from fastapi.staticfiles import StaticFiles
 from sqlalchemy import text
 
-from app.api.routes import auth, users, appointments, services, ai, dashboard, payments, notifications
+from app.api.routes import auth, users, appointments, services, ai, dashboard, payments, notifications, schedules
 from app.core.config import settings
 from app.db.base import Base
 from app.db.session import sessionmanager
+from app.jobs.notification_worker import run_worker
+from app.jobs.reminder_scheduler import run_scheduler
+from app.services.smtp_pool import smtp_pool
 from app.models import *
 
 
@@ -17,7 +21,19 @@ async def lifespan(app: FastAPI):
     async with sessionmanager.connect() as conn:
         if settings.ENVIRONMENT == "development":
             await conn.run_sync(Base.metadata.create_all)
+
+    # Worker del outbox y programador de recordatorios embebidos; en producción
+    # pueden correr aparte con python -m app.jobs.notification_worker / reminder_scheduler
+    background_stop = asyncio.Event()
+    background_tasks = []
+    if settings.NOTIFICATION_WORKER_EMBEDDED:
+        background_tasks.append(asyncio.create_task(run_worker(stop=background_stop)))
+    if settings.REMINDER_SCHEDULER_EMBEDDED:
+        background_tasks.append(asyncio.create_task(run_scheduler(stop=background_stop)))
     yield
+    background_stop.set()
+    await asyncio.gather(*background_tasks)
+    smtp_pool.close_all()
     await sessionmanager.close()
 
 app = FastAPI(lifespan=lifespan)
@@ -27,6 +43,7 @@ app.include_router(auth.router, prefix=settings.API_PREFIX)
 app.include_router(notifications.router, prefix=settings.API_PREFIX)
 app.include_router(appointments.router, prefix=settings.API_PREFIX)
 app.include_router(services.router, prefix=settings.API_PREFIX)
+app.include_router(schedules.router, prefix=settings.API_PREFIX)
 app.include_router(ai.router, prefix=settings.API_PREFIX)
 app.include_router(dashboard.router, prefix=settings.API_PREFIX)
 app.include_router(payments.router, prefix=f"{settings.API_PREFIX}/payments", tags=["payments"])
@@ -18,6 +18,8 @@ class Settings(BaseSettings):
     MYSQL_DB_PORT: int | None = None
     MYSQL_DB_NAME: str | None = None
     ENVIRONMENT: str | None = None
+    # Nivel de aislamiento de las transacciones de reserva (ver get_booking_db_session)
+    BOOKING_ISOLATION_LEVEL: str = "READ COMMITTED"
     SECRET_KEY: str = "test" # Clave secreta para JWT
     ALGORITHM: str = "HS256" # Algoritmo de JWT
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30 # Tiempo de expiración del token de acceso
@@ -27,6 +29,22 @@ class Settings(BaseSettings):
     SMTP_PORT: int = 587
     EMAIL_SENDER: str = ''
     EMAIL_PASSWORD: str = ''
+    EMAIL_MAX_WORKERS: int = 4 # Hilos para enviar correos fuera del event loop
+    SMTP_STARTTLS: bool = True
+    SMTP_POOL_SIZE: int = 2 # Conexiones SMTP autenticadas que se mantienen abiertas
+    SMTP_IDLE_TIMEOUT_SECONDS: int = 60 # Cerrar conexiones SMTP inactivas por más de este tiempo
+    NOTIFICATION_WORKER_EMBEDDED: bool = True # Correr el worker del outbox dentro de la API (False si corre como proceso aparte)
+    NOTIFICATION_WORKER_BATCH_SIZE: int = 20
+    NOTIFICATION_WORKER_POLL_SECONDS: float = 5
+    REMINDER_SCHEDULER_EMBEDDED: bool = True # Correr el programador de recordatorios dentro de la API
+    REMINDER_WINDOWS_MINUTES: list[int] = [1440, 120] # Recordar 24 h y 2 h antes de la cita
+    REMINDER_SCAN_INTERVAL_SECONDS: float = 300
+    REMINDER_BATCH_SIZE: int = 500
+    NOTIFICATION_RETENTION_DAYS: int = 180 # Antigüedad a partir de la cual se archivan y borran
+    NOTIFICATION_ARCHIVE_DIR: str = "archive/notifications"
+
+    DASHBOARD_CACHE_TTL_SECONDS: int = 30 # TTL del cache de dashboards
+    SCHEDULE_CACHE_TTL_SECONDS: int = 300 # Cada cuánto se recargan los horarios si otro proceso los cambió
 
     CULQI_SECRET_KEY: str = ""
     CULQI_API_URL: str = "https://api.culqi.com/v2" # URL base de la API de Culqi
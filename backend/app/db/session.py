@@ -1,5 +1,5 @@
 import contextlib
-from typing import Any, AsyncIterator
+from typing import Any, AsyncIterator, Optional
 
 from sqlalchemy.ext.asyncio import (
     AsyncConnection,
@@ -41,11 +41,18 @@ class DatabaseSessionManager:
                 raise
 
     @contextlib.asynccontextmanager
-    async def session(self):
+    async def session(self, isolation_level: Optional[str] = None):
         if self._sessionmaker is None:
             raise Exception("DatabaseSessionManager is not initialized")
 
-        session = self._sessionmaker()
+        if isolation_level is None:
+            session = self._sessionmaker()
+        else:
+            # Copia del engine que comparte el pool; el nivel se aplica al tomar
+            # la conexión y se restablece al devolverla
+            session = self._sessionmaker(
+                bind=self._engine.execution_options(isolation_level=isolation_level)
+            )
         try:
             yield session
         except Exception:
@@ -58,4 +65,11 @@ sessionmanager = DatabaseSessionManager(DATABASE_URL, {"echo": settings.echo_sql
 
 async def get_db_session():
     async with sessionmanager.session() as session:
+        yield session
+
+# Reservas: una vez tomado el bloqueo de la agenda del estilista, las consultas
+# siguientes de la transacción deben ver lo que otras reservas ya confirmaron.
+# Con REPEATABLE READ (el nivel del servidor) leerían la foto tomada antes del bloqueo.
+async def get_booking_db_session():
+    async with sessionmanager.session(isolation_level=settings.BOOKING_ISOLATION_LEVEL) as session:
         yield session
\ No newline at end of file
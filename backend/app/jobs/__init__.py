@@ -0,0 +1,2 @@
+# app/jobs/__init__.py
+# Tareas que se ejecutan fuera del ciclo de peticiones: python -m app.jobs.<tarea>
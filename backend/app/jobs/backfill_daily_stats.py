@@ -0,0 +1,52 @@
+# app/jobs/backfill_daily_stats.py
+"""
+Recalcula el rollup daily_appointment_stats desde la tabla appointments.
+
+Uso (desde la carpeta backend):
+    python -m app.jobs.backfill_daily_stats
+    python -m app.jobs.backfill_daily_stats --start 2025-01-01 --end 2025-12-31
+
+Procesa un mes por transacción para no mantener bloqueos largos.
+"""
+import argparse
+import asyncio
+from datetime import date
+
+from app.db.session import sessionmanager
+from app.services.stats_service import StatsService
+
+
+async def backfill(start_day: date | None = None, end_day: date | None = None):
+    async with sessionmanager.session() as db:
+        first, last = await StatsService(db).get_date_bounds()
+    if first is None:
+        print("No hay citas para procesar")
+        return
+
+    start_day = start_day or first
+    end_day = end_day or last
+
+    for chunk_start, chunk_end in StatsService.month_ranges(start_day, end_day):
+        async with sessionmanager.session() as db:
+            rows = await StatsService(db).rebuild(chunk_start, chunk_end)
+            await db.commit()
+        print(f"{chunk_start} → {chunk_end}: {rows} filas")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backfill de daily_appointment_stats")
+    parser.add_argument("--start", type=date.fromisoformat, default=None, help="YYYY-MM-DD")
+    parser.add_argument("--end", type=date.fromisoformat, default=None, help="YYYY-MM-DD")
+    args = parser.parse_args()
+
+    async def run():
+        try:
+            await backfill(args.start, args.end)
+        finally:
+            await sessionmanager.close()
+
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+# app/jobs/notification_retention.py
+"""
+Retención de notificaciones: archiva y borra las más antiguas que
+NOTIFICATION_RETENTION_DAYS (los correos aún pendientes no se tocan).
+
+Uso (desde la carpeta backend):
+    python -m app.jobs.notification_retention --dry-run
+    python -m app.jobs.notification_retention --days 90 --chunk-size 500
+    python -m app.jobs.notification_retention --no-archive
+
+Cada lote se escribe al archivo (JSONL comprimido con gzip) antes de
+borrarse, y se borra en su propia transacción para no mantener bloqueos
+largos. Si el proceso se corta entre ambos pasos, el lote puede quedar
+dos veces en el archivo, pero nunca se borra sin archivar.
+"""
+import argparse
+import asyncio
+import gzip
+import json
+import os
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from app.core.config import settings
+from app.db.session import sessionmanager
+from app.services.notification_service import NotificationService
+
+
+def archive_path(archive_dir: str, cutoff: datetime) -> Path:
+    started = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S")
+    return Path(archive_dir) / f"notifications-before-{cutoff:%Y%m%d}-{started}.jsonl.gz"
+
+
+async def purge(
+    days: int = settings.NOTIFICATION_RETENTION_DAYS,
+    chunk_size: int = 1000,
+    archive_dir: str | None = settings.NOTIFICATION_ARCHIVE_DIR,
+    dry_run: bool = False,
+    pause: float = 0
+) -> dict:
+    """
+    Archivar y borrar por lotes las notificaciones creadas hace más de `days` días.
+    Con `dry_run` solo cuenta y recorre los lotes. Retorna las estadísticas.
+    """
+    cutoff = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(days=days)
+    async with sessionmanager.session() as db:
+        expired = await NotificationService(db).count_expired(cutoff)
+
+    stats = {"cutoff": cutoff.isoformat(), "expired": expired, "archived": 0, "deleted": 0, "chunks": 0}
+    if dry_run or not expired:
+        return stats
+
+    archive = None
+    if archive_dir:
+        path = archive_path(archive_dir, cutoff)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        archive = gzip.open(path, "wt", encoding="utf-8")
+        stats["archive"] = str(path)
+
+    started = time.perf_counter()
+    after_id = 0
+    try:
+        while True:
+            async with sessionmanager.session() as db:
+                service = NotificationService(db)
+                chunk = await service.fetch_expired(cutoff, chunk_size, after_id)
+                if not chunk:
+                    break
+                ids = [notification.id for notification in chunk]
+                if archive is not None:
+                    for notification in chunk:
+                        archive.write(json.dumps(service.to_archive_record(notification), ensure_ascii=False))
+                        archive.write("\n")
+                    # El lote debe estar en disco antes de borrarlo
+                    archive.flush()
+                    os.fsync(archive.fileobj.fileno())
+                    stats["archived"] += len(chunk)
+                stats["deleted"] += await service.delete_by_ids(ids)
+                await db.commit()
+
+            after_id = ids[-1]
+            stats["chunks"] += 1
+            if pause:
+                await asyncio.sleep(pause)
+    finally:
+        if archive is not None:
+            archive.close()
+
+    elapsed = time.perf_counter() - started
+    stats["seconds"] = round(elapsed, 2)
+    stats["rows_per_second"] = round(stats["deleted"] / elapsed) if elapsed else stats["deleted"]
+    if archive is not None:
+        stats["archive_bytes"] = Path(stats["archive"]).stat().st_size
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Retención de notificaciones")
+    parser.add_argument("--days", type=int, default=settings.NOTIFICATION_RETENTION_DAYS)
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    parser.add_argument("--archive-dir", default=settings.NOTIFICATION_ARCHIVE_DIR)
+    parser.add_argument("--no-archive", action="store_true", help="Borrar sin archivar")
+    parser.add_argument("--dry-run", action="store_true", help="Solo contar lo que se borraría")
+    parser.add_argument("--pause-ms", type=float, default=0, help="Pausa entre lotes (réplicas, carga)")
+    args = parser.parse_args()
+
+    async def run():
+        try:
+            stats = await purge(
+                days=args.days,
+                chunk_size=args.chunk_size,
+                archive_dir=None if args.no_archive else args.archive_dir,
+                dry_run=args.dry_run,
+                pause=args.pause_ms / 1000
+            )
+        finally:
+            await sessionmanager.close()
+        for key, value in stats.items():
+            print(f"{key}: {value}")
+
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+# app/jobs/notification_worker.py
+"""
+Worker del outbox de notificaciones: entrega los correos pendientes.
+
+Uso (desde la carpeta backend):
+    python -m app.jobs.notification_worker
+    python -m app.jobs.notification_worker --batch-size 50 --poll 2
+    python -m app.jobs.notification_worker --once   # vacía la cola y termina
+
+Se pueden correr varios procesos a la vez: cada uno reclama lotes
+distintos con SELECT ... FOR UPDATE SKIP LOCKED.
+"""
+import argparse
+import asyncio
+import signal
+
+from app.core.config import settings
+from app.db.session import sessionmanager
+from app.services.notification_service import NotificationService
+
+
+async def process_batch(batch_size: int) -> int:
+    """Reclamar y entregar un lote. Retorna la cantidad de correos procesados."""
+    async with sessionmanager.session() as db:
+        service = NotificationService(db)
+        ids = await service.claim_pending_emails(batch_size)
+        if ids:
+            # Todo el lote con consultas IN y una sola conexión SMTP; si el proceso
+            # muere antes del commit, el lote se reintenta al vencer la reserva
+            await service.send_email_notifications(ids)
+            await db.commit()
+    return len(ids)
+
+
+async def run_worker(
+    batch_size: int = settings.NOTIFICATION_WORKER_BATCH_SIZE,
+    poll_interval: float = settings.NOTIFICATION_WORKER_POLL_SECONDS,
+    once: bool = False,
+    stop: asyncio.Event | None = None
+):
+    """Procesar lotes hasta que se pida detener (o hasta vaciar la cola con once=True)"""
+    stop = stop or asyncio.Event()
+    while not stop.is_set():
+        try:
+            processed = await process_batch(batch_size)
+        except Exception as e:
+            print(f"❌ Error en el worker de notificaciones: {e}")
+            processed = 0
+            if once:
+                raise
+        if processed:
+            continue
+        if once:
+            return
+        # Cola vacía: esperar al siguiente sondeo o a la señal de parada
+        try:
+            await asyncio.wait_for(stop.wait(), timeout=poll_interval)
+        except asyncio.TimeoutError:
+            pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Worker del outbox de notificaciones")
+    parser.add_argument("--batch-size", type=int, default=settings.NOTIFICATION_WORKER_BATCH_SIZE)
+    parser.add_argument("--poll", type=float, default=settings.NOTIFICATION_WORKER_POLL_SECONDS, help="Segundos entre sondeos con la cola vacía")
+    parser.add_argument("--once", action="store_true", help="Procesar lo pendiente y terminar")
+    args = parser.parse_args()
+
+    async def run():
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, stop.set)
+        try:
+            await run_worker(args.batch_size, args.poll, args.once, stop)
+        finally:
+            await sessionmanager.close()
+
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+# app/jobs/reminder_scheduler.py
+"""
+Programador de recordatorios: encola un "recordatorio" para las citas que
+empiezan dentro de cada ventana configurada (por defecto 24 h y 2 h antes).
+
+Uso (desde la carpeta backend):
+    python -m app.jobs.reminder_scheduler
+    python -m app.jobs.reminder_scheduler --once
+    python -m app.jobs.reminder_scheduler --windows 1440 120 --batch-size 1000
+
+Las citas se leen en streaming desde una sesión de solo lectura y se
+escriben por lotes desde otra, así la memoria no crece con el volumen del
+día. Los correos los entrega el worker de notificaciones.
+"""
+import argparse
+import asyncio
+import signal
+from collections import Counter
+from datetime import datetime, timezone
+
+from app.core.config import settings
+from app.db.session import sessionmanager
+from app.services.reminder_service import ReminderService
+from app.utils.time_slots import to_naive_utc
+
+
+async def scan(
+    windows_minutes: list[int] = settings.REMINDER_WINDOWS_MINUTES,
+    batch_size: int = settings.REMINDER_BATCH_SIZE,
+    now: datetime | None = None
+) -> Counter:
+    """Un barrido de todas las ventanas. Retorna recordatorios encolados por ventana."""
+    now = now or to_naive_utc(datetime.now(timezone.utc))
+    enqueued: Counter = Counter()
+    for lower, window in ReminderService.window_bands(windows_minutes):
+        async with sessionmanager.session() as read_db, sessionmanager.session() as write_db:
+            service = ReminderService(write_db)
+            result = await read_db.stream(
+                ReminderService.due_query(window, lower, now).execution_options(yield_per=batch_size)
+            )
+            async for partition in result.partitions(batch_size):
+                enqueued[window] += await service.enqueue_batch(window, [tuple(row) for row in partition])
+    return enqueued
+
+
+async def run_scheduler(
+    interval: float = settings.REMINDER_SCAN_INTERVAL_SECONDS,
+    windows_minutes: list[int] = settings.REMINDER_WINDOWS_MINUTES,
+    batch_size: int = settings.REMINDER_BATCH_SIZE,
+    once: bool = False,
+    stop: asyncio.Event | None = None
+):
+    """Barrer cada `interval` segundos hasta que se pida detener"""
+    stop = stop or asyncio.Event()
+    while not stop.is_set():
+        try:
+            enqueued = await scan(windows_minutes, batch_size)
+            if enqueued:
+                print(f"Recordatorios encolados: {dict(enqueued)}")
+        except Exception as e:
+            print(f"❌ Error en el programador de recordatorios: {e}")
+            if once:
+                raise
+        if once:
+            return
+        try:
+            await asyncio.wait_for(stop.wait(), timeout=interval)
+        except asyncio.TimeoutError:
+            pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Programador de recordatorios de citas")
+    parser.add_argument("--windows", type=int, nargs="+", default=settings.REMINDER_WINDOWS_MINUTES, help="Minutos antes de la cita")
+    parser.add_argument("--batch-size", type=int, default=settings.REMINDER_BATCH_SIZE)
+    parser.add_argument("--interval", type=float, default=settings.REMINDER_SCAN_INTERVAL_SECONDS, help="Segundos entre barridos")
+    parser.add_argument("--once", action="store_true", help="Hacer un barrido y terminar")
+    args = parser.parse_args()
+
+    async def run():
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, stop.set)
+        try:
+            await run_scheduler(args.interval, args.windows, args.batch_size, args.once, stop)
+        finally:
+            await sessionmanager.close()
+
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,5 @@
 # backend/app/models/appointment.py
-from sqlalchemy import Integer, String, DateTime, ForeignKey, Boolean
+from sqlalchemy import Integer, String, DateTime, ForeignKey, Boolean, Index
 from sqlalchemy.orm import Mapped, mapped_column
 from sqlalchemy.sql import func 
 from typing import Optional
@@ -7,6 +7,16 @@ from app.db.base import Base
 
 class Appointment(Base):
     __tablename__ = "appointments"
+    __table_args__ = (
+        # Agenda de un estilista: traslapes y disponibilidad (cubre end_time y status)
+        Index("ix_appointments_stylist_date", "stylist_id", "date", "end_time", "status"),
+        Index("ix_appointments_client_date", "client_id", "date"),
+        Index("ix_appointments_status_date", "status", "date"),
+        # Listado general paginado por (date, id); InnoDB agrega el id al índice
+        Index("ix_appointments_date", "date"),
+        # Ocurrencias de una serie recurrente
+        Index("ix_appointments_series_date", "series_id", "date"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     
@@ -29,7 +39,11 @@ class Appointment(Base):
     stylist_id: Mapped[int] = mapped_column(Integer, ForeignKey("users.id"))
     service_id: Mapped[int] = mapped_column(Integer, ForeignKey("services.id"))
     date: Mapped[DateTime] = mapped_column(DateTime)
+    # Hora de fin materializada (date + duración del servicio)
+    end_time: Mapped[DateTime] = mapped_column(DateTime)
     status: Mapped[str] = mapped_column(String(length=30), default="pending")
+    # Serie recurrente a la que pertenece (NULL si es una cita suelta)
+    series_id: Mapped[Optional[int]] = mapped_column(Integer, ForeignKey("appointment_series.id"), nullable=True)
     created_by: Mapped[int] = mapped_column(Integer, ForeignKey("users.id"))
     modified_by: Mapped[int] = mapped_column(Integer, ForeignKey("users.id"))
     created_at: Mapped[DateTime] = mapped_column(DateTime, default=func.now()) 
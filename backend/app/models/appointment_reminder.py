@@ -0,0 +1,22 @@
+# backend/app/models/appointment_reminder.py
+from sqlalchemy import Integer, DateTime, ForeignKey
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.sql import func
+from app.db.base import Base
+
+class AppointmentReminder(Base):
+    """
+    Registro de recordatorios ya encolados por cita y ventana.
+
+    La clave primaria (appointment_id, window_minutes) hace idempotente al
+    programador: aunque se reinicie o corran dos a la vez, cada ventana de
+    una cita se recuerda una sola vez.
+    """
+    __tablename__ = "appointment_reminders"
+
+    appointment_id: Mapped[int] = mapped_column(Integer, ForeignKey("appointments.id"), primary_key=True)
+    window_minutes: Mapped[int] = mapped_column(Integer, primary_key=True)
+    created_at: Mapped[DateTime] = mapped_column(DateTime, default=func.now())
+
+    def __repr__(self):
+        return f"<AppointmentReminder(appointment_id={self.appointment_id}, window_minutes={self.window_minutes})>"
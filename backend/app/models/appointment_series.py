@@ -0,0 +1,34 @@
+# backend/app/models/appointment_series.py
+from sqlalchemy import Integer, String, DateTime, ForeignKey
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.sql import func
+from typing import Optional
+from app.db.base import Base
+
+class AppointmentSeries(Base):
+    """
+    Regla de recurrencia (estilo RRULE) de una serie de citas.
+    Cada ocurrencia es una fila en appointments con series_id.
+    """
+    __tablename__ = "appointment_series"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    client_id: Mapped[Optional[int]] = mapped_column(Integer, ForeignKey("users.id"), nullable=True)
+    client_name: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)
+    client_phone: Mapped[Optional[str]] = mapped_column(String(20), nullable=True)
+    client_email: Mapped[Optional[str]] = mapped_column(String(50), nullable=True)
+    stylist_id: Mapped[int] = mapped_column(Integer, ForeignKey("users.id"))
+    service_id: Mapped[int] = mapped_column(Integer, ForeignKey("services.id"))
+    # Primera ocurrencia; las demás conservan su hora
+    start: Mapped[DateTime] = mapped_column(DateTime)
+    frequency: Mapped[str] = mapped_column(String(length=10))  # daily, weekly
+    interval: Mapped[int] = mapped_column(Integer, default=1)
+    weekdays: Mapped[Optional[str]] = mapped_column(String(20), nullable=True)  # "0,3" (0 = lunes), solo weekly
+    count: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    until: Mapped[Optional[DateTime]] = mapped_column(DateTime, nullable=True)
+    status: Mapped[str] = mapped_column(String(length=30), default="active")  # active, cancelled
+    created_by: Mapped[int] = mapped_column(Integer, ForeignKey("users.id"))
+    created_at: Mapped[DateTime] = mapped_column(DateTime, default=func.now())
+
+    def __repr__(self):
+        return f"<AppointmentSeries(id={self.id}, stylist_id={self.stylist_id}, frequency='{self.frequency}', interval={self.interval})>"
@@ -0,0 +1,25 @@
+# backend/app/models/daily_appointment_stats.py
+from sqlalchemy import Integer, String, Date, Boolean, ForeignKey, Index
+from sqlalchemy.orm import Mapped, mapped_column
+from app.db.base import Base
+
+class DailyAppointmentStats(Base):
+    """
+    Rollup de citas por día × estilista × servicio × estado × walk-in.
+    Lo mantiene AppointmentService en cada escritura y alimenta los dashboards.
+    """
+    __tablename__ = "daily_appointment_stats"
+    __table_args__ = (
+        Index("ix_daily_appointment_stats_stylist_day", "stylist_id", "day"),
+        Index("ix_daily_appointment_stats_service_day", "service_id", "day"),
+    )
+
+    day: Mapped[Date] = mapped_column(Date, primary_key=True)
+    stylist_id: Mapped[int] = mapped_column(Integer, ForeignKey("users.id"), primary_key=True)
+    service_id: Mapped[int] = mapped_column(Integer, ForeignKey("services.id"), primary_key=True)
+    status: Mapped[str] = mapped_column(String(length=30), primary_key=True)
+    is_walk_in: Mapped[bool] = mapped_column(Boolean, primary_key=True)
+    total: Mapped[int] = mapped_column(Integer, default=0)
+
+    def __repr__(self):
+        return f"<DailyAppointmentStats(day={self.day}, stylist_id={self.stylist_id}, service_id={self.service_id}, status='{self.status}', total={self.total})>"
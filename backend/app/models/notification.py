@@ -1,7 +1,7 @@
 # backend/app/models/notification.py
-from sqlalchemy import Integer, String, DateTime, ForeignKey, Text
+from sqlalchemy import Index, Integer, String, DateTime, ForeignKey, Text, func
 from sqlalchemy.orm import Mapped, mapped_column
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import Optional
 from app.db.base import Base
 
@@ -17,6 +17,29 @@ class Notification(Base):
     title: Mapped[Optional[str]] = mapped_column(String(length=255), nullable=True)  # Título de la notificación
     body: Mapped[Optional[str]] = mapped_column(Text, nullable=True)  # Cuerpo/mensaje de la notificación
     sent_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    # Outbox de correos: intentos realizados, próximo intento (o fin de la reserva del worker) y último error
+    attempts: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    next_attempt_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    last_error: Mapped[Optional[str]] = mapped_column(String(length=255), nullable=True)
+    # Bandeja web: NULL mientras el usuario no la haya leído
+    read_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    # En UTC como sent_at; la retención borra por esta columna
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime,
+        default=lambda: datetime.now(timezone.utc).replace(tzinfo=None),
+        server_default=func.now()
+    )
+
+    __table_args__ = (
+        # Cola del worker: pendientes por canal ordenadas por próximo intento
+        Index("ix_notifications_outbox", "channel", "status", "next_attempt_at"),
+        # Bandeja del usuario paginada por id descendente
+        Index("ix_notifications_inbox", "user_id", "channel", "id"),
+        # Conteo y listado de no leídas (InnoDB agrega el id al final del índice)
+        Index("ix_notifications_unread", "user_id", "channel", "read_at"),
+        # Job de retención: rango por antigüedad
+        Index("ix_notifications_created_at", "created_at"),
+    )
 
     def __repr__(self):
         return f"<Notification(id={self.id}, user_id={self.user_id}, type='{self.type}', channel='{self.channel}')>"
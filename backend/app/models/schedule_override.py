@@ -0,0 +1,28 @@
+# backend/app/models/schedule_override.py
+from sqlalchemy import Computed, Integer, String, Date, Time, ForeignKey, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+from typing import Optional
+from app.db.base import Base
+
+class ScheduleOverride(Base):
+    """
+    Excepción al horario semanal para una fecha (feriados, turnos especiales).
+    Sin stylist_id aplica a todo el salón; sin horas el día queda cerrado.
+    """
+    __tablename__ = "schedule_overrides"
+    __table_args__ = (
+        UniqueConstraint("owner_id", "day", name="uq_schedule_overrides_owner_day"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    stylist_id: Mapped[Optional[int]] = mapped_column(Integer, ForeignKey("users.id"), nullable=True, index=True)
+    # stylist_id o 0 para el salón: MySQL admite varios NULL en un índice único,
+    # así que la unicidad se declara sobre esta columna generada
+    owner_id: Mapped[int] = mapped_column(Integer, Computed("COALESCE(stylist_id, 0)", persisted=True))
+    day: Mapped[Date] = mapped_column(Date)
+    start_time: Mapped[Optional[Time]] = mapped_column(Time, nullable=True)
+    end_time: Mapped[Optional[Time]] = mapped_column(Time, nullable=True)
+    reason: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)
+
+    def __repr__(self):
+        return f"<ScheduleOverride(stylist_id={self.stylist_id}, day={self.day}, {self.start_time}-{self.end_time})>"
@@ -0,0 +1,22 @@
+# backend/app/models/stylist_day_lock.py
+from sqlalchemy import Integer, Date, DateTime, ForeignKey
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.sql import func
+from app.db.base import Base
+
+class StylistDayLock(Base):
+    """
+    Fila de bloqueo por estilista y día.
+
+    Las reservas toman un bloqueo exclusivo sobre esta fila antes de validar
+    traslapes, de modo que dos reservas del mismo estilista y día se serializan
+    mientras que las de otros estilistas siguen en paralelo.
+    """
+    __tablename__ = "stylist_day_locks"
+
+    stylist_id: Mapped[int] = mapped_column(Integer, ForeignKey("users.id"), primary_key=True)
+    day: Mapped[Date] = mapped_column(Date, primary_key=True)
+    locked_at: Mapped[DateTime] = mapped_column(DateTime, default=func.now())
+
+    def __repr__(self):
+        return f"<StylistDayLock(stylist_id={self.stylist_id}, day={self.day})>"
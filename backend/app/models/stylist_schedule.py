@@ -0,0 +1,29 @@
+# backend/app/models/stylist_schedule.py
+from sqlalchemy import Computed, Integer, Time, ForeignKey, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+from typing import Optional
+from app.db.base import Base
+
+class StylistSchedule(Base):
+    """
+    Horario semanal de trabajo de un estilista (o del salón si stylist_id es NULL).
+    Una fila por día de la semana, con un descanso opcional. Horas en UTC.
+    """
+    __tablename__ = "stylist_schedules"
+    __table_args__ = (
+        UniqueConstraint("owner_id", "weekday", name="uq_stylist_schedules_owner_weekday"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    stylist_id: Mapped[Optional[int]] = mapped_column(Integer, ForeignKey("users.id"), nullable=True, index=True)
+    # stylist_id o 0 para el salón: MySQL admite varios NULL en un índice único,
+    # así que la unicidad se declara sobre esta columna generada
+    owner_id: Mapped[int] = mapped_column(Integer, Computed("COALESCE(stylist_id, 0)", persisted=True))
+    weekday: Mapped[int] = mapped_column(Integer)  # 0 = lunes
+    start_time: Mapped[Time] = mapped_column(Time)
+    end_time: Mapped[Time] = mapped_column(Time)
+    break_start: Mapped[Optional[Time]] = mapped_column(Time, nullable=True)
+    break_end: Mapped[Optional[Time]] = mapped_column(Time, nullable=True)
+
+    def __repr__(self):
+        return f"<StylistSchedule(stylist_id={self.stylist_id}, weekday={self.weekday}, {self.start_time}-{self.end_time})>"
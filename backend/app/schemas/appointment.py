@@ -1,6 +1,6 @@
 from pydantic import BaseModel, Field, field_validator
-from datetime import datetime
-from typing import List, Optional
+from datetime import datetime, time
+from typing import List, Literal, Optional
 
 class AppointmentBase(BaseModel):
     """Campos base compartidos"""
@@ -57,6 +57,66 @@ class AppointmentUpdate(BaseModel):
     service_id: Optional[int] = None
     modified_by: Optional[int] = None
 
+class AppointmentBulkStatusUpdate(BaseModel):
+    """Cambiar el estado de varias citas a la vez"""
+    appointment_ids: list[int]
+    status: str
+
+class AppointmentImportRow(BaseModel):
+    """Fila de importación masiva (walk-in si no trae client_id)"""
+    client_id: Optional[int] = None
+    client_name: Optional[str] = None
+    client_phone: Optional[str] = None
+    client_email: Optional[str] = None
+    stylist_id: int
+    service_id: int
+    date: datetime
+    status: str = "confirmed"
+
+class AppointmentImportRejection(BaseModel):
+    row: int  # posición en el archivo/lista, empezando en 1 (sin contar el encabezado CSV)
+    reason: str
+
+class AppointmentImportResult(BaseModel):
+    received: int
+    accepted: int
+    imported: int  # 0 en dry_run
+    rejected: List[AppointmentImportRejection]
+    dry_run: bool = False
+
+class AppointmentSeriesCreate(BaseModel):
+    """Serie recurrente (estilo RRULE): cada `interval` días/semanas hasta count o until"""
+    client_id: Optional[int] = None
+    client_name: Optional[str] = None
+    client_phone: Optional[str] = None
+    client_email: Optional[str] = None
+    stylist_id: int
+    service_id: int
+    start: datetime  # primera cita; las demás conservan la hora
+    frequency: Literal["daily", "weekly"] = "weekly"
+    interval: int = Field(default=1, ge=1, le=52)
+    weekdays: Optional[List[int]] = None  # 0 = lunes; por defecto el día de `start`
+    count: Optional[int] = None
+    until: Optional[datetime] = None
+    status: str = "confirmed"
+    skip_conflicts: bool = False  # True: crear las que no chocan en lugar de rechazar la serie
+
+class AppointmentSeriesUpdate(BaseModel):
+    """Cambios aplicados a las citas activas de la serie desde `from_date` (por defecto ahora)"""
+    stylist_id: Optional[int] = None
+    service_id: Optional[int] = None
+    start_time: Optional[time] = None  # nueva hora de inicio (UTC)
+    from_date: Optional[datetime] = None
+
+class AppointmentFilters(BaseModel):
+    """Filtros de los listados de citas (query params)"""
+    date_from: Optional[datetime] = None
+    date_to: Optional[datetime] = None  # exclusivo
+    status: Optional[str] = None
+    stylist_id: Optional[int] = None
+    client_id: Optional[int] = None
+    is_walk_in: Optional[bool] = None
+
 class AppointmentInDB(BaseModel):
     """Retornar cita con todos los datos"""
     id: int
@@ -73,6 +133,26 @@ class AppointmentInDB(BaseModel):
     modified_by: int
     created_at: datetime
     updated_at: datetime
+    series_id: Optional[int] = None
+
+    class Config:
+        from_attributes = True
+
+class AppointmentSeriesInDB(BaseModel):
+    id: int
+    client_id: Optional[int] = None
+    client_name: Optional[str] = None
+    stylist_id: int
+    service_id: int
+    start: datetime
+    frequency: str
+    interval: int
+    weekdays: Optional[str] = None
+    count: Optional[int] = None
+    until: Optional[datetime] = None
+    status: str
+    appointments: List[AppointmentInDB] = []
+    skipped: List[datetime] = []  # ocurrencias no creadas por choques (skip_conflicts)
 
     class Config:
         from_attributes = True
@@ -99,7 +179,39 @@ class AvailabilityResponse(BaseModel):
     service_id: Optional[int] = None
     service_name: Optional[str] = None
     service_duration: Optional[int] = None
+    slot_minutes: int = 60
     stylists: List[StylistAvailability]
     
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class StylistAvailabilityMatrix(BaseModel):
+    """Disponibilidad de un estilista en un rango de días"""
+    stylist_id: int
+    stylist_name: str
+    days: List[str]  # Un bitset por día: "1100..." (1 = el slot puede iniciar el servicio)
+
+class AvailabilityRangeResponse(BaseModel):
+    """Matriz de disponibilidad estilista × día × slot"""
+    start_date: str
+    end_date: str
+    service_id: Optional[int] = None
+    service_duration: Optional[int] = None
+    slot_minutes: int
+    dates: List[str]  # ["2025-10-25", "2025-10-26"]
+    slots: List[str]  # ["08:00", "08:30"]
+    stylists: List[StylistAvailabilityMatrix]
+
+class NextAvailableSlot(BaseModel):
+    """Hueco en el que un estilista puede atender el servicio"""
+    stylist_id: int
+    stylist_name: str
+    start: datetime
+    end: datetime
+
+class NextAvailableResponse(BaseModel):
+    """Próximos huecos, del más temprano al más tardío"""
+    service_id: int
+    service_name: str
+    service_duration: int
+    slots: List[NextAvailableSlot]
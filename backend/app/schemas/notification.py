@@ -22,6 +22,18 @@ class NotificationUpdate(BaseModel):
 
 class NotificationInDB(NotificationBase):
     id: int
+    read_at: datetime | None = None
 
     class Config:
         from_attributes = True
+
+class NotificationPage(BaseModel):
+    items: list[NotificationInDB]
+    next_cursor: int | None = None  # id a enviar como ?cursor= para la siguiente página
+
+class NotificationMarkRead(BaseModel):
+    ids: list[int] | None = None  # None: marcar todas las no leídas
+    up_to_id: int | None = None  # con ids=None, solo hasta este id (lo que el usuario vio)
+
+class UnreadCount(BaseModel):
+    unread: int
@@ -0,0 +1,50 @@
+from pydantic import BaseModel, Field, model_validator
+from datetime import date, time
+from typing import Optional
+
+class StylistScheduleSet(BaseModel):
+    """Horario de un día de la semana (crea o reemplaza el existente). Horas en UTC"""
+    stylist_id: Optional[int] = None  # None = horario general del salón
+    weekday: int = Field(..., ge=0, le=6)  # 0 = lunes
+    start_time: time
+    end_time: time
+    break_start: Optional[time] = None
+    break_end: Optional[time] = None
+
+    @model_validator(mode="after")
+    def validate_hours(self):
+        if self.start_time >= self.end_time:
+            raise ValueError("La hora de inicio debe ser anterior a la de fin")
+        if (self.break_start is None) != (self.break_end is None):
+            raise ValueError("El descanso necesita hora de inicio y de fin")
+        if self.break_start is not None and not self.start_time < self.break_start < self.break_end < self.end_time:
+            raise ValueError("El descanso debe estar dentro del horario")
+        return self
+
+class StylistScheduleInDB(StylistScheduleSet):
+    id: int
+
+    class Config:
+        from_attributes = True
+
+class ScheduleOverrideSet(BaseModel):
+    """Excepción para una fecha (crea o reemplaza). Sin horas el día queda cerrado"""
+    stylist_id: Optional[int] = None  # None = todo el salón (feriados)
+    day: date
+    start_time: Optional[time] = None
+    end_time: Optional[time] = None
+    reason: Optional[str] = Field(None, max_length=100)
+
+    @model_validator(mode="after")
+    def validate_hours(self):
+        if (self.start_time is None) != (self.end_time is None):
+            raise ValueError("Indique hora de inicio y de fin, o ninguna para cerrar el día")
+        if self.start_time is not None and self.start_time >= self.end_time:
+            raise ValueError("La hora de inicio debe ser anterior a la de fin")
+        return self
+
+class ScheduleOverrideInDB(ScheduleOverrideSet):
+    id: int
+
+    class Config:
+        from_attributes = True
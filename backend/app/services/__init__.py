@@ -4,5 +4,10 @@ from app.services.role_service import RoleChecker
 from app.services.appointment_service import AppointmentService
 from app.services.service_service import ServiceService
 from app.services.notification_service import NotificationService
+from app.services.stats_service import StatsService
+from app.services.reminder_service import ReminderService
+from app.services.appointment_import_service import AppointmentImportService
+from app.services.appointment_series_service import AppointmentSeriesService
+from app.services.schedule_service import ScheduleService
 
-__all__ = ["UserService", "AuthService", "RoleChecker", "AppointmentService", "ServiceService", "NotificationService"]
\ No newline at end of file
+__all__ = ["UserService", "AuthService", "RoleChecker", "AppointmentService", "ServiceService", "NotificationService", "StatsService", "ReminderService", "AppointmentImportService", "AppointmentSeriesService", "ScheduleService"]
\ No newline at end of file
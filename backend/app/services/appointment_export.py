@@ -0,0 +1,107 @@
+# app/services/appointment_export.py
+import csv
+import io
+import json
+from datetime import datetime
+from typing import AsyncContextManager, AsyncIterator, Callable, Literal, Optional, Sequence
+
+from sqlalchemy import Row, Select, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+
+from app.models.appointment import Appointment
+from app.models.service import Service
+from app.models.user import User
+from app.schemas.appointment import AppointmentFilters
+from app.services.appointment_service import AppointmentService
+
+# Filas que se leen del cursor del servidor y se serializan por vez
+EXPORT_BATCH_SIZE = 1000
+
+ExportFormat = Literal["ndjson", "csv"]
+
+EXPORT_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+Stylist = aliased(User, name="stylist")
+Client = aliased(User, name="client")
+
+EXPORT_COLUMNS = (
+    Appointment.id,
+    Appointment.date,
+    Appointment.end_time,
+    Appointment.status,
+    Appointment.is_walk_in,
+    Appointment.stylist_id,
+    Stylist.name.label("stylist_name"),
+    Appointment.service_id,
+    Service.name.label("service_name"),
+    Service.price.label("service_price"),
+    Appointment.client_id,
+    # Los walk-in guardan sus datos en la cita; los registrados en users
+    func.coalesce(Client.name, Appointment.client_name).label("client_name"),
+    func.coalesce(Client.email, Appointment.client_email).label("client_email"),
+    func.coalesce(Client.phone, Appointment.client_phone).label("client_phone"),
+    Appointment.created_at,
+)
+
+EXPORT_FIELDS = [column.key for column in EXPORT_COLUMNS]
+
+
+def export_query(filters: Optional[AppointmentFilters] = None) -> Select:
+    """Citas con nombres de estilista, servicio y cliente, en orden (date, id)"""
+    return (
+        select(*EXPORT_COLUMNS)
+        .join(Stylist, Stylist.id == Appointment.stylist_id)
+        .join(Service, Service.id == Appointment.service_id)
+        .outerjoin(Client, Client.id == Appointment.client_id)
+        .where(*AppointmentService.filter_conditions(filters))
+        .order_by(Appointment.date, Appointment.id)
+    )
+
+
+def _to_record(row: Row) -> dict:
+    record = row._asdict()
+    for key, value in record.items():
+        if isinstance(value, datetime):
+            record[key] = value.isoformat()
+    return record
+
+
+def ndjson_chunk(rows: Sequence[Row]) -> str:
+    """Un objeto JSON por línea"""
+    return "".join(json.dumps(_to_record(row), ensure_ascii=False) + "\n" for row in rows)
+
+
+def csv_chunk(rows: Sequence[Row], header: bool = False) -> str:
+    """Filas CSV (con encabezado si es el primer lote)"""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=EXPORT_FIELDS)
+    if header:
+        writer.writeheader()
+    writer.writerows(_to_record(row) for row in rows)
+    return buffer.getvalue()
+
+
+async def stream_export(
+    session_factory: Callable[[], AsyncContextManager[AsyncSession]],
+    filters: Optional[AppointmentFilters] = None,
+    format: ExportFormat = "ndjson",
+    batch_size: int = EXPORT_BATCH_SIZE
+) -> AsyncIterator[str]:
+    """
+    Exportar citas lote a lote con un cursor del servidor (yield_per).
+
+    Abre su propia sesión con session_factory (p. ej. sessionmanager.session)
+    porque la respuesta se sigue enviando después de que termina la petición;
+    la memoria depende de batch_size, no del total.
+    """
+    if format == "csv":
+        # Encabezado aunque no haya filas
+        yield csv_chunk([], header=True)
+    async with session_factory() as db:
+        result = await db.stream(export_query(filters).execution_options(yield_per=batch_size))
+        async for partition in result.partitions():
+            yield csv_chunk(partition) if format == "csv" else ndjson_chunk(partition)
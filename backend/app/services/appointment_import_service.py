@@ -0,0 +1,191 @@
+# app/services/appointment_import_service.py
+import csv
+import io
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from typing import Any, Iterable
+
+from pydantic import ValidationError
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.appointment import Appointment
+from app.models.service import Service
+from app.models.user import User
+from app.schemas.appointment import AppointmentImportRow
+from app.services.appointment_service import (
+    APPOINTMENT_STATUSES,
+    load_busy_intervals,
+    lock_stylist_days,
+    retry_on_lock_conflict
+)
+from app.services.dashboard_cache import dashboard_cache
+from app.services.schedule_cache import schedule_cache
+from app.services.stats_service import StatsService
+from app.utils.time_slots import ACTIVE_STATUSES, BusyIntervals, to_naive_utc
+
+# Máximo de filas por importación y filas por INSERT multi-fila
+MAX_IMPORT_ROWS = 10000
+IMPORT_CHUNK_SIZE = 1000
+
+ParsedRows = tuple[list[tuple[int, AppointmentImportRow]], list[dict]]
+
+
+class AppointmentImportService:
+    """
+    Importación masiva de citas (p. ej. migrar la agenda de una sucursal).
+
+    Valida todo el lote en memoria contra los intervalos ya ocupados de los
+    estilistas involucrados (una consulta) y contra las filas anteriores del
+    mismo lote, inserta las aceptadas en INSERTs multi-fila y reporta el
+    motivo de cada fila rechazada. No envía notificaciones.
+    """
+
+    def __init__(self, db: AsyncSession, stats_service: StatsService):
+        self.db = db
+        self.stats_service = stats_service
+
+    @staticmethod
+    def parse_rows(raw_rows: Iterable[dict[str, Any]]) -> ParsedRows:
+        """Validar cada fila por separado; las inválidas se rechazan sin cortar la importación"""
+        rows, rejected = [], []
+        for number, raw in enumerate(raw_rows, start=1):
+            if number > MAX_IMPORT_ROWS:
+                raise ValueError(f"Máximo {MAX_IMPORT_ROWS} citas por importación")
+            # En CSV las celdas vacías equivalen a no enviar el campo
+            data = {key: value for key, value in raw.items() if value not in ("", None)}
+            try:
+                rows.append((number, AppointmentImportRow.model_validate(data)))
+            except ValidationError as e:
+                reason = "; ".join(
+                    f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}" for error in e.errors()
+                )
+                rejected.append({"row": number, "reason": reason})
+        return rows, rejected
+
+    @classmethod
+    def parse_csv(cls, content: str) -> ParsedRows:
+        """Filas de un CSV con encabezado (mismos nombres de campo que el JSON)"""
+        return cls.parse_rows(csv.DictReader(io.StringIO(content)))
+
+    async def _existing_ids(self, query, ids: set[int]) -> set[int]:
+        if not ids:
+            return set()
+        result = await self.db.execute(query)
+        return set(result.scalars().all())
+
+    @retry_on_lock_conflict
+    async def import_rows(
+        self,
+        rows: list[tuple[int, AppointmentImportRow]],
+        rejected: list[dict],
+        created_by: int,
+        dry_run: bool = False
+    ) -> dict:
+        """
+        Validar e insertar (con commit) las filas ya parseadas.
+        Con dry_run solo valida y hace rollback. Retorna el reporte de la importación.
+        """
+        rejected = list(rejected)
+        received = len(rows) + len(rejected)
+        now = to_naive_utc(datetime.now(timezone.utc))
+
+        # Servicios, estilistas y clientes referenciados: una consulta cada uno
+        service_ids = {row.service_id for _, row in rows}
+        stylist_ids = {row.stylist_id for _, row in rows}
+        client_ids = {row.client_id for _, row in rows if row.client_id is not None}
+        durations = {}
+        if service_ids:
+            result = await self.db.execute(
+                select(Service.id, Service.duration_min).where(Service.id.in_(service_ids))
+            )
+            durations = dict(result.all())
+        stylists = await self._existing_ids(
+            select(User.id).where(User.id.in_(stylist_ids), User.role == "stylist"), stylist_ids
+        )
+        clients = await self._existing_ids(select(User.id).where(User.id.in_(client_ids)), client_ids)
+
+        schedules = await schedule_cache.get(self.db)
+        candidates = []
+        for number, row in rows:
+            start = to_naive_utc(row.date)
+            if row.status not in APPOINTMENT_STATUSES:
+                reason = f"Estado inválido: {row.status}"
+            elif row.stylist_id not in stylists:
+                reason = "Estilista no encontrado"
+            elif row.service_id not in durations:
+                reason = "Servicio no encontrado"
+            elif row.client_id is None and not row.client_name:
+                reason = "Debe proporcionar un client_id o datos de walk-in"
+            elif row.client_id is not None and row.client_id not in clients:
+                reason = "Cliente no encontrado"
+            elif not schedules.fits(row.stylist_id, start, start + timedelta(minutes=durations[row.service_id])):
+                reason = "La cita está fuera del horario de atención"
+            elif row.status in ACTIVE_STATUSES and start < now:
+                # El histórico (completadas, canceladas...) sí puede estar en el pasado
+                reason = "No se pueden agendar citas activas en el pasado"
+            else:
+                candidates.append((number, row, start, start + timedelta(minutes=durations[row.service_id])))
+                continue
+            rejected.append({"row": number, "reason": reason})
+
+        accepted = []
+        if candidates:
+            await lock_stylist_days(self.db, ((row.stylist_id, start.date()) for _, row, start, _ in candidates))
+            busy = await load_busy_intervals(
+                self.db,
+                {row.stylist_id for _, row, _, _ in candidates},
+                min(start for _, _, start, _ in candidates),
+                max(end for _, _, _, end in candidates)
+            )
+            # En orden de llegada: ante un choque dentro del lote gana la fila anterior
+            for number, row, start, end in candidates:
+                if row.status in ACTIVE_STATUSES:
+                    intervals = busy.setdefault(row.stylist_id, BusyIntervals())
+                    if intervals.overlaps(start, end):
+                        rejected.append({"row": number, "reason": "El estilista ya tiene una cita en ese horario"})
+                        continue
+                    intervals.add(start, end)
+                accepted.append({
+                    "client_id": row.client_id,
+                    "client_name": row.client_name,
+                    "client_phone": row.client_phone,
+                    "client_email": row.client_email,
+                    "is_walk_in": row.client_id is None,
+                    "stylist_id": row.stylist_id,
+                    "service_id": row.service_id,
+                    "date": start,
+                    "end_time": end,
+                    "status": row.status,
+                    "created_by": created_by,
+                    "modified_by": created_by,
+                })
+
+        report = {
+            "received": received,
+            "accepted": len(accepted),
+            "imported": 0,
+            "rejected": sorted(rejected, key=lambda rejection: rejection["row"]),
+            "dry_run": dry_run
+        }
+        if dry_run or not accepted:
+            # Libera los bloqueos de agenda
+            await self.db.rollback()
+            return report
+
+        for offset in range(0, len(accepted), IMPORT_CHUNK_SIZE):
+            await self.db.execute(insert(Appointment), accepted[offset:offset + IMPORT_CHUNK_SIZE])
+
+        deltas: Counter = Counter(
+            (r["date"].date(), r["stylist_id"], r["service_id"], r["status"], r["is_walk_in"]) for r in accepted
+        )
+        await self.stats_service.apply_deltas(deltas)
+        await self.db.commit()
+        dashboard_cache.invalidate_appointment(
+            stylist_ids={r["stylist_id"] for r in accepted},
+            client_ids={r["client_id"] for r in accepted},
+            days={r["date"].date() for r in accepted},
+            statuses={r["status"] for r in accepted}
+        )
+        report["imported"] = len(accepted)
+        return report
@@ -0,0 +1,332 @@
+# app/services/appointment_series_service.py
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.appointment import Appointment
+from app.models.appointment_series import AppointmentSeries
+from app.models.service import Service
+from app.schemas.appointment import AppointmentSeriesCreate, AppointmentSeriesUpdate
+from app.services.appointment_service import load_busy_intervals, lock_stylist_days, retry_on_lock_conflict
+from app.services.dashboard_cache import dashboard_cache
+from app.services.notification_service import NotificationService
+from app.services.schedule_cache import schedule_cache
+from app.services.stats_service import StatsService
+from app.utils.recurrence import expand_occurrences
+from app.utils.time_slots import ACTIVE_STATUSES, BusyIntervals, to_naive_utc
+
+
+def _format_conflicts(starts: list[datetime]) -> str:
+    shown = ", ".join(start.strftime("%Y-%m-%d %H:%M") for start in starts[:5])
+    more = f" y {len(starts) - 5} más" if len(starts) > 5 else ""
+    return f"El estilista ya tiene citas en: {shown}{more}"
+
+
+class AppointmentSeriesService:
+    """
+    Series de citas recurrentes.
+
+    Todas las ocurrencias se validan contra la agenda con una sola consulta
+    de rango (en lugar de un _check_stylist_availability por cita), se
+    insertan en una transacción y se editan o cancelan en bloque.
+    """
+
+    def __init__(
+        self,
+        db: AsyncSession,
+        notification_service: NotificationService,
+        stats_service: StatsService
+    ):
+        self.db = db
+        self.notification_service = notification_service
+        self.stats_service = stats_service
+
+    async def _service_duration(self, service_id: int) -> timedelta:
+        service = await self.db.get(Service, service_id)
+        if not service:
+            raise ValueError("Servicio no encontrado")
+        return timedelta(minutes=service.duration_min)
+
+    async def _check_working_hours(self, stylist_id: int, slots: list[tuple[datetime, datetime]]):
+        """Todas las ocurrencias deben caber en el horario de trabajo del estilista"""
+        schedules = await schedule_cache.get(self.db)
+        for start, end in slots:
+            if not schedules.fits(stylist_id, start, end):
+                raise ValueError(
+                    f"La cita del {start:%Y-%m-%d %H:%M} está fuera del horario de atención "
+                    f"({schedules.describe(stylist_id, start.date())})"
+                )
+
+    async def _conflicts(
+        self,
+        stylist_id: int,
+        slots: list[tuple[datetime, datetime]],
+        exclude_series_id: Optional[int] = None
+    ) -> list[datetime]:
+        """
+        Bloquear las agendas de los días de la serie y retornar los inicios que
+        chocan con citas existentes (una consulta para todo el rango).
+        """
+        await lock_stylist_days(self.db, ((stylist_id, start.date()) for start, _ in slots))
+        busy = await load_busy_intervals(
+            self.db,
+            [stylist_id],
+            slots[0][0],
+            max(end for _, end in slots),
+            exclude_series_id
+        )
+        intervals = busy.get(stylist_id, BusyIntervals())
+        return [start for start, end in slots if intervals.overlaps(start, end)]
+
+    async def _occurrences(self, series_id: int, from_date: Optional[datetime]) -> list[Appointment]:
+        """Citas activas de la serie desde from_date (por defecto ahora)"""
+        from_date = to_naive_utc(from_date or datetime.now(timezone.utc))
+        result = await self.db.execute(
+            select(Appointment)
+            .where(
+                Appointment.series_id == series_id,
+                Appointment.status.in_(ACTIVE_STATUSES),
+                Appointment.date >= from_date
+            )
+            .order_by(Appointment.date)
+        )
+        return result.scalars().all()
+
+    async def _list_appointments(self, series_id: int) -> list[Appointment]:
+        result = await self.db.execute(
+            select(Appointment).where(Appointment.series_id == series_id).order_by(Appointment.date)
+        )
+        return result.scalars().all()
+
+    async def get_series(self, series_id: int) -> Optional[tuple[AppointmentSeries, list[Appointment]]]:
+        """Serie con todas sus citas"""
+        series = await self.db.get(AppointmentSeries, series_id)
+        if not series:
+            return None
+        return series, await self._list_appointments(series_id)
+
+    @retry_on_lock_conflict
+    async def create_series(
+        self,
+        data: AppointmentSeriesCreate,
+        created_by: int
+    ) -> tuple[AppointmentSeries, list[Appointment], list[datetime]]:
+        """
+        Expandir la regla, validar todas las ocurrencias y crearlas con un
+        solo commit. Si alguna choca se rechaza la serie, salvo con
+        skip_conflicts, que omite esas fechas.
+        Retorna la serie, sus citas y las fechas omitidas.
+        """
+        if data.status not in ACTIVE_STATUSES:
+            raise ValueError("Las series solo admiten citas pending o confirmed")
+        if not data.client_id and not data.client_name:
+            raise ValueError("Debe proporcionar un client_id o datos de walk-in")
+
+        # La regla se expande en la zona horaria de `start` y se guarda en UTC
+        start = data.start if data.start.tzinfo else data.start.replace(tzinfo=timezone.utc)
+        until = data.until
+        if until is not None and until.tzinfo is None:
+            until = until.replace(tzinfo=start.tzinfo)
+        starts = [
+            to_naive_utc(occurrence)
+            for occurrence in expand_occurrences(
+                start, data.frequency, data.interval, data.weekdays, data.count, until
+            )
+        ]
+        if starts[0] < to_naive_utc(datetime.now(timezone.utc)):
+            raise ValueError("No se pueden agendar citas en el pasado")
+
+        duration = await self._service_duration(data.service_id)
+        slots = [(start, start + duration) for start in starts]
+        await self._check_working_hours(data.stylist_id, slots)
+        conflicts = await self._conflicts(data.stylist_id, slots)
+        if conflicts and not data.skip_conflicts:
+            await self.db.rollback()
+            raise ValueError(_format_conflicts(conflicts))
+        skipped = set(conflicts)
+        slots = [slot for slot in slots if slot[0] not in skipped]
+        if not slots:
+            await self.db.rollback()
+            raise ValueError(_format_conflicts(conflicts))
+
+        series = AppointmentSeries(
+            client_id=data.client_id,
+            client_name=data.client_name,
+            client_phone=data.client_phone,
+            client_email=data.client_email,
+            stylist_id=data.stylist_id,
+            service_id=data.service_id,
+            start=starts[0],
+            frequency=data.frequency,
+            interval=data.interval,
+            weekdays=",".join(str(day) for day in sorted(set(data.weekdays))) if data.weekdays else None,
+            count=data.count,
+            until=to_naive_utc(until) if until else None,
+            status="active",
+            created_by=created_by
+        )
+        self.db.add(series)
+        await self.db.flush()
+
+        is_walk_in = data.client_id is None
+        await self.db.execute(insert(Appointment), [
+            {
+                "client_id": data.client_id,
+                "client_name": data.client_name,
+                "client_phone": data.client_phone,
+                "client_email": data.client_email,
+                "is_walk_in": is_walk_in,
+                "stylist_id": data.stylist_id,
+                "service_id": data.service_id,
+                "date": slot_start,
+                "end_time": slot_end,
+                "status": data.status,
+                "series_id": series.id,
+                "created_by": created_by,
+                "modified_by": created_by,
+            }
+            for slot_start, slot_end in slots
+        ])
+        await self.stats_service.apply_deltas(Counter(
+            (slot_start.date(), data.stylist_id, data.service_id, data.status, is_walk_in)
+            for slot_start, _ in slots
+        ))
+
+        # Un solo aviso al cliente por la serie, asociado a la primera cita
+        if data.client_id:
+            first = await self.db.execute(
+                select(Appointment.id)
+                .where(Appointment.series_id == series.id)
+                .order_by(Appointment.date)
+                .limit(1)
+            )
+            await self.notification_service.enqueue_notifications(
+                appointment_id=first.scalar_one(),
+                user_id=data.client_id,
+                type="reservado"
+            )
+
+        series_id = series.id
+        await self.db.commit()
+        dashboard_cache.invalidate_appointment(
+            stylist_ids=[data.stylist_id],
+            client_ids=[data.client_id],
+            days={slot_start.date() for slot_start, _ in slots},
+            statuses=[data.status]
+        )
+        await self.db.refresh(series)
+        return series, await self._list_appointments(series_id), sorted(skipped)
+
+    @retry_on_lock_conflict
+    async def update_series(
+        self,
+        series_id: int,
+        data: AppointmentSeriesUpdate,
+        modified_by: int
+    ) -> Optional[tuple[AppointmentSeries, list[Appointment]]]:
+        """
+        Cambiar estilista, servicio u hora de las citas activas de la serie
+        desde from_date. Se validan todas juntas (sin contar las de la propia
+        serie) y se aplican con un commit; si alguna choca no se cambia nada.
+        """
+        series = await self.db.get(AppointmentSeries, series_id)
+        if not series:
+            return None
+        if series.status == "cancelled":
+            raise ValueError("La serie está cancelada")
+
+        appointments = await self._occurrences(series_id, data.from_date)
+        if appointments:
+            stylist_id = data.stylist_id or series.stylist_id
+            service_id = data.service_id or series.service_id
+            duration = await self._service_duration(service_id) if data.service_id else None
+
+            slots = []
+            for appointment in appointments:
+                start = appointment.date
+                if data.start_time is not None:
+                    start = datetime.combine(start.date(), data.start_time)
+                slots.append((start, start + (duration or appointment.end_time - appointment.date)))
+            await self._check_working_hours(stylist_id, slots)
+
+            conflicts = await self._conflicts(stylist_id, sorted(slots), exclude_series_id=series_id)
+            if conflicts:
+                await self.db.rollback()
+                raise ValueError(_format_conflicts(conflicts))
+
+            deltas: Counter = Counter()
+            scope = {"stylist_ids": set(), "client_ids": {series.client_id}, "days": set(), "statuses": set()}
+            for appointment, (start, end) in zip(appointments, slots):
+                stats_before = StatsService.key_for(appointment)
+                appointment.stylist_id = stylist_id
+                appointment.service_id = service_id
+                appointment.date = start
+                appointment.end_time = end
+                appointment.modified_by = modified_by
+                stats_after = StatsService.key_for(appointment)
+                deltas[stats_before] -= 1
+                deltas[stats_after] += 1
+                for key in (stats_before, stats_after):
+                    scope["stylist_ids"].add(key[1])
+                    scope["days"].add(key[0])
+                    scope["statuses"].add(key[3])
+            await self.stats_service.apply_deltas(deltas)
+
+            series.stylist_id = stylist_id
+            series.service_id = service_id
+            if data.start_time is not None:
+                series.start = datetime.combine(series.start.date(), data.start_time)
+            await self.db.commit()
+            dashboard_cache.invalidate_appointment(**scope)
+
+        await self.db.refresh(series)
+        return series, await self._list_appointments(series_id)
+
+    async def cancel_series(
+        self,
+        series_id: int,
+        modified_by: int,
+        from_date: Optional[datetime] = None
+    ) -> Optional[int]:
+        """
+        Cancelar en bloque las citas activas de la serie desde from_date; sin
+        from_date se cancela la serie completa. Retorna cuántas citas se cancelaron.
+        """
+        series = await self.db.get(AppointmentSeries, series_id)
+        if not series:
+            return None
+
+        appointments = await self._occurrences(series_id, from_date)
+        deltas: Counter = Counter()
+        for appointment in appointments:
+            stats_before = StatsService.key_for(appointment)
+            appointment.status = "cancelled"
+            appointment.modified_by = modified_by
+            deltas[stats_before] -= 1
+            deltas[StatsService.key_for(appointment)] += 1
+        if deltas:
+            await self.stats_service.apply_deltas(deltas)
+        if from_date is None:
+            series.status = "cancelled"
+
+        # Un solo aviso al cliente, asociado a la próxima cita cancelada
+        if appointments and series.client_id:
+            await self.notification_service.enqueue_notifications(
+                appointment_id=appointments[0].id,
+                user_id=series.client_id,
+                type="cancelado"
+            )
+
+        scope = {
+            "stylist_ids": {a.stylist_id for a in appointments},
+            "client_ids": {series.client_id},
+            "days": {to_naive_utc(a.date).date() for a in appointments},
+            "statuses": {"cancelled", *(key[3] for key in deltas)}
+        }
+        await self.db.commit()
+        if appointments:
+            dashboard_cache.invalidate_appointment(**scope)
+        return len(appointments)
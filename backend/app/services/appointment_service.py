@@ -1,28 +1,153 @@
-from datetime import datetime, timezone
-from typing import List, Optional
-from sqlalchemy import select, and_, or_
+import asyncio
+import functools
+import random
+from collections import Counter
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Iterable, List, Optional
+from sqlalchemy import select, and_, func, or_, text
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.exc import OperationalError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.appointment import Appointment
 from app.models.user import User
 from app.models.service import Service
+from app.models.stylist_day_lock import StylistDayLock
 from app.schemas.appointment import (
     AppointmentCreate,
     AppointmentUpdate,
     AppointmentCreateForClient,
-    AppointmentCreateWalkIn
+    AppointmentCreateWalkIn,
+    AppointmentFilters
 )
 
 from app.services.notification_service import NotificationService
+from app.services.stats_service import StatsKey, StatsService
+from app.services.dashboard_cache import dashboard_cache
+from app.services.schedule_cache import schedule_cache
+from app.utils.time_slots import (
+    ACTIVE_STATUSES,
+    BusyIntervals,
+    build_busy_index,
+    first_fit,
+    fit_mask,
+    mask_to_bits,
+    occupancy_mask,
+    to_naive_utc
+)
+from app.utils.pagination import decode_cursor, encode_cursor
+
+# Máximo de días que se pueden consultar en una sola petición de disponibilidad
+MAX_AVAILABILITY_RANGE_DAYS = 31
+# Búsqueda de próximos huecos: resultados máximos y grilla de inicio
+MAX_NEXT_AVAILABLE_RESULTS = 20
+NEXT_AVAILABLE_STEP_MINUTES = 15
+
+APPOINTMENT_STATUSES = ('pending', 'confirmed', 'completed', 'cancelled', 'no-show')
+# Máximo de citas por cambio de estado masivo
+MAX_BULK_STATUS_CHANGES = 1000
+# Tamaño de página de los listados de citas
+DEFAULT_APPOINTMENT_PAGE_SIZE = 50
+MAX_APPOINTMENT_PAGE_SIZE = 200
+# Reservas abortadas por MySQL por contención: deadlock (1213) y espera de
+# bloqueo agotada (1205). Se reintenta la transacción completa hasta 3 veces
+LOCK_CONFLICT_ERROR_CODES = (1213, 1205)
+BOOKING_MAX_ATTEMPTS = 3
+BOOKING_RETRY_BACKOFF_SECONDS = 0.05
+
+
+def _is_lock_conflict(error: OperationalError) -> bool:
+    args = getattr(error.orig, "args", ())
+    return bool(args) and args[0] in LOCK_CONFLICT_ERROR_CODES
+
+
+def retry_on_lock_conflict(method):
+    """
+    Reintentar un método de reserva (una transacción completa, de la primera
+    lectura al commit) si MySQL lo aborta por deadlock o por esperar demasiado
+    un bloqueo de agenda. Hace rollback y lo vuelve a ejecutar tras una espera
+    corta y aleatoria; agotados los intentos se propaga el error.
+    """
+    @functools.wraps(method)
+    async def wrapper(self, *args, **kwargs):
+        for attempt in range(1, BOOKING_MAX_ATTEMPTS + 1):
+            try:
+                return await method(self, *args, **kwargs)
+            except OperationalError as e:
+                if attempt == BOOKING_MAX_ATTEMPTS or not _is_lock_conflict(e):
+                    raise
+                await self.db.rollback()
+                await asyncio.sleep(random.uniform(0, BOOKING_RETRY_BACKOFF_SECONDS * attempt))
+    return wrapper
+
+
+async def lock_stylist_days(db: AsyncSession, keys: Iterable[tuple[int, date]]):
+    """
+    Bloquear varias agendas (estilista, día) con un solo upsert, como
+    _lock_stylist_day. Se ordenan para que todas las operaciones en lote
+    tomen los bloqueos en el mismo orden y no haya deadlocks entre ellas.
+    """
+    keys = sorted(set(keys))
+    if not keys:
+        return
+    await db.execute(
+        mysql_insert(StylistDayLock)
+        .values([{"stylist_id": stylist_id, "day": day} for stylist_id, day in keys])
+        .on_duplicate_key_update(locked_at=func.now())
+    )
+
+
+async def load_busy_intervals(
+    db: AsyncSession,
+    stylist_ids: Iterable[int],
+    range_start: datetime,
+    range_end: datetime,
+    exclude_series_id: Optional[int] = None
+) -> dict[int, BusyIntervals]:
+    """Intervalos ocupados por citas activas de los estilistas en [range_start, range_end), en una consulta"""
+    query = select(Appointment.stylist_id, Appointment.date, Appointment.end_time).where(
+        and_(
+            Appointment.stylist_id.in_(set(stylist_ids)),
+            Appointment.status.in_(ACTIVE_STATUSES),
+            Appointment.date < range_end,
+            Appointment.end_time > range_start
+        )
+    )
+    if exclude_series_id is not None:
+        query = query.where(or_(Appointment.series_id.is_(None), Appointment.series_id != exclude_series_id))
+    result = await db.execute(query)
+    return build_busy_index(result.all())
 
 
 class AppointmentService:
-    def __init__(self, db: AsyncSession, notification_service: NotificationService):
+    def __init__(
+        self,
+        db: AsyncSession,
+        notification_service: NotificationService,
+        stats_service: StatsService
+    ):
         self.db = db
         self.notification_service = notification_service
+        self.stats_service = stats_service
 
 
-    async def _validate_datetime(self, appointment_date: datetime):
+    async def _record_change(self, stats_before: Optional[StatsKey], appointment: Appointment) -> dict:
+        """
+        Registrar el cambio de una cita en el rollup (antes del commit) y
+        retornar el alcance de la invalidación de dashboards, que se aplica
+        con dashboard_cache.invalidate_appointment(**scope) tras el commit.
+        """
+        stats_after = StatsService.key_for(appointment)
+        await self.stats_service.record_change(stats_before, stats_after)
+        keys = [key for key in (stats_before, stats_after) if key]
+        return {
+            "stylist_ids": [key[1] for key in keys],
+            "client_ids": [appointment.client_id],
+            "days": [key[0] for key in keys],
+            "statuses": [key[3] for key in keys]
+        }
+
+    async def _validate_datetime(self, appointment_date: datetime, stylist_id: Optional[int] = None):
         """Validar que la fecha de la cita sea válida"""
         # Asegurarse de que ambas fechas tengan timezone
         now = datetime.now(timezone.utc)
@@ -34,89 +159,198 @@ class AppointmentService:
         if appointment_date < now:
             raise ValueError("No se pueden agendar citas en el pasado")
         
-        # Validar horario de trabajo (8 AM - 8 PM)
-        hour = appointment_date.hour
-        if hour < 8 or hour >= 20:
-            raise ValueError("Las citas deben ser entre las 8:00 AM y 8:00 PM")
+        # Validar horario de trabajo del estilista (o del salón)
+        start = to_naive_utc(appointment_date)
+        schedules = await schedule_cache.get(self.db)
+        if not schedules.is_working(stylist_id, start):
+            raise ValueError(
+                f"Las citas deben ser dentro del horario de atención ({schedules.describe(stylist_id, start.date())})"
+            )
         
         return True
 
+    async def _lock_stylist_day(self, stylist_id: int, date: datetime):
+        """
+        Tomar el bloqueo exclusivo de la agenda del estilista para ese día.
+
+        El upsert crea la fila si no existe y en ambos casos deja un bloqueo
+        X sobre ella hasta el commit/rollback. Se usa en lugar de
+        SELECT ... FOR UPDATE sobre una fila que podría no existir, porque en
+        InnoDB eso toma gap locks que terminan en deadlock entre reservas.
+        """
+        await self.db.execute(
+            mysql_insert(StylistDayLock)
+            .values(stylist_id=stylist_id, day=to_naive_utc(date).date())
+            .on_duplicate_key_update(locked_at=func.now())
+        )
+
     async def _check_stylist_availability(
         self, 
         stylist_id: int, 
         date: datetime, 
         service_id: int,
         exclude_appointment_id: Optional[int] = None
-    ):
-        """Verificar si el estilista está disponible"""
-        # Obtener duración del servicio
-        service_result = await self.db.execute(
-            select(Service).where(Service.id == service_id)
+    ) -> datetime:
+        """
+        Verificar si el estilista está disponible.
+
+        Resuelve en una sola consulta la duración del servicio y si existe
+        alguna cita activa que se traslape con [inicio, fin) de la nueva.
+        Antes toma el bloqueo del estilista para ese día, así la verificación
+        y el insert posterior son atómicos frente a reservas concurrentes.
+        La cita completa debe caber en un tramo de su horario de trabajo.
+        Retorna la hora de fin de la nueva cita.
+        """
+        await self._lock_stylist_day(stylist_id, date)
+
+        start = to_naive_utc(date)
+
+        new_duration = (
+            select(Service.duration_min)
+            .where(Service.id == service_id)
+            .scalar_subquery()
         )
-        service = service_result.scalar_one_or_none()
-        
-        if not service:
-            raise ValueError("Servicio no encontrado")
-        
-        # Calcular rango de tiempo de la nueva cita
-        from datetime import timedelta
-        end_time = date + timedelta(minutes=service.duration_min)
-        
-        # Buscar citas que se traslapen
-        query = select(Appointment).where(
-            and_(
-                Appointment.stylist_id == stylist_id,
-                Appointment.status.in_(['pending', 'confirmed']),
-                or_(
-                    # Nueva cita comienza durante una existente
-                    and_(
-                        Appointment.date <= date,
-                        Appointment.date >= end_time  # Esto debería ser date + duration
-                    ),
-                    # Nueva cita termina durante una existente
-                    and_(
-                        Appointment.date <= end_time,
-                        Appointment.date >= date
-                    )
+        new_end = func.timestampadd(text("MINUTE"), new_duration, start)
+
+        # Intervalos semiabiertos: existente.inicio < nueva.fin AND existente.fin > nueva.inicio
+        # (resuelto sobre ix_appointments_stylist_date)
+        overlap = (
+            select(Appointment.id)
+            .where(
+                and_(
+                    Appointment.stylist_id == stylist_id,
+                    Appointment.status.in_(ACTIVE_STATUSES),
+                    Appointment.date < new_end,
+                    Appointment.end_time > start
                 )
             )
+            .limit(1)
         )
-        
         if exclude_appointment_id:
-            query = query.where(Appointment.id != exclude_appointment_id)
-        
-        result = await self.db.execute(query)
-        conflicting_appointment = result.scalar_one_or_none()
-        
-        if conflicting_appointment:
-            raise ValueError(f"El estilista no está disponible en ese horario")
-        
-        return True
+            overlap = overlap.where(Appointment.id != exclude_appointment_id)
 
-    async def list_appointments(self) -> List[Appointment]:
-        """Listar todas las citas (admin/receptionist)"""
         result = await self.db.execute(
-            select(Appointment).order_by(Appointment.date.desc())
+            select(new_duration.label("duration_min"), overlap.exists().label("conflict"))
         )
-        return result.scalars().all()
+        duration_min, conflict = result.one()
+
+        if duration_min is None:
+            raise ValueError("Servicio no encontrado")
 
-    async def list_user_appointments(self, user_id: int) -> List[Appointment]:
-        """Listar citas de un cliente específico"""
+        if conflict:
+            raise ValueError("El estilista no está disponible en ese horario")
+
+        end = start + timedelta(minutes=duration_min)
+        schedules = await schedule_cache.get(self.db)
+        if not schedules.fits(stylist_id, start, end):
+            raise ValueError(
+                f"La cita ({start:%H:%M}-{end:%H:%M}) está fuera del horario del estilista "
+                f"({schedules.describe(stylist_id, start.date())})"
+            )
+        return end
+
+    @staticmethod
+    def filter_conditions(filters: Optional[AppointmentFilters]) -> list:
+        """Condiciones WHERE para los filtros de los listados y exportaciones"""
+        if filters is None:
+            return []
+        conditions = []
+        if filters.date_from is not None:
+            conditions.append(Appointment.date >= to_naive_utc(filters.date_from))
+        if filters.date_to is not None:
+            conditions.append(Appointment.date < to_naive_utc(filters.date_to))
+        if filters.status is not None:
+            conditions.append(Appointment.status == filters.status)
+        if filters.stylist_id is not None:
+            conditions.append(Appointment.stylist_id == filters.stylist_id)
+        if filters.client_id is not None:
+            conditions.append(Appointment.client_id == filters.client_id)
+        if filters.is_walk_in is not None:
+            conditions.append(Appointment.is_walk_in == filters.is_walk_in)
+        return conditions
+
+    async def _list_page(
+        self,
+        conditions: list,
+        filters: Optional[AppointmentFilters],
+        cursor: Optional[str],
+        limit: int,
+        descending: bool
+    ) -> tuple[List[Appointment], Optional[str]]:
+        """
+        Página de citas ordenada por (date, id) con paginación por keyset.
+
+        El cursor es la última (date, id) de la página anterior; la siguiente
+        empieza justo después sin OFFSET, así cada página es un rango sobre
+        el índice que corresponda (fecha, estilista+fecha o cliente+fecha).
+        Retorna las citas y el cursor de la siguiente página (None si no hay más).
+        """
+        limit = max(1, min(limit, MAX_APPOINTMENT_PAGE_SIZE))
+        conditions = [*conditions, *self.filter_conditions(filters)]
+
+        if cursor is not None:
+            cursor_date, cursor_id = decode_cursor(cursor)
+            if descending:
+                conditions.append(or_(
+                    Appointment.date < cursor_date,
+                    and_(Appointment.date == cursor_date, Appointment.id < cursor_id)
+                ))
+            else:
+                conditions.append(or_(
+                    Appointment.date > cursor_date,
+                    and_(Appointment.date == cursor_date, Appointment.id > cursor_id)
+                ))
+
+        order_by = (
+            (Appointment.date.desc(), Appointment.id.desc())
+            if descending
+            else (Appointment.date.asc(), Appointment.id.asc())
+        )
         result = await self.db.execute(
             select(Appointment)
-            .where(Appointment.client_id == user_id)
-            .order_by(Appointment.date.desc())
+            .where(*conditions)
+            .order_by(*order_by)
+            .limit(limit + 1)
         )
-        return result.scalars().all()
+        appointments = list(result.scalars().all())
+        if len(appointments) <= limit:
+            return appointments, None
+        appointments = appointments[:limit]
+        last = appointments[-1]
+        return appointments, encode_cursor(last.date, last.id)
 
-    async def list_stylist_appointments(self, stylist_id: int) -> List[Appointment]:
-        """Listar citas de un estilista"""
-        result = await self.db.execute(
-            select(Appointment)
-            .where(Appointment.stylist_id == stylist_id)
-            .order_by(Appointment.date.asc())
+    async def list_appointments(
+        self,
+        filters: Optional[AppointmentFilters] = None,
+        cursor: Optional[str] = None,
+        limit: int = DEFAULT_APPOINTMENT_PAGE_SIZE
+    ) -> tuple[List[Appointment], Optional[str]]:
+        """Listar citas (admin/receptionist), más recientes primero"""
+        return await self._list_page([], filters, cursor, limit, descending=True)
+
+    async def list_user_appointments(
+        self,
+        user_id: int,
+        filters: Optional[AppointmentFilters] = None,
+        cursor: Optional[str] = None,
+        limit: int = DEFAULT_APPOINTMENT_PAGE_SIZE
+    ) -> tuple[List[Appointment], Optional[str]]:
+        """Listar citas de un cliente específico, más recientes primero"""
+        return await self._list_page(
+            [Appointment.client_id == user_id], filters, cursor, limit, descending=True
+        )
+
+    async def list_stylist_appointments(
+        self,
+        stylist_id: int,
+        filters: Optional[AppointmentFilters] = None,
+        cursor: Optional[str] = None,
+        limit: int = DEFAULT_APPOINTMENT_PAGE_SIZE
+    ) -> tuple[List[Appointment], Optional[str]]:
+        """Listar citas de un estilista en orden cronológico"""
+        return await self._list_page(
+            [Appointment.stylist_id == stylist_id], filters, cursor, limit, descending=False
         )
-        return result.scalars().all()
 
     async def get_appointment(self, appointment_id: int) -> Optional[Appointment]:
         """Obtener una cita por ID"""
@@ -139,6 +373,7 @@ class AppointmentService:
             return True
         return False
 
+    @retry_on_lock_conflict
     async def create_appointment(self, appointment_create: AppointmentCreate) -> Appointment:
         """Crear cita (para admin/receptionist)"""
         # Asegurar que la fecha tenga timezone
@@ -146,10 +381,10 @@ class AppointmentService:
             appointment_create.date = appointment_create.date.replace(tzinfo=timezone.utc)
         
         # Validar fecha
-        await self._validate_datetime(appointment_create.date)
+        await self._validate_datetime(appointment_create.date, appointment_create.stylist_id)
         
         # Verificar disponibilidad del estilista
-        await self._check_stylist_availability(
+        end_time = await self._check_stylist_availability(
             appointment_create.stylist_id,
             appointment_create.date,
             appointment_create.service_id
@@ -168,29 +403,31 @@ class AppointmentService:
             stylist_id=appointment_create.stylist_id,
             service_id=appointment_create.service_id,
             date=appointment_create.date,
+            end_time=end_time,
             status=appointment_create.status,
             created_by=appointment_create.created_by,
             modified_by=appointment_create.modified_by
         )
         
         self.db.add(new_appointment)
-        await self.db.commit()
-        await self.db.refresh(new_appointment)
+        changes = await self._record_change(None, new_appointment)
 
-        # Enviar notificaciones (email y web) si hay un cliente registrado
+        # Encolar notificaciones (email y web) en la misma transacción si hay un cliente registrado
         if new_appointment.client_id:
-            await self.notification_service.create_and_send_notification(
+            await self.db.flush()
+            await self.notification_service.enqueue_notifications(
                 appointment_id=new_appointment.id,
                 user_id=new_appointment.client_id,
                 type="reservado"
             )
-            # Refrescar el appointment después de las notificaciones
 
-        await self.db.commit();
+        await self.db.commit()
+        dashboard_cache.invalidate_appointment(**changes)
         await self.db.refresh(new_appointment)
 
         return new_appointment
 
+    @retry_on_lock_conflict
     async def create_appointment_for_client(
         self,
         appointment_data: AppointmentCreateForClient,
@@ -203,10 +440,10 @@ class AppointmentService:
             appointment_data.date = appointment_data.date.replace(tzinfo=timezone.utc)
         
         # Validar fecha
-        await self._validate_datetime(appointment_data.date)
+        await self._validate_datetime(appointment_data.date, appointment_data.stylist_id)
         
         # Verificar disponibilidad del estilista
-        await self._check_stylist_availability(
+        end_time = await self._check_stylist_availability(
             appointment_data.stylist_id,
             appointment_data.date,
             appointment_data.service_id
@@ -221,26 +458,29 @@ class AppointmentService:
             stylist_id=appointment_data.stylist_id,
             service_id=appointment_data.service_id,
             date=appointment_data.date,
+            end_time=end_time,
             status="pending",
             created_by=created_by,
             modified_by=created_by
         )
         
         self.db.add(new_appointment)
-        await self.db.commit()
-        await self.db.refresh(new_appointment)
+        changes = await self._record_change(None, new_appointment)
+        await self.db.flush()
 
-        # Crear y enviar notificaciones (email y web) de reserva
-        await self.notification_service.create_and_send_notification(
+        # Encolar notificaciones (email y web) de reserva en la misma transacción
+        await self.notification_service.enqueue_notifications(
             appointment_id=new_appointment.id,
             user_id=client_id,
             type="reservado"
         )
 
         await self.db.commit()
+        dashboard_cache.invalidate_appointment(**changes)
         await self.db.refresh(new_appointment)
         return new_appointment
 
+    @retry_on_lock_conflict
     async def create_walk_in_appointment(
         self,
         appointment_data: AppointmentCreateWalkIn,
@@ -255,7 +495,7 @@ class AppointmentService:
         # await self._validate_datetime(appointment_data.date)
         
         # Verificar disponibilidad del estilista
-        await self._check_stylist_availability(
+        end_time = await self._check_stylist_availability(
             appointment_data.stylist_id,
             appointment_data.date,
             appointment_data.service_id
@@ -270,16 +510,20 @@ class AppointmentService:
             stylist_id=appointment_data.stylist_id,
             service_id=appointment_data.service_id,
             date=appointment_data.date,
+            end_time=end_time,
             status=appointment_data.status,
             created_by=created_by,
             modified_by=created_by
         )
         
         self.db.add(new_appointment)
+        changes = await self._record_change(None, new_appointment)
         await self.db.commit()
+        dashboard_cache.invalidate_appointment(**changes)
         await self.db.refresh(new_appointment)
         return new_appointment
 
+    @retry_on_lock_conflict
     async def update_appointment(
         self,
         appointment_id: int,
@@ -293,6 +537,7 @@ class AppointmentService:
         
         if not appointment:
             return None
+        stats_before = StatsService.key_for(appointment)
         
         # Actualizar campos si se proporcionan
         if appointment_update.date is not None:
@@ -300,14 +545,25 @@ class AppointmentService:
             if appointment_update.date.tzinfo is None:
                 appointment_update.date = appointment_update.date.replace(tzinfo=timezone.utc)
             
-            await self._validate_datetime(appointment_update.date)
-            await self._check_stylist_availability(
-                appointment_update.stylist_id or appointment.stylist_id,
+            await self._validate_datetime(
                 appointment_update.date,
+                appointment_update.stylist_id or appointment.stylist_id
+            )
+
+        # Cualquier cambio de horario, estilista o servicio recalcula el fin y los traslapes
+        if (
+            appointment_update.date is not None
+            or appointment_update.stylist_id is not None
+            or appointment_update.service_id is not None
+        ):
+            new_date = appointment_update.date or appointment.date
+            appointment.end_time = await self._check_stylist_availability(
+                appointment_update.stylist_id or appointment.stylist_id,
+                new_date,
                 appointment_update.service_id or appointment.service_id,
                 exclude_appointment_id=appointment_id
             )
-            appointment.date = appointment_update.date
+            appointment.date = new_date
         
         if appointment_update.status is not None:
             appointment.status = appointment_update.status
@@ -321,7 +577,9 @@ class AppointmentService:
         if appointment_update.modified_by is not None:
             appointment.modified_by = appointment_update.modified_by
         
+        changes = await self._record_change(stats_before, appointment)
         await self.db.commit()
+        dashboard_cache.invalidate_appointment(**changes)
         await self.db.refresh(appointment)
         return appointment
 
@@ -341,29 +599,96 @@ class AppointmentService:
             return None
         
         # Validar transiciones de estado válidas
-        valid_statuses = ['pending', 'confirmed', 'completed', 'cancelled', 'no-show']
-        if status not in valid_statuses:
+        if status not in APPOINTMENT_STATUSES:
             raise ValueError(f"Estado inválido: {status}")
         
+        stats_before = StatsService.key_for(appointment)
         appointment.status = status
         appointment.modified_by = modified_by
         
-        await self.db.commit()
-        await self.db.refresh(appointment)
-        
-        # Enviar notificaciones (email y web) si hay un cliente registrado y es confirmación o cancelación
+        changes = await self._record_change(stats_before, appointment)
+
+        # Encolar notificaciones (email y web) si hay un cliente registrado y es confirmación o cancelación
         if appointment.client_id and status in ['confirmed', 'cancelled']:
             notification_type = "confirmado" if status == "confirmed" else "cancelado"
-            await self.notification_service.create_and_send_notification(
+            await self.notification_service.enqueue_notifications(
                 appointment_id=appointment.id,
                 user_id=appointment.client_id,
                 type=notification_type
             )
-            await self.db.commit();
-        
+
+        await self.db.commit()
+        dashboard_cache.invalidate_appointment(**changes)
         await self.db.refresh(appointment)
         return appointment
 
+    async def bulk_update_status(
+        self,
+        appointment_ids: List[int],
+        status: str,
+        modified_by: int
+    ) -> List[Appointment]:
+        """
+        Cambiar el estado de varias citas en una transacción (p. ej. cerrar
+        el salón un día o un estilista que se ausenta).
+
+        Carga las citas con una sola consulta IN, aplica el rollup como un
+        único upsert y encola todas las notificaciones con un solo flush; el
+        worker las entrega en lote. Retorna las citas encontradas.
+        """
+        if status not in APPOINTMENT_STATUSES:
+            raise ValueError(f"Estado inválido: {status}")
+        ids = list(dict.fromkeys(appointment_ids))
+        if len(ids) > MAX_BULK_STATUS_CHANGES:
+            raise ValueError(f"Máximo {MAX_BULK_STATUS_CHANGES} citas por operación")
+        if not ids:
+            return []
+
+        result = await self.db.execute(
+            select(Appointment).where(Appointment.id.in_(ids)).order_by(Appointment.id)
+        )
+        appointments = result.scalars().all()
+
+        deltas: Counter = Counter()
+        scope = {"stylist_ids": set(), "client_ids": set(), "days": set(), "statuses": set()}
+        recipients = []
+        for appointment in appointments:
+            if appointment.status == status:
+                continue
+            stats_before = StatsService.key_for(appointment)
+            appointment.status = status
+            appointment.modified_by = modified_by
+            stats_after = StatsService.key_for(appointment)
+            deltas[stats_before] -= 1
+            deltas[stats_after] += 1
+
+            for key in (stats_before, stats_after):
+                scope["stylist_ids"].add(key[1])
+                scope["days"].add(key[0])
+                scope["statuses"].add(key[3])
+            scope["client_ids"].add(appointment.client_id)
+            if appointment.client_id:
+                recipients.append((appointment.id, appointment.client_id))
+
+        if not deltas:
+            return appointments
+
+        await self.stats_service.apply_deltas(deltas)
+
+        # Notificar confirmaciones y cancelaciones a clientes registrados
+        if recipients and status in ['confirmed', 'cancelled']:
+            notification_type = "confirmado" if status == "confirmed" else "cancelado"
+            await self.notification_service.enqueue_many(recipients, notification_type)
+
+        await self.db.commit()
+        dashboard_cache.invalidate_appointment(**scope)
+
+        # Una sola consulta para recargar las instancias expiradas por el commit
+        result = await self.db.execute(
+            select(Appointment).where(Appointment.id.in_(ids)).order_by(Appointment.id)
+        )
+        return result.scalars().all()
+
     async def delete_appointment(self, appointment_id: int) -> bool:
         """Eliminar/Cancelar una cita"""
         result = await self.db.execute(
@@ -375,84 +700,252 @@ class AppointmentService:
             return False
         
         # En lugar de eliminar, cambiar estado a cancelado
+        stats_before = StatsService.key_for(appointment)
         appointment.status = 'cancelled'
+        changes = await self._record_change(stats_before, appointment)
         await self.db.commit()
+        dashboard_cache.invalidate_appointment(**changes)
         return True
 
+    async def _load_stylists_busy(
+        self,
+        range_start: datetime,
+        range_end: datetime,
+        stylist_id: Optional[int] = None,
+        stylist_ids: Optional[Iterable[int]] = None
+    ) -> tuple[dict[int, str], dict[int, BusyIntervals]]:
+        """
+        Estilistas (uno, varios o todos) y sus intervalos ocupados en
+        [range_start, range_end), resueltos en una sola consulta.
+        """
+        busy = (
+            select(
+                Appointment.stylist_id,
+                Appointment.date,
+                Appointment.end_time
+            )
+            .where(
+                and_(
+                    Appointment.status.in_(ACTIVE_STATUSES),
+                    Appointment.date < range_end,
+                    Appointment.end_time > range_start
+                )
+            )
+            .subquery()
+        )
+        query = (
+            select(User.id, User.name, busy.c.date, busy.c.end_time)
+            .outerjoin(busy, busy.c.stylist_id == User.id)
+            .order_by(User.id)
+        )
+        if stylist_id:
+            query = query.where(User.id == stylist_id)
+        elif stylist_ids:
+            query = query.where(User.id.in_(set(stylist_ids)), User.role == 'stylist')
+        else:
+            query = query.where(User.role == 'stylist')
+
+        result = await self.db.execute(query)
+
+        stylists: dict[int, str] = {}
+        busy_rows = []
+        for user_id, user_name, start, end in result.all():
+            stylists[user_id] = user_name
+            if start is not None:
+                busy_rows.append((user_id, start, end))
+        return stylists, build_busy_index(busy_rows)
+
+    async def _get_slot_duration(
+        self,
+        service_id: Optional[int],
+        slot_minutes: int
+    ) -> tuple[Optional[Service], int]:
+        """Servicio consultado y duración (min) que debe caber en cada slot"""
+        if slot_minutes < 5 or slot_minutes > 240:
+            raise ValueError("El intervalo de los slots debe estar entre 5 y 240 minutos")
+
+        # Sin servicio, cada slot dura lo mismo que el intervalo
+        if not service_id:
+            return None, slot_minutes
+
+        service = await self.db.get(Service, service_id)
+        if not service:
+            raise ValueError("Servicio no encontrado")
+        return service, service.duration_min
+
     async def get_availability(
         self,
         date_str: str,
         service_id: Optional[int] = None,
-        stylist_id: Optional[int] = None
+        stylist_id: Optional[int] = None,
+        slot_minutes: int = 60
     ):
         """Obtener disponibilidad de estilistas para una fecha"""
-        from datetime import datetime, timedelta
-        
         # Parsear fecha
         try:
-            date = datetime.strptime(date_str, "%Y-%m-%d")
+            day = datetime.strptime(date_str, "%Y-%m-%d").date()
         except ValueError:
             raise ValueError("Formato de fecha inválido. Use YYYY-MM-DD")
-        
-        # Generar slots de tiempo (8 AM - 8 PM, cada hora)
-        slots = []
-        for hour in range(8, 20):
-            slot_time = date.replace(hour=hour, minute=0, second=0, microsecond=0)
-            slots.append(slot_time)
-        
-        # Si se especifica un estilista, solo verificar ese
-        if stylist_id:
-            stylist_result = await self.db.execute(
-                select(User).where(User.id == stylist_id)
-            )
-            stylists = [stylist_result.scalar_one_or_none()]
-        else:
-            # Obtener todos los estilistas
-            stylists_result = await self.db.execute(
-                select(User).where(User.role == 'stylist')
-            )
-            stylists = stylists_result.scalars().all()
-        
+
+        service, duration_min = await self._get_slot_duration(service_id, slot_minutes)
+
+        stylists, busy_index = await self._load_stylists_busy(
+            datetime.combine(day, time.min),
+            datetime.combine(day + timedelta(days=1), time.min),
+            stylist_id
+        )
+
+        schedules = await schedule_cache.get(self.db)
+        duration = timedelta(minutes=duration_min)
+        step = timedelta(minutes=slot_minutes)
         availability = []
-        
-        for stylist in stylists:
-            if not stylist:
-                continue
-            
-            # Obtener citas del estilista para ese día
-            appointments_result = await self.db.execute(
-                select(Appointment).where(
-                    and_(
-                        Appointment.stylist_id == stylist.id,
-                        Appointment.status.in_(['pending', 'confirmed']),
-                        Appointment.date >= date,
-                        Appointment.date < date + timedelta(days=1)
-                    )
-                )
-            )
-            appointments = appointments_result.scalars().all()
-            
-            # Filtrar slots disponibles
-            available_slots = []
-            for slot in slots:
-                is_available = True
-                for appointment in appointments:
-                    # Si el slot coincide con una cita existente, no está disponible
-                    if appointment.date.hour == slot.hour:
-                        is_available = False
-                        break
-                
-                if is_available:
-                    available_slots.append(slot.strftime("%H:%M"))
-            
+        for user_id, user_name in stylists.items():
+            intervals = busy_index.get(user_id) or BusyIntervals()
+            # Cada tramo de trabajo (antes y después del descanso) tiene su propia grilla
+            slots = [
+                slot
+                for window_start, window_end in schedules.windows(user_id, day)
+                for slot in intervals.iter_free_slots(window_start, window_end, duration, step)
+            ]
             availability.append({
-                "stylist_id": stylist.id,
-                "stylist_name": stylist.name,
-                "available_slots": available_slots
+                "stylist_id": user_id,
+                "stylist_name": user_name,
+                "available_slots": [slot.strftime("%H:%M") for slot in slots]
             })
-        
+
         return {
             "date": date_str,
             "service_id": service_id,
+            "service_name": service.name if service else None,
+            "service_duration": service.duration_min if service else None,
+            "slot_minutes": slot_minutes,
             "stylists": availability
-        }
\ No newline at end of file
+        }
+
+    async def find_next_available(
+        self,
+        service_id: int,
+        stylist_ids: Optional[List[int]] = None,
+        horizon_days: int = 7,
+        limit: int = 5,
+        not_before: Optional[datetime] = None
+    ) -> dict:
+        """
+        Los `limit` huecos más tempranos en los que algún estilista (o uno de
+        `stylist_ids`) puede atender el servicio dentro de los próximos
+        `horizon_days` días.
+
+        Carga los intervalos ocupados de todos los estilistas con una sola
+        consulta y mezcla en memoria los huecos de cada uno (first_fit)
+        dentro de su horario de trabajo.
+        """
+        if not 1 <= horizon_days <= MAX_AVAILABILITY_RANGE_DAYS:
+            raise ValueError(f"El horizonte debe estar entre 1 y {MAX_AVAILABILITY_RANGE_DAYS} días")
+        if not 1 <= limit <= MAX_NEXT_AVAILABLE_RESULTS:
+            raise ValueError(f"Se pueden pedir entre 1 y {MAX_NEXT_AVAILABLE_RESULTS} horarios")
+
+        service, duration_min = await self._get_slot_duration(service_id, NEXT_AVAILABLE_STEP_MINUTES)
+        duration = timedelta(minutes=duration_min)
+        not_before = to_naive_utc(not_before or datetime.now(timezone.utc))
+        days = [not_before.date() + timedelta(days=offset) for offset in range(horizon_days)]
+        range_end = datetime.combine(days[-1] + timedelta(days=1), time.min)
+
+        stylists, busy_index = await self._load_stylists_busy(not_before, range_end, stylist_ids=stylist_ids)
+        schedules = await schedule_cache.get(self.db)
+        openings = first_fit(
+            busy_index,
+            stylists.keys(),
+            days,
+            duration,
+            timedelta(minutes=NEXT_AVAILABLE_STEP_MINUTES),
+            not_before,
+            limit,
+            stylist_windows=schedules.windows
+        )
+        return {
+            "service_id": service.id,
+            "service_name": service.name,
+            "service_duration": duration_min,
+            "slots": [
+                {
+                    "stylist_id": stylist_id,
+                    "stylist_name": stylists[stylist_id],
+                    "start": start,
+                    "end": start + duration
+                }
+                for start, stylist_id in openings
+            ]
+        }
+
+    async def get_availability_range(
+        self,
+        start_date_str: str,
+        end_date_str: str,
+        service_id: Optional[int] = None,
+        stylist_id: Optional[int] = None,
+        slot_minutes: int = 30
+    ):
+        """
+        Disponibilidad de varios días (ambos extremos incluidos) como matriz
+        estilista × día × slot. Cada día es una cadena de bits donde el
+        carácter i indica si el slot i puede iniciar el servicio.
+        """
+        try:
+            first_day = datetime.strptime(start_date_str, "%Y-%m-%d").date()
+            last_day = datetime.strptime(end_date_str, "%Y-%m-%d").date()
+        except ValueError:
+            raise ValueError("Formato de fecha inválido. Use YYYY-MM-DD")
+
+        if last_day < first_day:
+            raise ValueError("La fecha final debe ser igual o posterior a la inicial")
+        total_days = (last_day - first_day).days + 1
+        if total_days > MAX_AVAILABILITY_RANGE_DAYS:
+            raise ValueError(
+                f"El rango no puede superar los {MAX_AVAILABILITY_RANGE_DAYS} días"
+            )
+
+        service, duration_min = await self._get_slot_duration(service_id, slot_minutes)
+
+        stylists, busy_index = await self._load_stylists_busy(
+            datetime.combine(first_day, time.min),
+            datetime.combine(last_day + timedelta(days=1), time.min),
+            stylist_id
+        )
+
+        days = [first_day + timedelta(days=offset) for offset in range(total_days)]
+        step = timedelta(minutes=slot_minutes)
+        slots_needed = -(-duration_min // slot_minutes)
+        # Grilla común: de la apertura más temprana al cierre más tardío del rango;
+        # las horas fuera del horario de cada estilista cuentan como ocupadas
+        schedules = await schedule_cache.get(self.db)
+        opening, closing = schedules.bounds(stylists, days)
+        first_window_start = datetime.combine(first_day, opening)
+        slot_count = (datetime.combine(first_day, closing) - first_window_start) // step
+
+        matrix = []
+        for user_id, user_name in stylists.items():
+            intervals = busy_index.get(user_id) or BusyIntervals()
+            rows = []
+            for day in days:
+                window_start = datetime.combine(day, opening)
+                busy_mask = (
+                    occupancy_mask(intervals, window_start, step, slot_count)
+                    | occupancy_mask(schedules.off_hours(user_id, day), window_start, step, slot_count)
+                )
+                rows.append(mask_to_bits(fit_mask(busy_mask, slot_count, slots_needed), slot_count))
+            matrix.append({
+                "stylist_id": user_id,
+                "stylist_name": user_name,
+                "days": rows
+            })
+
+        return {
+            "start_date": start_date_str,
+            "end_date": end_date_str,
+            "service_id": service_id,
+            "service_duration": service.duration_min if service else None,
+            "slot_minutes": slot_minutes,
+            "dates": [day.isoformat() for day in days],
+            "slots": [(first_window_start + step * i).strftime("%H:%M") for i in range(slot_count)],
+            "stylists": matrix
+        }
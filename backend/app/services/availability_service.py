@@ -2,6 +2,8 @@ from datetime import datetime, timedelta
 from sqlalchemy import select, and_
 from app.models.appointment import Appointment
 from app.models.service import Service
+from app.services.schedule_cache import schedule_cache
+from app.utils.time_slots import ACTIVE_STATUSES, to_naive_utc
 
 class AvailabilityService:
     def __init__(self, db):
@@ -20,22 +22,25 @@ class AvailabilityService:
         # Calcular hora de fin basado en duración
         end_time = date + timedelta(minutes=service.duration_min)
         
-        # Validar que no termine después de las 8 PM
-        if end_time.hour >= 20:
+        # Validar que el servicio completo quepa en el horario del estilista
+        schedules = await schedule_cache.get(self.db)
+        start = to_naive_utc(date)
+        if not schedules.fits(stylist_id, start, to_naive_utc(end_time)):
             return {
                 "available": False, 
-                "reason": f"El servicio terminaría a las {end_time.strftime('%H:%M')}, fuera del horario (8 AM - 8 PM)"
+                "reason": f"El servicio terminaría a las {end_time.strftime('%H:%M')}, fuera del horario ({schedules.describe(stylist_id, start.date())})"
             }
         
-        # Verificar si el estilista está ocupado
+        # Verificar si el estilista está ocupado (intervalos semiabiertos)
         existing_appointments = await self.db.execute(
-            select(Appointment).where(
+            select(Appointment.id).where(
                 and_(
                     Appointment.stylist_id == stylist_id,
-                    Appointment.status != 'cancelled',
+                    Appointment.status.in_(ACTIVE_STATUSES),
                     Appointment.date < end_time,
+                    Appointment.end_time > date
                 )
-            )
+            ).limit(1)
         )
         
         if existing_appointments.scalar_one_or_none():
@@ -0,0 +1,140 @@
+# app/services/dashboard_cache.py
+import time
+from datetime import date, datetime
+from typing import Any, Awaitable, Callable, Iterable, Optional, Protocol, TypeVar
+
+from app.core.config import settings
+
+T = TypeVar("T")
+
+
+class CacheBackend(Protocol):
+    """
+    Almacenamiento del cache de dashboards.
+    Un backend compartido (p. ej. Redis) debe serializar los valores.
+    """
+
+    def get(self, key: str) -> Any | None: ...
+
+    def set(self, key: str, value: Any, ttl: float) -> None: ...
+
+    def delete(self, keys: Iterable[str]) -> None: ...
+
+    def delete_prefix(self, prefix: str) -> None: ...
+
+    def __len__(self) -> int: ...
+
+
+class InMemoryCacheBackend:
+    """Backend en memoria del proceso con expiración por TTL"""
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        self._clock = clock
+        self._entries: dict[str, tuple[float, Any]] = {}
+
+    def get(self, key: str) -> Any | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= self._clock():
+            del self._entries[key]
+            return None
+        return value
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        self._entries[key] = (self._clock() + ttl, value)
+
+    def delete(self, keys: Iterable[str]) -> None:
+        for key in keys:
+            self._entries.pop(key, None)
+
+    def delete_prefix(self, prefix: str) -> None:
+        for key in [k for k in self._entries if k.startswith(prefix)]:
+            del self._entries[key]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class DashboardCache:
+    """
+    Cache de respuestas de dashboard por rol y usuario.
+
+    Las entradas expiran por TTL y además se invalidan cuando AppointmentService
+    modifica citas que afectan a ese dashboard.
+    """
+
+    def __init__(self, backend: CacheBackend, ttl: float):
+        self.backend = backend
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        # Sube con cada invalidación; evita guardar un dashboard armado con datos ya invalidados
+        self._generation = 0
+
+    @staticmethod
+    def key(role: str, *parts: Any) -> str:
+        """Clave del dashboard, p. ej. key("stylist", 7) -> "stylist:7" """
+        return ":".join([role, *("" if part is None else str(part) for part in parts)])
+
+    async def get_or_build(self, key: str, builder: Callable[[], Awaitable[T]]) -> T:
+        """Retornar el dashboard cacheado o construirlo y guardarlo"""
+        value = self.backend.get(key)
+        if value is not None:
+            self.hits += 1
+            return value
+
+        self.misses += 1
+        generation = self._generation
+        value = await builder()
+        if generation == self._generation:
+            self.backend.set(key, value, self.ttl)
+        return value
+
+    def invalidate_appointment(
+        self,
+        stylist_ids: Iterable[Optional[int]],
+        client_ids: Iterable[Optional[int]],
+        days: Iterable[Optional[date]],
+        statuses: Iterable[Optional[str]]
+    ):
+        """
+        Invalidar los dashboards que muestran una cita que cambió.
+        Recibe los valores de antes y después del cambio.
+        """
+        self._generation += 1
+        self.invalidations += 1
+
+        # Totales e historial del admin cambian con cualquier escritura
+        self.backend.delete_prefix(self.key("admin"))
+
+        # Recepción muestra las citas de hoy y las pendientes de cualquier día
+        if datetime.now().date() in set(days) or "pending" in set(statuses):
+            self.backend.delete([self.key("receptionist")])
+
+        self.backend.delete(
+            [self.key("stylist", stylist_id) for stylist_id in set(stylist_ids) if stylist_id]
+            + [self.key("client", client_id) for client_id in set(client_ids) if client_id]
+        )
+
+    def clear(self):
+        """Vaciar todas las entradas"""
+        self._generation += 1
+        self.backend.delete_prefix("")
+
+    def stats(self) -> dict:
+        """Contadores de aciertos/fallos para medir el hit ratio"""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "invalidations": self.invalidations,
+            "entries": len(self.backend),
+            "ttl_seconds": self.ttl
+        }
+
+
+dashboard_cache = DashboardCache(InMemoryCacheBackend(), ttl=settings.DASHBOARD_CACHE_TTL_SECONDS)
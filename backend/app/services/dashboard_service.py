@@ -1,12 +1,14 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy import func, and_, or_, desc
-from datetime import datetime, timedelta, time
-from typing import List, Optional
+from sqlalchemy import func, and_, or_, desc, case
+from datetime import date, datetime, timedelta, time, timezone
+from functools import partial
+from typing import List, Optional, Sequence
 
 from app.models.appointment import Appointment
 from app.models.user import User
 from app.models.service import Service
+from app.models.daily_appointment_stats import DailyAppointmentStats
 from app.schemas.dashboard import (
     AppointmentSummary,
     AppointmentStats,
@@ -19,6 +21,12 @@ from app.schemas.dashboard import (
     StylistDashboard,
     ClientDashboard
 )
+from app.services.appointment_service import NEXT_AVAILABLE_STEP_MINUTES, load_busy_intervals
+from app.services.schedule_cache import schedule_cache
+from app.utils.time_slots import BusyIntervals, stylist_openings, to_naive_utc
+
+# Duración del hueco que se muestra como "próximo disponible" en recepción
+RECEPTION_SLOT_MINUTES = 30
 
 
 class DashboardService:
@@ -27,73 +35,110 @@ class DashboardService:
 
     # COMÚN 
 
-    async def _appointment_to_summary(self, appointment: Appointment) -> AppointmentSummary:
-        """Convertir Appointment a AppointmentSummary"""
-        # Obtener nombres
-        stylist = await self.db.get(User, appointment.stylist_id)
-        service = await self.db.get(Service, appointment.service_id)
-        
+    async def _load_names(
+        self,
+        appointments: Sequence[Appointment]
+    ) -> tuple[dict[int, str], dict[int, tuple[str, int]]]:
+        """
+        Resolver con dos consultas IN los nombres de usuarios (estilistas y
+        clientes) y los servicios (nombre, duración) de un grupo de citas.
+        """
+        user_ids = set()
+        service_ids = set()
+        for appointment in appointments:
+            user_ids.add(appointment.stylist_id)
+            if appointment.client_id:
+                user_ids.add(appointment.client_id)
+            service_ids.add(appointment.service_id)
+
+        users: dict[int, str] = {}
+        if user_ids:
+            result = await self.db.execute(
+                select(User.id, User.name).where(User.id.in_(user_ids))
+            )
+            users = {user_id: name for user_id, name in result.all()}
+
+        services: dict[int, tuple[str, int]] = {}
+        if service_ids:
+            result = await self.db.execute(
+                select(Service.id, Service.name, Service.duration_min).where(Service.id.in_(service_ids))
+            )
+            services = {service_id: (name, duration) for service_id, name, duration in result.all()}
+
+        return users, services
+
+    @staticmethod
+    def _client_name(appointment: Appointment, users: dict[int, str]) -> str:
+        """Nombre del cliente (walk-in o registrado)"""
         client_name = appointment.client_name if appointment.is_walk_in else None
         if not client_name and appointment.client_id:
-            client = await self.db.get(User, appointment.client_id)
-            client_name = client.name if client else "Unknown"
-        
-        return AppointmentSummary(
-            id=appointment.id,
-            client_name=client_name or "Unknown",
-            stylist_name=stylist.name if stylist else "Unknown",
-            service_name=service.name if service else "Unknown",
-            date=appointment.date,
-            status=appointment.status,
-            is_walk_in=appointment.is_walk_in
-        )
+            client_name = users.get(appointment.client_id)
+        return client_name or "Unknown"
+
+    async def _appointments_to_summaries(
+        self,
+        appointments: Sequence[Appointment]
+    ) -> List[AppointmentSummary]:
+        """Convertir citas a AppointmentSummary con un número fijo de consultas"""
+        if not appointments:
+            return []
+
+        users, services = await self._load_names(appointments)
+
+        return [
+            AppointmentSummary(
+                id=appointment.id,
+                client_name=self._client_name(appointment, users),
+                stylist_name=users.get(appointment.stylist_id, "Unknown"),
+                service_name=services.get(appointment.service_id, ("Unknown", 0))[0],
+                date=appointment.date,
+                status=appointment.status,
+                is_walk_in=appointment.is_walk_in
+            )
+            for appointment in appointments
+        ]
 
     #  ADMIN DASHBOARD 
 
-    async def get_admin_dashboard(self) -> AdminDashboard:
-        """Obtener dashboard completo para admin"""
-        
-        # Estadísticas de citas
-        result = await self.db.execute(select(Appointment))
-        all_appointments = result.scalars().all()
-        
-        appointments_stats = AppointmentStats(
-            total=len(all_appointments),
-            pending=len([a for a in all_appointments if a.status == "pending"]),
-            confirmed=len([a for a in all_appointments if a.status == "confirmed"]),
-            completed=len([a for a in all_appointments if a.status == "completed"]),
-            cancelled=len([a for a in all_appointments if a.status == "cancelled"]),
-            no_show=len([a for a in all_appointments if a.status == "no-show"])
+    async def get_admin_dashboard(
+        self,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None
+    ) -> AdminDashboard:
+        """
+        Obtener dashboard completo para admin.
+        El rango de fechas (opcional) solo aplica a los rankings.
+        """
+        
+        # Estadísticas de citas y walk-ins (agregadas en la BD)
+        appointments_stats, walk_ins = await self._get_appointment_stats()
+        
+        # Total de usuarios y servicios en una sola consulta
+        result = await self.db.execute(
+            select(
+                select(func.count(User.id)).where(User.role == "client").scalar_subquery(),
+                select(func.count(User.id)).where(User.role == "stylist").scalar_subquery(),
+                select(func.count(Service.id)).scalar_subquery()
+            )
         )
-        
-        # Total de usuarios
-        result = await self.db.execute(select(func.count(User.id)).where(User.role == "client"))
-        total_clients = result.scalar()
-        
-        result = await self.db.execute(select(func.count(User.id)).where(User.role == "stylist"))
-        total_stylists = result.scalar()
-        
-        result = await self.db.execute(select(func.count(Service.id)))
-        total_services = result.scalar()
+        total_clients, total_stylists, total_services = result.one()
         
         # Top estilistas
-        top_stylists = await self._get_top_stylists()
+        top_stylists = await self._get_top_stylists(start_date=start_date, end_date=end_date)
         
         # Top servicios
-        top_services = await self._get_top_services()
+        top_services = await self._get_top_services(start_date=start_date, end_date=end_date)
         
         # Porcentaje walk-in
-        walk_ins = len([a for a in all_appointments if a.is_walk_in])
-        walk_in_percentage = (walk_ins / len(all_appointments) * 100) if all_appointments else 0
+        total = appointments_stats.total
+        walk_in_percentage = (walk_ins / total * 100) if total else 0
         
-        # Citas recientes
+        # Citas recientes (el id autoincremental sigue el orden de creación y evita ordenar toda la tabla)
         result = await self.db.execute(
-            select(Appointment).order_by(desc(Appointment.created_at)).limit(5)
+            select(Appointment).order_by(desc(Appointment.id)).limit(5)
         )
         recent_appointments_models = result.scalars().all()
-        recent_appointments = [
-            await self._appointment_to_summary(a) for a in recent_appointments_models
-        ]
+        recent_appointments = await self._appointments_to_summaries(recent_appointments_models)
         
         return AdminDashboard(
             appointments_stats=appointments_stats,
@@ -106,66 +151,111 @@ class DashboardService:
             recent_appointments=recent_appointments
         )
 
-    async def _get_top_stylists(self, limit: int = 5) -> List[StylistRanking]:
-        """Obtener ranking de estilistas"""
-        result = await self.db.execute(select(User).where(User.role == "stylist"))
-        stylists = result.scalars().all()
+    async def _get_appointment_stats(self) -> tuple[AppointmentStats, int]:
+        """Conteo de citas por estado y total de walk-ins desde el rollup diario"""
+        result = await self.db.execute(
+            select(
+                DailyAppointmentStats.status,
+                func.sum(DailyAppointmentStats.total),
+                func.sum(case((DailyAppointmentStats.is_walk_in == True, DailyAppointmentStats.total), else_=0))
+            ).group_by(DailyAppointmentStats.status)
+        )
         
-        rankings = []
-        for stylist in stylists:
-            result = await self.db.execute(
-                select(func.count(Appointment.id)).where(Appointment.stylist_id == stylist.id)
-            )
-            total = result.scalar() or 0
-            
-            result = await self.db.execute(
-                select(func.count(Appointment.id)).where(
-                    and_(
-                        Appointment.stylist_id == stylist.id,
-                        Appointment.status == "completed"
-                    )
-                )
+        by_status: dict[str, int] = {}
+        walk_ins = 0
+        for status, count, status_walk_ins in result.all():
+            by_status[status] = int(count or 0)
+            walk_ins += int(status_walk_ins or 0)
+        
+        appointments_stats = AppointmentStats(
+            total=sum(by_status.values()),
+            pending=by_status.get("pending", 0),
+            confirmed=by_status.get("confirmed", 0),
+            completed=by_status.get("completed", 0),
+            cancelled=by_status.get("cancelled", 0),
+            no_show=by_status.get("no-show", 0)
+        )
+        return appointments_stats, walk_ins
+
+    @staticmethod
+    def _date_window(start_date: Optional[date], end_date: Optional[date]) -> list:
+        """Condiciones sobre el día del rollup para un rango (ambos extremos incluidos)"""
+        conditions = []
+        if start_date:
+            conditions.append(DailyAppointmentStats.day >= start_date)
+        if end_date:
+            conditions.append(DailyAppointmentStats.day <= end_date)
+        return conditions
+
+    async def _get_top_stylists(
+        self,
+        limit: int = 5,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None
+    ) -> List[StylistRanking]:
+        """Obtener ranking de estilistas (una sola consulta agregada sobre el rollup)"""
+        total = func.coalesce(func.sum(DailyAppointmentStats.total), 0).label("total")
+        completed = func.sum(
+            case((DailyAppointmentStats.status == "completed", DailyAppointmentStats.total), else_=0)
+        ).label("completed")
+        
+        result = await self.db.execute(
+            select(User.id, User.name, total, completed)
+            .outerjoin(
+                DailyAppointmentStats,
+                and_(DailyAppointmentStats.stylist_id == User.id, *self._date_window(start_date, end_date))
             )
-            completed = result.scalar() or 0
-            
-            rankings.append(StylistRanking(
-                stylist_id=stylist.id,
-                stylist_name=stylist.name,
-                total_appointments=total,
-                completed_appointments=completed
-            ))
+            .where(User.role == "stylist")
+            .group_by(User.id, User.name)
+            .order_by(desc(total), User.id)
+            .limit(limit)
+        )
         
-        # Ordenar por total de citas
-        rankings.sort(key=lambda x: x.total_appointments, reverse=True)
-        return rankings[:limit]
+        return [
+            StylistRanking(
+                stylist_id=stylist_id,
+                stylist_name=stylist_name,
+                total_appointments=int(total_appointments or 0),
+                completed_appointments=int(completed_appointments or 0)
+            )
+            for stylist_id, stylist_name, total_appointments, completed_appointments in result.all()
+        ]
 
-    async def _get_top_services(self, limit: int = 5) -> List[ServiceRanking]:
-        """Obtener ranking de servicios"""
-        result = await self.db.execute(select(Service))
-        services = result.scalars().all()
+    async def _get_top_services(
+        self,
+        limit: int = 5,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None
+    ) -> List[ServiceRanking]:
+        """Obtener ranking de servicios (una sola consulta agregada sobre el rollup)"""
+        times_booked = func.coalesce(func.sum(DailyAppointmentStats.total), 0).label("times_booked")
         
-        rankings = []
-        for service in services:
-            result = await self.db.execute(
-                select(func.count(Appointment.id)).where(Appointment.service_id == service.id)
+        result = await self.db.execute(
+            select(Service.id, Service.name, times_booked)
+            .outerjoin(
+                DailyAppointmentStats,
+                and_(DailyAppointmentStats.service_id == Service.id, *self._date_window(start_date, end_date))
             )
-            count = result.scalar() or 0
-            
-            rankings.append(ServiceRanking(
-                service_id=service.id,
-                service_name=service.name,
-                times_booked=count
-            ))
+            .group_by(Service.id, Service.name)
+            .order_by(desc(times_booked), Service.id)
+            .limit(limit)
+        )
         
-        # Ordenar por veces reservado
-        rankings.sort(key=lambda x: x.times_booked, reverse=True)
-        return rankings[:limit]
+        return [
+            ServiceRanking(
+                service_id=service_id,
+                service_name=service_name,
+                times_booked=int(count or 0)
+            )
+            for service_id, service_name, count in result.all()
+        ]
 
     #  RECEPTIONIST DASHBOARD 
 
     async def get_receptionist_dashboard(self) -> ReceptionistDashboard:
         """Obtener dashboard para recepcionista"""
-        today = datetime.now().date()
+        # Día UTC, el mismo del rollup y de la invalidación del cache
+        today = to_naive_utc(datetime.now(timezone.utc)).date()
         start_of_day = datetime.combine(today, time.min)
         end_of_day = datetime.combine(today, time.max)
         
@@ -179,9 +269,6 @@ class DashboardService:
             ).order_by(Appointment.date)
         )
         appointments_today_models = result.scalars().all()
-        appointments_today = [
-            await self._appointment_to_summary(a) for a in appointments_today_models
-        ]
         
         # Citas pendientes de confirmar
         result = await self.db.execute(
@@ -190,9 +277,13 @@ class DashboardService:
             ).order_by(Appointment.date).limit(10)
         )
         pending_models = result.scalars().all()
-        pending_confirmations = [
-            await self._appointment_to_summary(a) for a in pending_models
-        ]
+        
+        # Nombres de ambas listas resueltos en un solo lote
+        summaries = await self._appointments_to_summaries(
+            list(appointments_today_models) + list(pending_models)
+        )
+        appointments_today = summaries[:len(appointments_today_models)]
+        pending_confirmations = summaries[len(appointments_today_models):]
         
         # Disponibilidad de estilistas hoy
         stylists_availability = await self._get_stylists_availability_today()
@@ -211,34 +302,49 @@ class DashboardService:
 
     async def _get_stylists_availability_today(self) -> List[StylistAvailabilityToday]:
         """Obtener disponibilidad de estilistas hoy"""
-        result = await self.db.execute(select(User).where(User.role == "stylist"))
-        stylists = result.scalars().all()
+        # El rollup, StatsService y dashboard_cache usan días UTC (to_naive_utc)
+        now = to_naive_utc(datetime.now(timezone.utc))
+        today = now.date()
         
-        today = datetime.now().date()
-        start_of_day = datetime.combine(today, time.min)
-        end_of_day = datetime.combine(today, time.max)
+        # Citas de hoy por estilista en una sola consulta (rollup)
+        result = await self.db.execute(
+            select(User.id, User.name, func.coalesce(func.sum(DailyAppointmentStats.total), 0))
+            .outerjoin(
+                DailyAppointmentStats,
+                and_(
+                    DailyAppointmentStats.stylist_id == User.id,
+                    DailyAppointmentStats.day == today
+                )
+            )
+            .where(User.role == "stylist")
+            .group_by(User.id, User.name)
+        )
         
+        rows = result.all()
+
+        # Próximo hueco de cada estilista: una consulta para todos y búsqueda en memoria
+        schedules = await schedule_cache.get(self.db)
+        end_of_day = datetime.combine(now.date() + timedelta(days=1), time.min)
+        busy_index = await load_busy_intervals(self.db, [row[0] for row in rows], now, end_of_day) if rows else {}
+        empty = BusyIntervals()
+
         availability_list = []
         
-        for stylist in stylists:
-            result = await self.db.execute(
-                select(func.count(Appointment.id)).where(
-                    and_(
-                        Appointment.stylist_id == stylist.id,
-                        Appointment.date >= start_of_day,
-                        Appointment.date <= end_of_day
-                    )
-                )
-            )
-            appointments_today = result.scalar() or 0
-            
-            # Próximo slot disponible (simplificado)
-            next_slot = "Available"  # Aquí podrías calcular el próximo slot real
+        for stylist_id, stylist_name, appointments_today in rows:
+            next_start = next(stylist_openings(
+                busy_index.get(stylist_id, empty),
+                [now.date()],
+                timedelta(minutes=RECEPTION_SLOT_MINUTES),
+                timedelta(minutes=NEXT_AVAILABLE_STEP_MINUTES),
+                now,
+                partial(schedules.windows, stylist_id)
+            ), None)
+            next_slot = next_start.strftime("%H:%M") if next_start else None
             
             availability_list.append(StylistAvailabilityToday(
-                stylist_id=stylist.id,
-                stylist_name=stylist.name,
-                appointments_today=appointments_today,
+                stylist_id=stylist_id,
+                stylist_name=stylist_name,
+                appointments_today=int(appointments_today),
                 next_available_slot=next_slot
             ))
         
@@ -267,18 +373,15 @@ class DashboardService:
         
         next_appointment = None
         if next_appointment_model:
-            service = await self.db.get(Service, next_appointment_model.service_id)
-            client_name = next_appointment_model.client_name if next_appointment_model.is_walk_in else None
-            if not client_name and next_appointment_model.client_id:
-                client = await self.db.get(User, next_appointment_model.client_id)
-                client_name = client.name if client else "Unknown"
+            users, services = await self._load_names([next_appointment_model])
+            service_name, duration_min = services.get(next_appointment_model.service_id, ("Unknown", 30))
             
             next_appointment = NextAppointment(
                 id=next_appointment_model.id,
-                client_name=client_name or "Unknown",
-                service_name=service.name if service else "Unknown",
+                client_name=self._client_name(next_appointment_model, users),
+                service_name=service_name,
                 date=next_appointment_model.date,
-                duration_min=service.duration_min if service else 30,
+                duration_min=duration_min,
                 is_walk_in=next_appointment_model.is_walk_in
             )
         
@@ -293,9 +396,6 @@ class DashboardService:
             ).order_by(Appointment.date)
         )
         appointments_today_models = result.scalars().all()
-        appointments_today = [
-            await self._appointment_to_summary(a) for a in appointments_today_models
-        ]
         
         # Próximas citas (próximos 7 días)
         week_later = now + timedelta(days=7)
@@ -310,22 +410,25 @@ class DashboardService:
             ).order_by(Appointment.date)
         )
         upcoming_models = result.scalars().all()
-        appointments_upcoming = [
-            await self._appointment_to_summary(a) for a in upcoming_models
-        ]
+        
+        summaries = await self._appointments_to_summaries(
+            list(appointments_today_models) + list(upcoming_models)
+        )
+        appointments_today = summaries[:len(appointments_today_models)]
+        appointments_upcoming = summaries[len(appointments_today_models):]
         
         # Total completadas este mes
-        start_of_month = datetime(now.year, now.month, 1)
+        start_of_month = today.replace(day=1)
         result = await self.db.execute(
-            select(func.count(Appointment.id)).where(
+            select(func.sum(DailyAppointmentStats.total)).where(
                 and_(
-                    Appointment.stylist_id == stylist_id,
-                    Appointment.status == "completed",
-                    Appointment.date >= start_of_month
+                    DailyAppointmentStats.stylist_id == stylist_id,
+                    DailyAppointmentStats.status == "completed",
+                    DailyAppointmentStats.day >= start_of_month
                 )
             )
         )
-        total_completed_this_month = result.scalar() or 0
+        total_completed_this_month = int(result.scalar() or 0)
         
         return StylistDashboard(
             next_appointment=next_appointment,
@@ -351,9 +454,6 @@ class DashboardService:
             ).order_by(Appointment.date)
         )
         upcoming_models = result.scalars().all()
-        upcoming_appointments = [
-            await self._appointment_to_summary(a) for a in upcoming_models
-        ]
         
         # Citas pasadas (últimas 5)
         result = await self.db.execute(
@@ -365,9 +465,10 @@ class DashboardService:
             ).order_by(desc(Appointment.date)).limit(5)
         )
         past_models = result.scalars().all()
-        past_appointments = [
-            await self._appointment_to_summary(a) for a in past_models
-        ]
+        
+        summaries = await self._appointments_to_summaries(list(upcoming_models) + list(past_models))
+        upcoming_appointments = summaries[:len(upcoming_models)]
+        past_appointments = summaries[len(upcoming_models):]
         
         # Total de citas
         result = await self.db.execute(
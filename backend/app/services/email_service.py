@@ -1,18 +1,30 @@
 # app/services/email_service.py
+import asyncio
+import functools
 import smtplib
+from concurrent.futures import ThreadPoolExecutor
+from email.message import Message
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from app.core.config import settings
+from app.services.smtp_pool import SMTPConnectionPool, smtp_pool
+
+# Pool acotado de hilos para SMTP: smtplib es bloqueante y no debe correr en el event loop
+_email_executor = ThreadPoolExecutor(
+    max_workers=settings.EMAIL_MAX_WORKERS,
+    thread_name_prefix="email"
+)
 
 class EmailService:
-    def __init__(self):
+    def __init__(self, pool: SMTPConnectionPool | None = None):
         self.smtp_server = settings.SMTP_SERVER
         self.smtp_port = settings.SMTP_PORT
         self.sender = settings.EMAIL_SENDER
         self.password = settings.EMAIL_PASSWORD
+        self.pool = pool or smtp_pool
 
-    def send_email(self, to_email: str, subject: str, body: str, html: str | None = None):
-        """Envia un correo con soporte para HTML."""
+    def build_message(self, to_email: str, subject: str, body: str, html: str | None = None) -> Message:
+        """Arma el mensaje, multipart si viene HTML."""
         if html:
             # Crear mensaje multipart para HTML
             msg = MIMEMultipart("alternative")
@@ -33,11 +45,56 @@ class EmailService:
             msg["To"] = to_email
             msg["Subject"] = subject
 
+        return msg
+
+    def send_email(self, to_email: str, subject: str, body: str, html: str | None = None):
+        """Envia un correo reutilizando una conexión del pool SMTP."""
+        msg = self.build_message(to_email, subject, body, html)
         try:
-            with smtplib.SMTP(self.smtp_server, self.smtp_port) as server:
-                server.starttls()
-                server.login(self.sender, self.password)
-                server.send_message(msg)
+            self.pool.send_message(msg)
             print(f"Email enviado a {to_email}")
         except Exception as e:
             print(f"❌ Error al enviar email a {to_email}: {e}")
+            # Propagar para que la notificación quede como fallida
+            raise
+
+    def send_messages(self, messages: list[Message]) -> list[Exception | None]:
+        """
+        Envía varios mensajes por una misma conexión del pool.
+        Retorna el error de cada mensaje, o None si se entregó.
+        """
+        errors: list[Exception | None] = []
+        if not messages:
+            return errors
+        try:
+            with self.pool.connection() as conn:
+                for msg in messages:
+                    try:
+                        self.pool.send_on(conn, msg)
+                        errors.append(None)
+                    except (smtplib.SMTPRecipientsRefused, smtplib.SMTPSenderRefused, smtplib.SMTPDataError) as e:
+                        # Rechazo de ese mensaje: la conexión sigue sirviendo para los demás
+                        errors.append(e)
+        except Exception as e:
+            # Sin conexión: el mensaje en curso y los restantes quedan con este error
+            print(f"❌ Error al enviar lote de {len(messages)} emails: {e}")
+            errors.extend([e] * (len(messages) - len(errors)))
+        return errors
+
+    async def send_messages_async(self, messages: list[Message]) -> list[Exception | None]:
+        """Envía un lote desde el pool de hilos sin bloquear el event loop."""
+        if not messages:
+            return []
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            _email_executor,
+            functools.partial(self.send_messages, messages)
+        )
+
+    async def send_email_async(self, to_email: str, subject: str, body: str, html: str | None = None):
+        """Envía el correo desde el pool de hilos sin bloquear el event loop."""
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(
+            _email_executor,
+            functools.partial(self.send_email, to_email, subject, body, html)
+        )
@@ -0,0 +1,147 @@
+# app/services/notification_broker.py
+import asyncio
+import contextlib
+import json
+from typing import AsyncIterator, Awaitable, Callable, Protocol
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+# Eventos por suscriptor que se guardan si el navegador no los consume;
+# al llenarse se descarta el más antiguo (el cliente puede recuperarlo con Last-Event-ID)
+SUBSCRIBER_QUEUE_SIZE = 100
+
+# Comentario periódico para que proxies y navegadores no cierren la conexión ociosa
+KEEPALIVE_SECONDS = 15
+
+# Clave en session.info con las notificaciones web a publicar tras el commit
+PENDING_WEB_NOTIFICATIONS = "pending_web_notifications"
+
+
+class FanoutBackend(Protocol):
+    """
+    Reparto de eventos entre procesos.
+    Un backend compartido (p. ej. Redis pub/sub) publica hacia todos los
+    procesos y en cada uno llama a `deliver` con lo recibido.
+    """
+
+    def start(self, deliver: Callable[[int, dict], None]) -> None: ...
+
+    def publish(self, user_id: int, payload: dict) -> None: ...
+
+    async def stop(self) -> None: ...
+
+
+class LocalFanout:
+    """Backend de un solo proceso: entrega directo a los suscriptores locales"""
+
+    def __init__(self):
+        self._deliver: Callable[[int, dict], None] | None = None
+
+    def start(self, deliver: Callable[[int, dict], None]) -> None:
+        self._deliver = deliver
+
+    def publish(self, user_id: int, payload: dict) -> None:
+        if self._deliver is not None:
+            self._deliver(user_id, payload)
+
+    async def stop(self) -> None:
+        self._deliver = None
+
+
+class NotificationBroker:
+    """
+    Pub/sub en memoria de notificaciones web por usuario.
+
+    Cada conexión SSE se suscribe con una cola acotada; publish() pasa por el
+    backend de fan-out, que en cada proceso entrega a las colas locales.
+    """
+
+    def __init__(self, backend: FanoutBackend, queue_size: int = SUBSCRIBER_QUEUE_SIZE):
+        self.backend = backend
+        self.queue_size = queue_size
+        self._subscribers: dict[int, set[asyncio.Queue]] = {}
+        self.published = 0
+        self.dropped = 0
+        self.backend.start(self._deliver_local)
+
+    @contextlib.asynccontextmanager
+    async def subscribe(self, user_id: int) -> AsyncIterator[asyncio.Queue]:
+        """Cola con las notificaciones del usuario mientras dure el contexto"""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        self._subscribers.setdefault(user_id, set()).add(queue)
+        try:
+            yield queue
+        finally:
+            queues = self._subscribers.get(user_id)
+            if queues is not None:
+                queues.discard(queue)
+                if not queues:
+                    del self._subscribers[user_id]
+
+    def publish(self, user_id: int, payload: dict) -> None:
+        """Publicar una notificación para todas las conexiones del usuario"""
+        self.published += 1
+        self.backend.publish(user_id, payload)
+
+    def _deliver_local(self, user_id: int, payload: dict) -> None:
+        for queue in self._subscribers.get(user_id, ()):
+            if queue.full():
+                queue.get_nowait()
+                self.dropped += 1
+            queue.put_nowait(payload)
+
+    async def stream(
+        self,
+        user_id: int,
+        is_disconnected: Callable[[], Awaitable[bool]],
+        backlog: Callable[[], Awaitable[list[dict]]] | None = None,
+        keepalive: float = KEEPALIVE_SECONDS
+    ) -> AsyncIterator[str]:
+        """
+        Eventos SSE del usuario hasta que se desconecte.
+        `backlog` se consulta ya suscrito, así no se pierde nada entre la
+        consulta y la suscripción (el cliente descarta ids repetidos).
+        """
+        async with self.subscribe(user_id) as queue:
+            yield "retry: 5000\n\n"
+            if backlog is not None:
+                for payload in await backlog():
+                    yield format_event(payload)
+            while not await is_disconnected():
+                try:
+                    payload = await asyncio.wait_for(queue.get(), timeout=keepalive)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield format_event(payload)
+
+    def stats(self) -> dict:
+        """Conexiones abiertas y eventos publicados/descartados"""
+        return {
+            "users": len(self._subscribers),
+            "connections": sum(len(queues) for queues in self._subscribers.values()),
+            "published": self.published,
+            "dropped": self.dropped
+        }
+
+
+def format_event(payload: dict) -> str:
+    """Serializar una notificación como evento SSE"""
+    data = json.dumps(payload, ensure_ascii=False)
+    return f"id: {payload['id']}\nevent: notification\ndata: {data}\n\n"
+
+
+notification_broker = NotificationBroker(LocalFanout())
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_committed_web_notifications(session: Session):
+    """NotificationService deja las notificaciones web en session.info; se publican solo si el commit se hizo"""
+    for user_id, payload in session.info.pop(PENDING_WEB_NOTIFICATIONS, ()):
+        notification_broker.publish(user_id, payload)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_rolled_back_web_notifications(session: Session):
+    session.info.pop(PENDING_WEB_NOTIFICATIONS, None)
@@ -1,14 +1,25 @@
 # app/services/notification_service.py
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
+from typing import Iterable
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import delete, func, or_, select, update
 from app.models.notification import Notification
 from app.models.appointment import Appointment
 from app.models.user import User
 from app.models.service import Service
-from app.services.user_service import UserService
 from app.services.email_service import EmailService
-from app.utils.email_templates import generate_appointment_email_html
+from app.services.notification_broker import PENDING_WEB_NOTIFICATIONS
+from app.utils.email_templates import generate_appointment_email_html, generate_appointment_email_text
+from app.utils.time_slots import to_naive_utc
+
+# Outbox de correos: reintentos con backoff exponencial (1, 2, 4, 8 min...)
+MAX_EMAIL_ATTEMPTS = 5
+RETRY_BASE_SECONDS = 60
+# Tiempo que un worker reserva una notificación antes de que otro pueda reintentarla
+CLAIM_LEASE_SECONDS = 300
+# Bandeja web: tamaño máximo de página y de ids por marcado masivo
+MAX_INBOX_PAGE_SIZE = 100
+MAX_MARK_READ_IDS = 1000
 
 class NotificationService:
     def __init__(self, db: AsyncSession):
@@ -37,17 +48,25 @@ class NotificationService:
         )
         self.db.add(db_notification)
         await self.db.flush()
+        if channel == "web":
+            self.db.info.setdefault(PENDING_WEB_NOTIFICATIONS, []).append(
+                (user_id, self.to_event(db_notification))
+            )
         return db_notification
 
-    async def create_and_send_notification(
+    async def enqueue_notifications(
         self,
         appointment_id: int,
         user_id: int,
         type: str,
     ) -> list[Notification]:
         """
-        Crea notificaciones de tipo email y web, y envía la de email inmediatamente.
-        
+        Crea las notificaciones de email y web sin hacer commit.
+
+        El email queda "pendiente" en la misma transacción que la cita (outbox)
+        y lo entrega el worker de notificaciones; la web queda enviada porque
+        el frontend la lee directo de la BD.
+
         Args:
             appointment_id: ID de la cita
             user_id: ID del usuario
@@ -56,40 +75,234 @@ class NotificationService:
         Returns:
             Lista con las notificaciones creadas [email_notification, web_notification]
         """
+        return await self.enqueue_many([(appointment_id, user_id)], type)
+
+    async def enqueue_many(
+        self,
+        recipients: list[tuple[int, int]],
+        type: str
+    ) -> list[Notification]:
+        """
+        Versión en lote de enqueue_notifications para pares (appointment_id, user_id),
+        con un solo flush. Retorna [email, web] por cada destinatario.
+        """
         # Generar título y body según el tipo
         notification_content = self._get_notification_content(type)
-        
-        # Crear notificación de email
-        email_notification = await self.create_notification(
-            appointment_id=appointment_id,
-            user_id=user_id,
-            type=type,
-            channel="email",
-            status="pendiente",
-            title=notification_content["title"],
-            body=notification_content["body"]
+        sent_at = datetime.now(timezone.utc)
+
+        notifications = []
+        for appointment_id, user_id in recipients:
+            for channel in ("email", "web"):
+                notification = Notification(
+                    appointment_id=appointment_id,
+                    user_id=user_id,
+                    type=type,
+                    channel=channel,
+                    # El email se entrega desde el outbox; la web ya quedó disponible
+                    status="pendiente" if channel == "email" else "enviado",
+                    sent_at=None if channel == "email" else sent_at,
+                    title=notification_content["title"],
+                    body=notification_content["body"]
+                )
+                self.db.add(notification)
+                notifications.append(notification)
+        await self.db.flush()
+
+        # Las web se envían por SSE cuando la transacción hace commit
+        self.db.info.setdefault(PENDING_WEB_NOTIFICATIONS, []).extend(
+            (notification.user_id, self.to_event(notification))
+            for notification in notifications
+            if notification.channel == "web"
         )
-        
-        # Crear notificación web
-        web_notification = await self.create_notification(
-            appointment_id=appointment_id,
-            user_id=user_id,
-            type=type,
-            channel="web",
-            status="pendiente",
-            title=notification_content["title"],
-            body=notification_content["body"]
+        return notifications
+
+    @staticmethod
+    def to_event(notification: Notification) -> dict:
+        """Datos de una notificación web tal como se envían al navegador"""
+        return {
+            "id": notification.id,
+            "appointment_id": notification.appointment_id,
+            "type": notification.type,
+            "title": notification.title,
+            "body": notification.body,
+            "sent_at": notification.sent_at.isoformat() if notification.sent_at else None
+        }
+
+    async def list_web_since(self, user_id: int, last_id: int, limit: int = 50) -> list[Notification]:
+        """Notificaciones web del usuario posteriores a last_id (reconexión SSE)"""
+        result = await self.db.execute(
+            select(Notification)
+            .where(
+                Notification.user_id == user_id,
+                Notification.channel == "web",
+                Notification.id > last_id
+            )
+            .order_by(Notification.id)
+            .limit(limit)
         )
+        return result.scalars().all()
 
-        # Enviar la notificación por email
-        await self.send_email_notification(email_notification.id)
-        
-        # Marcar la notificación web como enviada (ya está en la BD para que el frontend la consuma)
-        web_notification.status = "enviado"
-        web_notification.sent_at = datetime.now(timezone.utc)
-        await self.db.flush()
+    def _inbox_filter(self, user_id: int) -> list:
+        return [Notification.user_id == user_id, Notification.channel == "web"]
+
+    async def list_inbox(
+        self,
+        user_id: int,
+        cursor: int | None = None,
+        limit: int = 20,
+        unread_only: bool = False
+    ) -> tuple[list[Notification], int | None]:
+        """
+        Bandeja web del usuario, más reciente primero.
+
+        Paginación por keyset: `cursor` es el último id de la página anterior
+        y se lee `id < cursor` sobre el índice, sin OFFSET. Retorna los
+        elementos y el cursor de la siguiente página (None si no hay más).
+        """
+        limit = max(1, min(limit, MAX_INBOX_PAGE_SIZE))
+        conditions = self._inbox_filter(user_id)
+        if cursor is not None:
+            conditions.append(Notification.id < cursor)
+        if unread_only:
+            conditions.append(Notification.read_at.is_(None))
+
+        result = await self.db.execute(
+            select(Notification)
+            .where(*conditions)
+            .order_by(Notification.id.desc())
+            .limit(limit + 1)
+        )
+        items = list(result.scalars().all())
+        if len(items) > limit:
+            items = items[:limit]
+            return items, items[-1].id
+        return items, None
+
+    async def count_unread(self, user_id: int) -> int:
+        """Cantidad de notificaciones web no leídas (solo lee ix_notifications_unread)"""
+        result = await self.db.execute(
+            select(func.count())
+            .select_from(Notification)
+            .where(*self._inbox_filter(user_id), Notification.read_at.is_(None))
+        )
+        return result.scalar_one()
+
+    async def mark_read(
+        self,
+        user_id: int,
+        ids: list[int] | None = None,
+        up_to_id: int | None = None
+    ) -> int:
+        """
+        Marcar como leídas (con commit) las notificaciones web del usuario:
+        las de `ids`, o si no se indican todas las no leídas hasta `up_to_id`.
+        Las de otros usuarios se ignoran. Retorna cuántas se marcaron.
+        """
+        conditions = [*self._inbox_filter(user_id), Notification.read_at.is_(None)]
+        if ids is not None:
+            ids = set(ids)
+            if not ids:
+                return 0
+            if len(ids) > MAX_MARK_READ_IDS:
+                raise ValueError(f"No se pueden marcar más de {MAX_MARK_READ_IDS} notificaciones a la vez")
+            conditions.append(Notification.id.in_(ids))
+        elif up_to_id is not None:
+            conditions.append(Notification.id <= up_to_id)
+
+        result = await self.db.execute(
+            update(Notification)
+            .where(*conditions)
+            .values(read_at=datetime.now(timezone.utc))
+            .execution_options(synchronize_session=False)
+        )
+        await self.db.commit()
+        return result.rowcount
+
+    @staticmethod
+    def _expired_filter(cutoff: datetime) -> list:
+        # Los correos pendientes siguen en el outbox aunque sean viejos
+        return [Notification.created_at < cutoff, Notification.status != "pendiente"]
+
+    async def count_expired(self, cutoff: datetime) -> int:
+        """Cantidad de notificaciones creadas antes de `cutoff` que se pueden borrar"""
+        result = await self.db.execute(
+            select(func.count()).select_from(Notification).where(*self._expired_filter(cutoff))
+        )
+        return result.scalar_one()
+
+    async def fetch_expired(self, cutoff: datetime, limit: int, after_id: int = 0) -> list[Notification]:
+        """Siguiente lote (por id) de notificaciones a archivar"""
+        result = await self.db.execute(
+            select(Notification)
+            .where(*self._expired_filter(cutoff), Notification.id > after_id)
+            .order_by(Notification.id)
+            .limit(limit)
+        )
+        return result.scalars().all()
+
+    async def delete_by_ids(self, ids: list[int]) -> int:
+        """Borrar notificaciones por id (sin hacer commit)"""
+        result = await self.db.execute(
+            delete(Notification)
+            .where(Notification.id.in_(ids))
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount
+
+    @staticmethod
+    def to_archive_record(notification: Notification) -> dict:
+        """Fila completa serializable a JSON para el archivo de retención"""
+        record = {}
+        for column in Notification.__table__.columns:
+            value = getattr(notification, column.key)
+            record[column.key] = value.isoformat() if isinstance(value, datetime) else value
+        return record
 
-        return [email_notification, web_notification]
+    async def claim_pending_emails(self, limit: int) -> list[int]:
+        """
+        Reserva hasta `limit` correos pendientes y hace commit.
+
+        FOR UPDATE SKIP LOCKED permite que varios workers reclamen lotes
+        distintos a la vez; la reserva (next_attempt_at en el futuro) evita que
+        otro worker tome la misma fila mientras se envía. Si el worker muere,
+        la fila vuelve a estar disponible al vencer la reserva.
+        """
+        now = to_naive_utc(datetime.now(timezone.utc))
+        result = await self.db.execute(
+            select(Notification.id)
+            .where(
+                Notification.channel == "email",
+                Notification.status == "pendiente",
+                or_(Notification.next_attempt_at.is_(None), Notification.next_attempt_at <= now)
+            )
+            .order_by(Notification.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        ids = list(result.scalars().all())
+        if ids:
+            await self.db.execute(
+                update(Notification)
+                .where(Notification.id.in_(ids))
+                .values(
+                    attempts=Notification.attempts + 1,
+                    next_attempt_at=now + timedelta(seconds=CLAIM_LEASE_SECONDS)
+                )
+            )
+        await self.db.commit()
+        return ids
+
+    @staticmethod
+    def _mark_failed_attempt(notification: Notification, error: str):
+        """Reprogramar con backoff exponencial o marcar como fallida"""
+        notification.last_error = error[:255]
+        if notification.attempts >= MAX_EMAIL_ATTEMPTS:
+            notification.status = "fallido"
+            notification.next_attempt_at = None
+            return
+        delay = RETRY_BASE_SECONDS * 2 ** max(notification.attempts - 1, 0)
+        notification.status = "pendiente"
+        notification.next_attempt_at = to_naive_utc(datetime.now(timezone.utc)) + timedelta(seconds=delay)
 
     def _get_notification_content(self, type: str) -> dict:
         """Genera el título y body según el tipo de notificación."""
@@ -113,53 +326,8 @@ class NotificationService:
         }
         return content_map.get(type, content_map["reservado"])
 
-    async def send_email_notification(self, notification_id: int):
-        """Envía la notificación por correo al usuario asociado."""
-        # Obtener el objeto notification desde la BD con la sesión activa
-        notification = await self.db.get(Notification, notification_id)
-        
-        if not notification:
-            print(f"Error: Notificación {notification_id} no encontrada")
-            return
-        
-        user_service = UserService(self.db)
-        user = await user_service.get_user(notification.user_id)
-
-        if not user or not getattr(user, "email", None):
-            notification.status = "fallido"
-            await self.db.flush()
-            return
-
-        # Obtener datos completos de la cita
-        appointment_result = await self.db.execute(
-            select(Appointment).where(Appointment.id == notification.appointment_id)
-        )
-        appointment = appointment_result.scalar_one_or_none()
-        
-        if not appointment:
-            notification.status = "fallido"
-            await self.db.flush()
-            return
-        
-        # Obtener datos del servicio
-        service_result = await self.db.execute(
-            select(Service).where(Service.id == appointment.service_id)
-        )
-        service = service_result.scalar_one_or_none()
-        
-        # Obtener datos del estilista
-        stylist_result = await self.db.execute(
-            select(User).where(User.id == appointment.stylist_id)
-        )
-        stylist = stylist_result.scalar_one_or_none()
-        
-        # Preparar datos de la cita
-        appointment_data = {
-            "service_name": service.name if service else "N/A",
-            "stylist_name": stylist.name if stylist else "N/A",
-            "date": appointment.date
-        }
-        
+    def _render_email(self, notification_type: str, user_name: str, appointment_data: dict) -> tuple[str, str, str]:
+        """Asunto, texto plano y HTML del correo de una notificación"""
         # Definir subject según el tipo de notificación
         subject_map = {
             "reservado": "Cita Reservada - Monarca Beauty Salon",
@@ -167,29 +335,104 @@ class NotificationService:
             "cancelado": "Cita Cancelada - Monarca Beauty Salon",
             "recordatorio": "Recordatorio de Cita - Monarca Beauty Salon"
         }
-        subject = subject_map.get(notification.type, "Notificación de Cita - Monarca Beauty Salon")
-        
-        # Texto plano como fallback
-        fallback_messages = {
-            "reservado": f"Hola {user.name}, tu cita ha sido reservada y está pendiente de confirmación.",
-            "confirmado": f"Hola {user.name}, tu cita ha sido confirmada. ¡Te esperamos!",
-            "cancelado": f"Hola {user.name}, lamentamos informarte que tu cita ha sido cancelada.",
-            "recordatorio": f"Hola {user.name}, te recordamos tu próxima cita."
-        }
-        body = fallback_messages.get(notification.type, f"Hola {user.name}, actualización sobre tu cita.")
+        subject = subject_map.get(notification_type, "Notificación de Cita - Monarca Beauty Salon")
         
-        # Generar HTML usando la función de utilidad
+        # Texto plano (alternativa al HTML) y HTML desde las mismas plantillas precompiladas
+        body = generate_appointment_email_text(
+            user_name=user_name,
+            notification_type=notification_type,
+            appointment_data=appointment_data
+        )
         html = generate_appointment_email_html(
-            user_name=user.name,
-            notification_type=notification.type,
+            user_name=user_name,
+            notification_type=notification_type,
             appointment_data=appointment_data
         )
+        return subject, body, html
 
-        try:
-            self.email_service.send_email(user.email, subject, body, html)
-            notification.status = "enviado"
-            notification.sent_at = datetime.now(timezone.utc)
-            await self.db.flush()
-        except Exception as e:
-            print(f"Error enviando email: {e}")
-            notification.status = "fallido"
+    async def send_email_notification(self, notification_id: int):
+        """Envía la notificación por correo al usuario asociado (sin hacer commit)."""
+        await self.send_email_notifications([notification_id])
+
+    async def send_email_notifications(self, notification_ids: Iterable[int]) -> dict[str, int]:
+        """
+        Envía un lote de notificaciones por correo (sin hacer commit).
+
+        Carga notificaciones, citas, usuarios y servicios con una consulta IN
+        por tabla, renderiza todos los correos y los envía por una misma
+        conexión SMTP. Si un envío falla queda pendiente con backoff hasta
+        agotar los intentos. Retorna cuántas quedaron en cada estado.
+        """
+        counts = {"enviado": 0, "pendiente": 0, "fallido": 0}
+        ids = list(dict.fromkeys(notification_ids))
+        if not ids:
+            return counts
+
+        # Solo correos todavía pendientes: un id ya enviado, fallido o de otro canal se ignora
+        result = await self.db.execute(
+            select(Notification)
+            .where(
+                Notification.id.in_(ids),
+                Notification.channel == "email",
+                Notification.status == "pendiente"
+            )
+            .order_by(Notification.id)
+        )
+        notifications = result.scalars().all()
+
+        appointment_ids = {n.appointment_id for n in notifications}
+        result = await self.db.execute(
+            select(Appointment).where(Appointment.id.in_(appointment_ids))
+        )
+        appointments = {a.id: a for a in result.scalars().all()}
+
+        # Clientes y estilistas en una sola consulta
+        user_ids = {n.user_id for n in notifications} | {a.stylist_id for a in appointments.values()}
+        result = await self.db.execute(select(User).where(User.id.in_(user_ids)))
+        users = {u.id: u for u in result.scalars().all()}
+
+        service_ids = {a.service_id for a in appointments.values()}
+        result = await self.db.execute(select(Service).where(Service.id.in_(service_ids)))
+        services = {s.id: s for s in result.scalars().all()}
+
+        outgoing = []
+        for notification in notifications:
+            user = users.get(notification.user_id)
+            if not user or not getattr(user, "email", None):
+                notification.status = "fallido"
+                notification.last_error = "Usuario sin email"
+                continue
+
+            appointment = appointments.get(notification.appointment_id)
+            if not appointment:
+                notification.status = "fallido"
+                notification.last_error = "Cita no encontrada"
+                continue
+
+            service = services.get(appointment.service_id)
+            stylist = users.get(appointment.stylist_id)
+            appointment_data = {
+                "service_name": service.name if service else "N/A",
+                "stylist_name": stylist.name if stylist else "N/A",
+                "date": appointment.date
+            }
+            subject, body, html = self._render_email(notification.type, user.name, appointment_data)
+            outgoing.append((notification, self.email_service.build_message(user.email, subject, body, html)))
+
+        errors = await self.email_service.send_messages_async([msg for _, msg in outgoing])
+
+        sent_at = datetime.now(timezone.utc)
+        for (notification, _), error in zip(outgoing, errors):
+            if error is None:
+                notification.status = "enviado"
+                notification.sent_at = sent_at
+                notification.next_attempt_at = None
+                notification.last_error = None
+            else:
+                print(f"Error enviando email: {error}")
+                self._mark_failed_attempt(notification, str(error) or type(error).__name__)
+
+        await self.db.flush()
+        for notification in notifications:
+            counts[notification.status] += 1
+        return counts
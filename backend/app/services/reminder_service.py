@@ -0,0 +1,95 @@
+# app/services/reminder_service.py
+from datetime import datetime, timedelta
+from typing import Iterable
+
+from sqlalchemy import Select, and_, insert, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.appointment import Appointment
+from app.models.appointment_reminder import AppointmentReminder
+from app.services.notification_service import NotificationService
+from app.utils.time_slots import ACTIVE_STATUSES
+
+
+class ReminderService:
+    """Programación de recordatorios ("recordatorio") de citas próximas"""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.notification_service = NotificationService(db)
+
+    @staticmethod
+    def window_bands(windows_minutes: Iterable[int]) -> list[tuple[int, int]]:
+        """
+        Convertir ventanas (p. ej. [1440, 120]) en franjas (desde, hasta] en minutos:
+        [(0, 120), (120, 1440)]. Así una cita solo cae en la ventana más
+        cercana y no recibe dos recordatorios en el mismo barrido.
+        """
+        bands = []
+        lower = 0
+        for window in sorted(set(windows_minutes)):
+            bands.append((lower, window))
+            lower = window
+        return bands
+
+    @staticmethod
+    def due_query(window_minutes: int, lower_minutes: int, now: datetime) -> Select:
+        """
+        Citas activas de clientes registrados que empiezan en
+        (now + lower, now + window] y aún no tienen recordatorio de esa ventana.
+
+        Es un rango sobre ix_appointments_status_date más un anti-join por la
+        clave primaria de appointment_reminders, no un recorrido de la tabla.
+        """
+        return (
+            select(Appointment.id, Appointment.client_id)
+            .outerjoin(
+                AppointmentReminder,
+                and_(
+                    AppointmentReminder.appointment_id == Appointment.id,
+                    AppointmentReminder.window_minutes == window_minutes
+                )
+            )
+            .where(
+                Appointment.status.in_(ACTIVE_STATUSES),
+                Appointment.date > now + timedelta(minutes=lower_minutes),
+                Appointment.date <= now + timedelta(minutes=window_minutes),
+                Appointment.client_id.is_not(None),
+                AppointmentReminder.appointment_id.is_(None)
+            )
+            .order_by(Appointment.date, Appointment.id)
+        )
+
+    async def _record(self, window_minutes: int, rows: list[tuple[int, int]]):
+        await self.db.execute(
+            insert(AppointmentReminder),
+            [{"appointment_id": appointment_id, "window_minutes": window_minutes} for appointment_id, _ in rows]
+        )
+        await self.notification_service.enqueue_many(rows, "recordatorio")
+        await self.db.commit()
+
+    async def enqueue_batch(self, window_minutes: int, rows: list[tuple[int, int]]) -> int:
+        """
+        Registrar y encolar (con commit) los recordatorios de un lote de pares
+        (appointment_id, client_id). El registro y las notificaciones van en la
+        misma transacción; si otro programador ya registró alguna cita del
+        lote, se reintenta fila por fila saltando las repetidas.
+        Retorna cuántos recordatorios se encolaron.
+        """
+        if not rows:
+            return 0
+        try:
+            await self._record(window_minutes, rows)
+            return len(rows)
+        except IntegrityError:
+            await self.db.rollback()
+
+        enqueued = 0
+        for row in rows:
+            try:
+                await self._record(window_minutes, [row])
+                enqueued += 1
+            except IntegrityError:
+                await self.db.rollback()
+        return enqueued
@@ -0,0 +1,73 @@
+# app/services/schedule_cache.py
+import time
+from typing import Callable, Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.schedule_override import ScheduleOverride
+from app.models.stylist_schedule import StylistSchedule
+from app.utils.working_hours import WorkingSchedules
+
+
+class ScheduleCache:
+    """
+    Horarios de trabajo cargados una sola vez en memoria del proceso.
+
+    Disponibilidad y validación de citas los consultan sin ir a la base de
+    datos. ScheduleService invalida el cache al modificar horarios; el TTL
+    solo acota cuánto tarda otro proceso de la API en ver esos cambios.
+    """
+
+    def __init__(self, ttl: float, clock: Callable[[], float] = time.monotonic):
+        self.ttl = ttl
+        self._clock = clock
+        self._snapshot: Optional[WorkingSchedules] = None
+        self._expires_at = 0.0
+        # Sube con cada invalidación; evita guardar una carga hecha antes del cambio
+        self._generation = 0
+        self.loads = 0
+
+    async def get(self, db: AsyncSession) -> WorkingSchedules:
+        """Horarios en memoria; los recarga (dos consultas) si no hay o expiraron"""
+        if self._snapshot is not None and self._clock() < self._expires_at:
+            return self._snapshot
+
+        generation = self._generation
+        schedules = await db.execute(
+            select(
+                StylistSchedule.stylist_id,
+                StylistSchedule.weekday,
+                StylistSchedule.start_time,
+                StylistSchedule.end_time,
+                StylistSchedule.break_start,
+                StylistSchedule.break_end
+            )
+        )
+        overrides = await db.execute(
+            select(
+                ScheduleOverride.stylist_id,
+                ScheduleOverride.day,
+                ScheduleOverride.start_time,
+                ScheduleOverride.end_time
+            )
+        )
+        snapshot = WorkingSchedules.from_rows(schedules.all(), overrides.all())
+        self.loads += 1
+        if generation == self._generation:
+            self.set(snapshot)
+        return snapshot
+
+    def set(self, snapshot: WorkingSchedules):
+        """Reemplazar los horarios en memoria"""
+        self._snapshot = snapshot
+        self._expires_at = self._clock() + self.ttl
+
+    def invalidate(self):
+        """Descartar los horarios en memoria; la próxima consulta los recarga"""
+        self._generation += 1
+        self._snapshot = None
+
+
+schedule_cache = ScheduleCache(ttl=settings.SCHEDULE_CACHE_TTL_SECONDS)
@@ -0,0 +1,130 @@
+# app/services/schedule_service.py
+from datetime import date
+from typing import Optional
+
+from sqlalchemy import select
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.schedule_override import ScheduleOverride
+from app.models.stylist_schedule import StylistSchedule
+from app.models.user import User
+from app.schemas.schedule import ScheduleOverrideSet, StylistScheduleSet
+from app.services.dashboard_cache import dashboard_cache
+from app.services.schedule_cache import schedule_cache
+
+
+class ScheduleService:
+    """
+    Administración de horarios de trabajo y sus excepciones.
+
+    Cada cambio invalida schedule_cache (y los dashboards, que muestran el
+    próximo hueco de cada estilista) después del commit.
+
+    Crear o reemplazar es un solo upsert sobre la clave única (owner_id, día),
+    donde owner_id es el estilista o 0 para el salón: dos PUT simultáneos del
+    mismo día terminan en una fila, también para el horario general y feriados.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def _check_stylist(self, stylist_id: Optional[int]):
+        if stylist_id is None:
+            return
+        stylist = await self.db.get(User, stylist_id)
+        if not stylist or stylist.role != "stylist":
+            raise ValueError("Estilista no encontrado")
+
+    async def _commit(self):
+        await self.db.commit()
+        schedule_cache.invalidate()
+        dashboard_cache.clear()
+
+    @staticmethod
+    def _owner_id(stylist_id: Optional[int]) -> int:
+        return stylist_id if stylist_id is not None else 0
+
+    async def list_schedules(self, stylist_id: Optional[int] = None) -> list[StylistSchedule]:
+        """Horarios semanales (de un estilista o todos), por estilista y día"""
+        query = select(StylistSchedule).order_by(StylistSchedule.stylist_id, StylistSchedule.weekday)
+        if stylist_id is not None:
+            query = query.where(StylistSchedule.stylist_id == stylist_id)
+        result = await self.db.execute(query)
+        return result.scalars().all()
+
+    async def set_schedule(self, data: StylistScheduleSet) -> StylistSchedule:
+        """Crear o reemplazar el horario de un día de la semana"""
+        await self._check_stylist(data.stylist_id)
+        hours = {
+            "start_time": data.start_time,
+            "end_time": data.end_time,
+            "break_start": data.break_start,
+            "break_end": data.break_end
+        }
+        await self.db.execute(
+            mysql_insert(StylistSchedule)
+            .values(stylist_id=data.stylist_id, weekday=data.weekday, **hours)
+            .on_duplicate_key_update(**hours)
+        )
+        await self._commit()
+
+        result = await self.db.execute(
+            select(StylistSchedule).where(
+                StylistSchedule.owner_id == self._owner_id(data.stylist_id),
+                StylistSchedule.weekday == data.weekday
+            )
+        )
+        return result.scalar_one()
+
+    async def delete_schedule(self, schedule_id: int) -> bool:
+        schedule = await self.db.get(StylistSchedule, schedule_id)
+        if not schedule:
+            return False
+        await self.db.delete(schedule)
+        await self._commit()
+        return True
+
+    async def list_overrides(
+        self,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+        stylist_id: Optional[int] = None
+    ) -> list[ScheduleOverride]:
+        """Excepciones entre date_from y date_to (incluidos), por fecha"""
+        query = select(ScheduleOverride).order_by(ScheduleOverride.day, ScheduleOverride.stylist_id)
+        if date_from is not None:
+            query = query.where(ScheduleOverride.day >= date_from)
+        if date_to is not None:
+            query = query.where(ScheduleOverride.day <= date_to)
+        if stylist_id is not None:
+            query = query.where(ScheduleOverride.stylist_id == stylist_id)
+        result = await self.db.execute(query)
+        return result.scalars().all()
+
+    async def set_override(self, data: ScheduleOverrideSet) -> ScheduleOverride:
+        """Crear o reemplazar la excepción de una fecha"""
+        await self._check_stylist(data.stylist_id)
+        values = {"start_time": data.start_time, "end_time": data.end_time, "reason": data.reason}
+        await self.db.execute(
+            mysql_insert(ScheduleOverride)
+            .values(stylist_id=data.stylist_id, day=data.day, **values)
+            .on_duplicate_key_update(**values)
+        )
+        await self._commit()
+
+        result = await self.db.execute(
+            select(ScheduleOverride).where(
+                ScheduleOverride.owner_id == self._owner_id(data.stylist_id),
+                ScheduleOverride.day == data.day
+            )
+        )
+        return result.scalar_one()
+
+    async def delete_override(self, override_id: int) -> bool:
+        override = await self.db.get(ScheduleOverride, override_id)
+        if not override:
+            return False
+        await self.db.delete(override)
+        await self._commit()
+        return True
@@ -1,5 +1,11 @@
+from datetime import datetime, timezone
+
+from app.models.appointment import Appointment
 from app.models.service import Service
 from app.schemas.service import ServiceCreate, ServiceUpdate, ServiceInDB
+from app.services.dashboard_cache import dashboard_cache
+from app.utils.time_slots import ACTIVE_STATUSES, to_naive_utc
+from sqlalchemy import func, text, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
@@ -25,12 +31,37 @@ class ServiceService:
         return service
 
     async def update_service(self, service_id: int, service_update: ServiceUpdate):
+        """
+        Actualizar un servicio. Si cambia la duración, las citas activas
+        futuras de ese servicio recalculan su end_time en la misma transacción
+        (los traslapes y la disponibilidad se resuelven con end_time); las
+        pasadas conservan la duración con la que se atendieron. Como antes de
+        guardar end_time, alargar un servicio no revalida los traslapes entre
+        citas ya agendadas.
+        """
         service = await self.get_service(service_id)
         if not service:
             return None
+        previous_duration = service.duration_min
         for field, value in service_update.model_dump(exclude_unset=True).items():
             setattr(service, field, value)
+
+        duration_changed = service.duration_min != previous_duration
+        if duration_changed:
+            await self.db.execute(
+                update(Appointment)
+                .where(
+                    Appointment.service_id == service_id,
+                    Appointment.status.in_(ACTIVE_STATUSES),
+                    Appointment.date >= to_naive_utc(datetime.now(timezone.utc))
+                )
+                .values(end_time=func.timestampadd(text("MINUTE"), service.duration_min, Appointment.date))
+                .execution_options(synchronize_session=False)
+            )
         await self.db.commit()
+        if duration_changed:
+            # Los dashboards muestran el próximo hueco libre de cada estilista
+            dashboard_cache.clear()
         await self.db.refresh(service)
         return service
 
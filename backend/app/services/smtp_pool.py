@@ -0,0 +1,224 @@
+# app/services/smtp_pool.py
+import contextlib
+import smtplib
+import threading
+import time
+from email.message import Message
+from typing import Iterator
+
+from app.core.config import settings
+
+# Errores tras los cuales la conexión ya no sirve y se debe reconectar
+_CONNECTION_ERRORS = (smtplib.SMTPServerDisconnected, ConnectionError, TimeoutError)
+
+
+class PooledConnection:
+    """Conexión SMTP autenticada junto con sus contadores (smtp es None una vez cerrada)"""
+
+    __slots__ = ("smtp", "messages_sent", "last_used")
+
+    def __init__(self, smtp: smtplib.SMTP | None):
+        self.smtp = smtp
+        self.messages_sent = 0
+        self.last_used = time.monotonic()
+
+
+class SMTPConnectionPool:
+    """
+    Pool de conexiones SMTP reutilizables.
+
+    Mantiene hasta `max_size` conexiones autenticadas (STARTTLS + LOGIN una
+    sola vez por conexión) y las reutiliza entre mensajes. Las conexiones
+    inactivas por más de `idle_timeout` segundos o que alcanzaron
+    `max_messages_per_connection` se cierran; si el servidor corta una
+    conexión en uso se reconecta y se reintenta el mensaje una vez.
+
+    Es thread-safe: EmailService lo usa desde su pool de hilos.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        username: str = "",
+        password: str = "",
+        starttls: bool = True,
+        max_size: int = 2,
+        idle_timeout: float = 60,
+        max_messages_per_connection: int = 100,
+        timeout: float = 30,
+        smtp_class: type[smtplib.SMTP] | None = None
+    ):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.starttls = starttls
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.max_messages_per_connection = max_messages_per_connection
+        self.timeout = timeout
+        self.smtp_class = smtp_class
+
+        self._idle: list[PooledConnection] = []
+        self._in_use = 0
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max_size)
+
+        # Métricas
+        self._connections_opened = 0
+        self._connections_closed = 0
+        self._messages_sent = 0
+        self._reconnects = 0
+        self._handshake_seconds = 0.0
+
+    def _connect(self) -> PooledConnection:
+        """Abrir y autenticar una conexión nueva"""
+        smtp_class = self.smtp_class or smtplib.SMTP
+        started = time.perf_counter()
+        smtp = smtp_class(self.host, self.port, timeout=self.timeout)
+        try:
+            if self.starttls:
+                smtp.starttls()
+            if self.password:
+                smtp.login(self.username, self.password)
+        except Exception:
+            self._discard(smtp)
+            raise
+        elapsed = time.perf_counter() - started
+        with self._lock:
+            self._connections_opened += 1
+            self._handshake_seconds += elapsed
+        return PooledConnection(smtp)
+
+    @staticmethod
+    def _discard(smtp: smtplib.SMTP):
+        try:
+            smtp.quit()
+        except Exception:
+            try:
+                smtp.close()
+            except Exception:
+                pass
+
+    def _close(self, conn: PooledConnection):
+        """Cerrar la conexión una sola vez y dejarla marcada como inutilizable"""
+        smtp, conn.smtp = conn.smtp, None
+        if smtp is None:
+            return
+        self._discard(smtp)
+        with self._lock:
+            self._connections_closed += 1
+
+    def _is_reusable(self, conn: PooledConnection) -> bool:
+        return (
+            time.monotonic() - conn.last_used < self.idle_timeout
+            and conn.messages_sent < self.max_messages_per_connection
+        )
+
+    def _acquire(self) -> PooledConnection:
+        self._slots.acquire()
+        try:
+            while True:
+                with self._lock:
+                    conn = self._idle.pop() if self._idle else None
+                    if conn is None or self._is_reusable(conn):
+                        self._in_use += 1
+                        break
+                self._close(conn)
+            return conn if conn is not None else self._connect_in_slot()
+        except Exception:
+            self._slots.release()
+            raise
+
+    def _connect_in_slot(self) -> PooledConnection:
+        try:
+            return self._connect()
+        except Exception:
+            with self._lock:
+                self._in_use -= 1
+            raise
+
+    def _release(self, conn: PooledConnection | None):
+        with self._lock:
+            self._in_use -= 1
+            if conn is not None:
+                conn.last_used = time.monotonic()
+                self._idle.append(conn)
+        self._slots.release()
+
+    @contextlib.contextmanager
+    def connection(self) -> Iterator[PooledConnection]:
+        """
+        Reservar una conexión para enviar varios mensajes seguidos con
+        send_on(). Al salir vuelve al pool (o se cierra si quedó rota).
+        """
+        conn = self._acquire()
+        try:
+            yield conn
+        except _CONNECTION_ERRORS:
+            self._close(conn)
+            self._release(None)
+            raise
+        except BaseException:
+            # Si send_on la cerró y no pudo reconectar, no vuelve al pool
+            self._release(conn if conn.smtp is not None else None)
+            raise
+        else:
+            self._release(conn)
+
+    def send_on(self, conn: PooledConnection, msg: Message):
+        """Enviar por una conexión reservada, reconectando una vez si el servidor la cerró"""
+        try:
+            conn.smtp.send_message(msg)
+        except _CONNECTION_ERRORS:
+            # Se cierra antes de reconectar: si _connect() falla, la conexión
+            # queda marcada como cerrada y connection() no la devuelve al pool
+            self._close(conn)
+            with self._lock:
+                self._reconnects += 1
+            conn.smtp = self._connect().smtp
+            conn.messages_sent = 0
+            conn.smtp.send_message(msg)
+        conn.messages_sent += 1
+        with self._lock:
+            self._messages_sent += 1
+
+    def send_message(self, msg: Message):
+        """Enviar un mensaje usando una conexión del pool"""
+        with self.connection() as conn:
+            self.send_on(conn, msg)
+
+    def close_all(self):
+        """Cerrar las conexiones inactivas"""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            self._close(conn)
+
+    def metrics(self) -> dict:
+        """Estado del pool y métricas de reutilización"""
+        with self._lock:
+            opened = self._connections_opened
+            return {
+                "max_size": self.max_size,
+                "connections_open": opened - self._connections_closed,
+                "connections_idle": len(self._idle),
+                "connections_in_use": self._in_use,
+                "connections_opened": opened,
+                "reconnects": self._reconnects,
+                "messages_sent": self._messages_sent,
+                "messages_per_connection": round(self._messages_sent / opened, 2) if opened else 0.0,
+                "avg_handshake_ms": round(self._handshake_seconds / opened * 1000, 2) if opened else 0.0
+            }
+
+
+smtp_pool = SMTPConnectionPool(
+    host=settings.SMTP_SERVER,
+    port=settings.SMTP_PORT,
+    username=settings.EMAIL_SENDER,
+    password=settings.EMAIL_PASSWORD,
+    starttls=settings.SMTP_STARTTLS,
+    max_size=settings.SMTP_POOL_SIZE,
+    idle_timeout=settings.SMTP_IDLE_TIMEOUT_SECONDS
+)
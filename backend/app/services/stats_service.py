@@ -0,0 +1,128 @@
+# app/services/stats_service.py
+from collections import Counter
+from datetime import date, datetime, time, timedelta
+from typing import Iterable, Optional
+
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.appointment import Appointment
+from app.models.daily_appointment_stats import DailyAppointmentStats
+from app.utils.time_slots import to_naive_utc
+
+# (día, estilista, servicio, estado, walk-in)
+StatsKey = tuple[date, int, int, str, bool]
+
+
+class StatsService:
+    """Mantenimiento del rollup daily_appointment_stats"""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    @staticmethod
+    def key_for(appointment: Appointment) -> StatsKey:
+        """Clave del rollup a la que cuenta una cita"""
+        return (
+            to_naive_utc(appointment.date).date(),
+            appointment.stylist_id,
+            appointment.service_id,
+            appointment.status,
+            bool(appointment.is_walk_in)
+        )
+
+    async def record_change(self, before: Optional[StatsKey], after: Optional[StatsKey]):
+        """
+        Registrar el cambio de una cita en el rollup (sin hacer commit).
+        before=None para citas nuevas; si la clave no cambió no hace nada.
+        """
+        if before == after:
+            return
+        deltas: Counter = Counter()
+        if before is not None:
+            deltas[before] -= 1
+        if after is not None:
+            deltas[after] += 1
+        await self.apply_deltas(deltas)
+
+    async def apply_deltas(self, deltas: dict[StatsKey, int]):
+        """Sumar deltas al rollup con un único upsert multi-fila (sin hacer commit)"""
+        rows = [
+            {
+                "day": day,
+                "stylist_id": stylist_id,
+                "service_id": service_id,
+                "status": status,
+                "is_walk_in": is_walk_in,
+                "total": delta
+            }
+            # Orden estable de claves para que escrituras concurrentes no se bloqueen en cruz
+            for (day, stylist_id, service_id, status, is_walk_in), delta in sorted(deltas.items())
+            if delta
+        ]
+        if not rows:
+            return
+        stmt = mysql_insert(DailyAppointmentStats).values(rows)
+        await self.db.execute(
+            stmt.on_duplicate_key_update(total=DailyAppointmentStats.total + stmt.inserted.total)
+        )
+
+    async def rebuild(self, start_day: date, end_day: date) -> int:
+        """
+        Recalcular el rollup para [start_day, end_day] desde appointments
+        (sin hacer commit). Retorna la cantidad de filas del rollup generadas.
+        """
+        range_start = datetime.combine(start_day, time.min)
+        range_end = datetime.combine(end_day + timedelta(days=1), time.min)
+
+        await self.db.execute(
+            delete(DailyAppointmentStats).where(
+                DailyAppointmentStats.day >= start_day,
+                DailyAppointmentStats.day <= end_day
+            )
+        )
+
+        day = func.date(Appointment.date)
+        aggregated = (
+            select(
+                day,
+                Appointment.stylist_id,
+                Appointment.service_id,
+                Appointment.status,
+                Appointment.is_walk_in,
+                func.count(Appointment.id)
+            )
+            .where(Appointment.date >= range_start, Appointment.date < range_end)
+            .group_by(
+                day,
+                Appointment.stylist_id,
+                Appointment.service_id,
+                Appointment.status,
+                Appointment.is_walk_in
+            )
+        )
+        result = await self.db.execute(
+            insert(DailyAppointmentStats).from_select(
+                ["day", "stylist_id", "service_id", "status", "is_walk_in", "total"],
+                aggregated
+            )
+        )
+        return result.rowcount
+
+    async def get_date_bounds(self) -> tuple[Optional[date], Optional[date]]:
+        """Primer y último día con citas"""
+        result = await self.db.execute(
+            select(func.min(Appointment.date), func.max(Appointment.date))
+        )
+        first, last = result.one()
+        return (first.date() if first else None, last.date() if last else None)
+
+    @staticmethod
+    def month_ranges(start_day: date, end_day: date) -> Iterable[tuple[date, date]]:
+        """Partir [start_day, end_day] en tramos mensuales"""
+        current = start_day
+        while current <= end_day:
+            next_month = (current.replace(day=1) + timedelta(days=32)).replace(day=1)
+            yield current, min(next_month - timedelta(days=1), end_day)
+            current = next_month
@@ -1,90 +1,67 @@
 # app/utils/email_templates.py
 from datetime import datetime
+from functools import lru_cache
+from html import escape
+from string import Formatter
 
-
-def generate_appointment_email_html(
-    user_name: str,
-    notification_type: str,
-    appointment_data: dict
-) -> str:
-    """
-    Genera el HTML del correo con estilos similares al frontend.
-
-    Args:
-        user_name: Nombre del usuario destinatario
-        notification_type: Tipo de notificación (confirmacion, cancelacion, recordatorio)
-        appointment_data: Diccionario con los datos de la cita:
-            - service_name: Nombre del servicio
-            - stylist_name: Nombre del estilista
-            - date: Fecha de la cita (datetime o string)
-
-    Returns:
-        String con el HTML formateado del email
-    """
-
-    # Determinar el color y título según el tipo de notificación
-    type_config = {
-        "reservado": {
-            "color": "#f59e0b",  # Amber-500
-            "bg_color": "#fef3c7",  # Amber-100
-            "icon": "📝",
-            "title": "Cita Reservada",
-            "message": "Tu cita ha sido reservada exitosamente. Pronto un miembro de nuestro equipo la confirmará."
-        },
-        "confirmado": {
-            "color": "#ec4899",  # Pink-500
-            "bg_color": "#fce7f3",  # Pink-100
-            "icon": "✓",
-            "title": "Cita Confirmada",
-            "message": "¡Excelente noticia! Tu cita ha sido confirmada y te esperamos con los brazos abiertos para brindarte nuestros mejores servicios."
-        },
-        "cancelado": {
-            "color": "#ef4444",  # Red-500
-            "bg_color": "#fee2e2",  # Red-100
-            "icon": "✗",
-            "title": "Cita Cancelada",
-            "message": "Lamentamos informarte que en esta ocasión no podremos brindarte nuestros servicios para la fecha seleccionada. Esperamos poder atenderte pronto en otra oportunidad."
-        },
-        "recordatorio": {
-            "color": "#3b82f6",  # Blue-500
-            "bg_color": "#dbeafe",  # Blue-100
-            "icon": "🔔",
-            "title": "Recordatorio de Cita",
-            "message": "Te recordamos tu próxima cita. ¡Nos vemos pronto!"
-        }
+# Color, icono y textos por tipo de notificación
+TYPE_CONFIG = {
+    "reservado": {
+        "color": "#f59e0b",  # Amber-500
+        "bg_color": "#fef3c7",  # Amber-100
+        "icon": "📝",
+        "title": "Cita Reservada",
+        "message": "Tu cita ha sido reservada exitosamente. Pronto un miembro de nuestro equipo la confirmará."
+    },
+    "confirmado": {
+        "color": "#ec4899",  # Pink-500
+        "bg_color": "#fce7f3",  # Pink-100
+        "icon": "✓",
+        "title": "Cita Confirmada",
+        "message": "¡Excelente noticia! Tu cita ha sido confirmada y te esperamos con los brazos abiertos para brindarte nuestros mejores servicios."
+    },
+    "cancelado": {
+        "color": "#ef4444",  # Red-500
+        "bg_color": "#fee2e2",  # Red-100
+        "icon": "✗",
+        "title": "Cita Cancelada",
+        "message": "Lamentamos informarte que en esta ocasión no podremos brindarte nuestros servicios para la fecha seleccionada. Esperamos poder atenderte pronto en otra oportunidad."
+    },
+    "recordatorio": {
+        "color": "#3b82f6",  # Blue-500
+        "bg_color": "#dbeafe",  # Blue-100
+        "icon": "🔔",
+        "title": "Recordatorio de Cita",
+        "message": "Te recordamos tu próxima cita. ¡Nos vemos pronto!"
     }
+}
 
-    config = type_config.get(notification_type, type_config["reservado"])
+# Mensajes adicionales personalizados según el tipo
+ADDITIONAL_MESSAGES = {
+    "reservado": "Un miembro de nuestro equipo revisará tu solicitud y pronto recibirás la confirmación.",
+    "confirmado": "Estamos emocionados de verte. Por favor, llega 10 minutos antes de tu cita.",
+    "cancelado": "Si deseas reprogramar tu cita, por favor contáctanos. Estaremos encantados de atenderte en otra fecha.",
+    "recordatorio": "Si tienes alguna pregunta o necesitas hacer cambios, no dudes en contactarnos."
+}
+DEFAULT_ADDITIONAL_MESSAGE = "Si tienes alguna pregunta o necesitas hacer cambios, no dudes en contactarnos."
 
-    # Mensajes adicionales personalizados según el tipo
-    additional_message = {
-        "reservado": "Un miembro de nuestro equipo revisará tu solicitud y pronto recibirás la confirmación.",
-        "confirmado": "Estamos emocionados de verte. Por favor, llega 10 minutos antes de tu cita.",
-        "cancelado": "Si deseas reprogramar tu cita, por favor contáctanos. Estaremos encantados de atenderte en otra fecha.",
-        "recordatorio": "Si tienes alguna pregunta o necesitas hacer cambios, no dudes en contactarnos."
-    }
+# Nombres de mes fijos: strftime("%B") depende del locale del proceso
+SPANISH_MONTHS = (
+    "enero", "febrero", "marzo", "abril", "mayo", "junio",
+    "julio", "agosto", "septiembre", "octubre", "noviembre", "diciembre"
+)
 
-    # Formatear la fecha
-    try:
-        if isinstance(appointment_data["date"], str):
-            date_obj = datetime.fromisoformat(
-                appointment_data["date"].replace('Z', '+00:00'))
-        else:
-            date_obj = appointment_data["date"]
-
-        formatted_date = date_obj.strftime("%d de %B de %Y")
-        formatted_time = date_obj.strftime("%I:%M %p")
-    except:
-        formatted_date = str(appointment_data.get("date", ""))
-        formatted_time = ""
-
-    html = f"""
+# Plantilla base. Los campos del tipo ({color}, {title}...) se llenan una vez
+# por tipo; {service_name}, {stylist_name}, {date} y {time} en cada render.
+# {user_name} marca el punto donde se corta el esqueleto (el título y el
+# header van antes del nombre, así que solo usan campos del tipo).
+_HTML_TEMPLATE = """
     <!DOCTYPE html>
     <html lang="es">
     <head>
         <meta charset="UTF-8">
         <meta name="viewport" content="width=device-width, initial-scale=1.0">
-        <title>{config['title']}</title>
+        <title>{title}</title>
     </head>
     <body style="margin: 0; padding: 0; font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, 'Helvetica Neue', Arial, sans-serif; background-color: #f9fafb;">
         <table width="100%" cellpadding="0" cellspacing="0" style="background-color: #f9fafb; padding: 40px 20px;">
@@ -93,16 +70,16 @@ def generate_appointment_email_html(
                     <table width="600" cellpadding="0" cellspacing="0" style="background-color: #ffffff; border-radius: 12px; box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1); overflow: hidden;">
                         <!-- Header -->
                         <tr>
-                            <td style="background: linear-gradient(135deg, {config['color']} 0%, #db2777 100%); padding: 40px 30px; text-align: center;">
+                            <td style="background: linear-gradient(135deg, {color} 0%, #db2777 100%); padding: 40px 30px; text-align: center;">
                                 <h1 style="margin: 0; color: #ffffff; font-size: 32px; font-weight: bold;">
                                     Monarca Beauty Salon
                                 </h1>
                                 <div style="margin-top: 20px; background-color: rgba(255, 255, 255, 0.2); border-radius: 50%; width: 80px; height: 80px; display: inline-flex; align-items: center; justify-content: center; font-size: 40px;">
-                                    {config['icon']}
+                                    {icon}
                                 </div>
                             </td>
                         </tr>
-                        
+
                         <!-- Content -->
                         <tr>
                             <td style="padding: 40px 30px;">
@@ -110,17 +87,17 @@ def generate_appointment_email_html(
                                     ¡Hola {user_name}!
                                 </h2>
                                 <p style="margin: 0 0 30px 0; color: #6b7280; font-size: 16px; line-height: 1.5;">
-                                    {config['message']}
+                                    {message}
                                 </p>
-                                
+
                                 <!-- Appointment Details Card -->
-                                <table width="100%" cellpadding="0" cellspacing="0" style="background-color: {config['bg_color']}; border-radius: 8px; border-left: 4px solid {config['color']}; margin-bottom: 30px;">
+                                <table width="100%" cellpadding="0" cellspacing="0" style="background-color: {bg_color}; border-radius: 8px; border-left: 4px solid {color}; margin-bottom: 30px;">
                                     <tr>
                                         <td style="padding: 24px;">
-                                            <h3 style="margin: 0 0 20px 0; color: {config['color']}; font-size: 18px; font-weight: bold;">
+                                            <h3 style="margin: 0 0 20px 0; color: {color}; font-size: 18px; font-weight: bold;">
                                                 Detalles de tu Cita
                                             </h3>
-                                            
+
                                             <!-- Service -->
                                             <table width="100%" cellpadding="0" cellspacing="0" style="margin-bottom: 16px;">
                                                 <tr>
@@ -129,12 +106,12 @@ def generate_appointment_email_html(
                                                             ✂️ Servicio
                                                         </div>
                                                         <div style="color: #1f2937; font-size: 16px; font-weight: 600;">
-                                                            {appointment_data.get('service_name', 'N/A')}
+                                                            {service_name}
                                                         </div>
                                                     </td>
                                                 </tr>
                                             </table>
-                                            
+
                                             <!-- Stylist -->
                                             <table width="100%" cellpadding="0" cellspacing="0" style="margin-bottom: 16px;">
                                                 <tr>
@@ -143,12 +120,12 @@ def generate_appointment_email_html(
                                                             👤 Estilista
                                                         </div>
                                                         <div style="color: #1f2937; font-size: 16px; font-weight: 600;">
-                                                            {appointment_data.get('stylist_name', 'N/A')}
+                                                            {stylist_name}
                                                         </div>
                                                     </td>
                                                 </tr>
                                             </table>
-                                            
+
                                             <!-- Date -->
                                             <table width="100%" cellpadding="0" cellspacing="0" style="margin-bottom: 16px;">
                                                 <tr>
@@ -157,12 +134,12 @@ def generate_appointment_email_html(
                                                             📅 Fecha
                                                         </div>
                                                         <div style="color: #1f2937; font-size: 16px; font-weight: 600;">
-                                                            {formatted_date}
+                                                            {date}
                                                         </div>
                                                     </td>
                                                 </tr>
                                             </table>
-                                            
+
                                             <!-- Time -->
                                             <table width="100%" cellpadding="0" cellspacing="0">
                                                 <tr>
@@ -171,7 +148,7 @@ def generate_appointment_email_html(
                                                             🕐 Hora
                                                         </div>
                                                         <div style="color: #1f2937; font-size: 16px; font-weight: 600;">
-                                                            {formatted_time}
+                                                            {time}
                                                         </div>
                                                     </td>
                                                 </tr>
@@ -179,14 +156,14 @@ def generate_appointment_email_html(
                                         </td>
                                     </tr>
                                 </table>
-                                
+
                                 <!-- Additional Info -->
                                 <p style="margin: 0; color: #6b7280; font-size: 14px; line-height: 1.6;">
-                                    {additional_message.get(notification_type, "Si tienes alguna pregunta o necesitas hacer cambios, no dudes en contactarnos.")}
+                                    {additional_message}
                                 </p>
                             </td>
                         </tr>
-                        
+
                         <!-- Footer -->
                         <tr>
                             <td style="background-color: #f9fafb; padding: 30px; text-align: center; border-top: 1px solid #e5e7eb;">
@@ -206,4 +183,135 @@ def generate_appointment_email_html(
     </html>
     """
 
-    return html
+_TEXT_TEMPLATE = """¡Hola {user_name}!
+
+{message}
+
+Detalles de tu Cita
+- Servicio: {service_name}
+- Estilista: {stylist_name}
+- Fecha: {date}
+- Hora: {time}
+
+{additional_message}
+
+Monarca Beauty Salon
+Tu belleza, nuestra pasión ✨
+"""
+
+
+def _compile(template: str, notification_type: str | None, escape_values: bool) -> tuple[str, tuple, tuple]:
+    """
+    Llena los campos fijos del tipo y corta la plantilla en el nombre.
+
+    Retorna el texto previo al nombre y el resto partido en literales y
+    campos por cita (len(literales) == len(campos) + 1), para renderizar con
+    un join sin volver a parsear la plantilla. notification_type=None es el
+    esqueleto de tipos desconocidos.
+    """
+    static = {
+        **TYPE_CONFIG[notification_type or "reservado"],
+        "additional_message": ADDITIONAL_MESSAGES.get(notification_type, DEFAULT_ADDITIONAL_MESSAGE)
+    }
+    if escape_values:
+        static = {key: escape(value) for key, value in static.items()}
+
+    head, tail = template.split("{user_name}")
+    literals, fields = [""], []
+    for literal, field, _, _ in Formatter().parse(tail):
+        literals[-1] += literal
+        if field in static:
+            # Campo fijo del tipo: se funde con el literal
+            literals[-1] += static[field]
+        elif field:
+            fields.append(field)
+            literals.append("")
+    return head.format(**static), tuple(literals), tuple(fields)
+
+
+# Esqueletos precompilados al importar: (html, texto) por tipo
+_SKELETONS = {
+    notification_type: (
+        _compile(_HTML_TEMPLATE, notification_type, escape_values=True),
+        _compile(_TEXT_TEMPLATE, notification_type, escape_values=False)
+    )
+    for notification_type in (*TYPE_CONFIG, None)
+}
+
+
+def format_appointment_date(value) -> tuple[str, str]:
+    """Fecha ("05 de marzo de 2026") y hora ("03:30 PM") sin depender del locale"""
+    try:
+        if isinstance(value, str):
+            value = datetime.fromisoformat(value.replace('Z', '+00:00'))
+        hour = value.hour % 12 or 12
+        meridiem = "AM" if value.hour < 12 else "PM"
+        return (
+            f"{value.day:02d} de {SPANISH_MONTHS[value.month - 1]} de {value.year}",
+            f"{hour:02d}:{value.minute:02d} {meridiem}"
+        )
+    except (AttributeError, TypeError, ValueError):
+        return str(value if value is not None else ""), ""
+
+
+@lru_cache(maxsize=1024)
+def _render_tail(notification_type: str | None, html: bool, service_name: str, stylist_name: str, date_value) -> str:
+    """
+    Parte del correo posterior al nombre. Se cachea por (tipo, servicio,
+    estilista, fecha): en envíos masivos solo cambia el destinatario.
+    """
+    _, literals, fields = _SKELETONS[notification_type][0 if html else 1]
+    date_text, time_text = format_appointment_date(date_value)
+    if html:
+        service_name, stylist_name = escape(service_name), escape(stylist_name)
+    values = {"service_name": service_name, "stylist_name": stylist_name, "date": date_text, "time": time_text}
+    parts = [literals[0]]
+    for field, literal in zip(fields, literals[1:]):
+        parts.append(values[field])
+        parts.append(literal)
+    return "".join(parts)
+
+
+def _render(user_name: str, notification_type: str, appointment_data: dict, html: bool) -> str:
+    if notification_type not in _SKELETONS:
+        notification_type = None
+    head = _SKELETONS[notification_type][0 if html else 1][0]
+    tail = _render_tail(
+        notification_type,
+        html,
+        str(appointment_data.get("service_name", "N/A")),
+        str(appointment_data.get("stylist_name", "N/A")),
+        appointment_data.get("date")
+    )
+    return head + (escape(user_name) if html else user_name) + tail
+
+
+def generate_appointment_email_html(
+    user_name: str,
+    notification_type: str,
+    appointment_data: dict
+) -> str:
+    """
+    Genera el HTML del correo con estilos similares al frontend.
+
+    Args:
+        user_name: Nombre del usuario destinatario
+        notification_type: Tipo de notificación (reservado, confirmado, cancelado, recordatorio)
+        appointment_data: Diccionario con los datos de la cita:
+            - service_name: Nombre del servicio
+            - stylist_name: Nombre del estilista
+            - date: Fecha de la cita (datetime o string)
+
+    Returns:
+        String con el HTML formateado del email
+    """
+    return _render(user_name, notification_type, appointment_data, html=True)
+
+
+def generate_appointment_email_text(
+    user_name: str,
+    notification_type: str,
+    appointment_data: dict
+) -> str:
+    """Versión en texto plano del mismo correo (alternativa al HTML)."""
+    return _render(user_name, notification_type, appointment_data, html=False)
@@ -0,0 +1,19 @@
+# app/utils/pagination.py
+import base64
+from datetime import datetime
+
+
+def encode_cursor(date: datetime, id: int) -> str:
+    """Cursor opaco para paginar por (date, id)"""
+    raw = f"{date.isoformat()}|{id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    """Inverso de encode_cursor. Lanza ValueError si el cursor no es válido."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        date, id = base64.urlsafe_b64decode(padded.encode()).decode().split("|")
+        return datetime.fromisoformat(date), int(id)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise ValueError("Cursor inválido") from e
@@ -0,0 +1,66 @@
+# app/utils/recurrence.py
+from datetime import datetime, timedelta
+from typing import Iterator, Optional
+
+FREQUENCIES = ("daily", "weekly")
+
+# Tope de ocurrencias de una serie (dos años semanales)
+MAX_OCCURRENCES = 104
+
+
+def _candidates(start: datetime, frequency: str, interval: int, weekdays: list[int]) -> Iterator[datetime]:
+    if frequency == "daily":
+        step = timedelta(days=interval)
+        current = start
+        while True:
+            yield current
+            current += step
+    # weekly: cada `interval` semanas, en los días indicados de esa semana
+    week_start = start - timedelta(days=start.weekday())
+    while True:
+        for weekday in weekdays:
+            candidate = week_start + timedelta(days=weekday)
+            if candidate >= start:
+                yield candidate
+        week_start += timedelta(weeks=interval)
+
+
+def expand_occurrences(
+    start: datetime,
+    frequency: str,
+    interval: int = 1,
+    weekdays: Optional[list[int]] = None,
+    count: Optional[int] = None,
+    until: Optional[datetime] = None,
+    limit: int = MAX_OCCURRENCES
+) -> list[datetime]:
+    """
+    Fechas de una regla de recurrencia (subconjunto de RRULE: FREQ, INTERVAL,
+    BYDAY, COUNT, UNTIL). Todas conservan la hora de `start`; `until` es inclusivo.
+    Lanza ValueError si la regla es inválida, no genera ninguna fecha o
+    supera `limit` ocurrencias.
+    """
+    if frequency not in FREQUENCIES:
+        raise ValueError(f"Frecuencia inválida: {frequency}")
+    if interval < 1:
+        raise ValueError("El intervalo debe ser al menos 1")
+    if count is None and until is None:
+        raise ValueError("Indique la cantidad de citas (count) o la fecha final (until)")
+    if count is not None and not 1 <= count <= limit:
+        raise ValueError(f"La serie debe tener entre 1 y {limit} citas")
+    weekdays = sorted(set(weekdays)) if weekdays else [start.weekday()]
+    if any(not 0 <= weekday <= 6 for weekday in weekdays):
+        raise ValueError("Los días de la semana van de 0 (lunes) a 6 (domingo)")
+
+    occurrences = []
+    for occurrence in _candidates(start, frequency, interval, weekdays):
+        if until is not None and occurrence > until:
+            break
+        if len(occurrences) == limit:
+            raise ValueError(f"La serie supera el máximo de {limit} citas")
+        occurrences.append(occurrence)
+        if count is not None and len(occurrences) == count:
+            break
+    if not occurrences:
+        raise ValueError("La regla no genera ninguna cita")
+    return occurrences
@@ -0,0 +1,213 @@
+# app/utils/time_slots.py
+import heapq
+from bisect import bisect_left, bisect_right
+from datetime import date, datetime, time, timedelta, timezone
+from functools import partial
+from itertools import islice, repeat
+from typing import Callable, Iterable, Iterator, Optional
+
+# Horario de atención del salón
+BUSINESS_OPENING = time(8, 0)
+BUSINESS_CLOSING = time(20, 0)
+
+# Estados que ocupan la agenda de un estilista
+ACTIVE_STATUSES = ("pending", "confirmed")
+
+
+def to_naive_utc(value: datetime) -> datetime:
+    """Normaliza un datetime a UTC sin tzinfo (así se guarda en MySQL)."""
+    if value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def business_window(day: date) -> tuple[datetime, datetime]:
+    """Inicio y fin del horario de atención para un día."""
+    return datetime.combine(day, BUSINESS_OPENING), datetime.combine(day, BUSINESS_CLOSING)
+
+
+class BusyIntervals:
+    """
+    Intervalos ocupados de un estilista.
+
+    Los intervalos son semiabiertos [inicio, fin), se guardan fusionados y
+    ordenados, por lo que `starts` y `ends` están ambos ordenados y cualquier
+    consulta se resuelve con bisect.
+    """
+
+    __slots__ = ("starts", "ends")
+
+    def __init__(self, intervals: Iterable[tuple[datetime, datetime]] = ()):
+        self.starts: list[datetime] = []
+        self.ends: list[datetime] = []
+        for start, end in sorted(intervals):
+            if end <= start:
+                continue
+            if self.ends and start <= self.ends[-1]:
+                if end > self.ends[-1]:
+                    self.ends[-1] = end
+            else:
+                self.starts.append(start)
+                self.ends.append(end)
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def __iter__(self):
+        return zip(self.starts, self.ends)
+
+    def overlaps(self, start: datetime, end: datetime) -> bool:
+        """Indica si [start, end) se traslapa con algún intervalo ocupado."""
+        idx = bisect_right(self.ends, start)
+        return idx < len(self.starts) and self.starts[idx] < end
+
+    def add(self, start: datetime, end: datetime) -> None:
+        """Agrega un intervalo fusionándolo con los que toque."""
+        if end <= start:
+            return
+        lo = bisect_left(self.ends, start)
+        hi = bisect_right(self.starts, end)
+        if lo < hi:
+            start = min(start, self.starts[lo])
+            end = max(end, self.ends[hi - 1])
+        self.starts[lo:hi] = [start]
+        self.ends[lo:hi] = [end]
+
+    def iter_free_slots(
+        self,
+        window_start: datetime,
+        window_end: datetime,
+        duration: timedelta,
+        step: timedelta
+    ) -> Iterator[datetime]:
+        """
+        Inicios de slot (alineados a `step` desde `window_start`) en los que
+        cabe un servicio de `duration` sin traslaparse con lo ocupado, en orden
+        y bajo demanda (la búsqueda de primer hueco no recorre toda la ventana).
+        """
+        last_start = window_end - duration
+        current = window_start
+        while current <= last_start:
+            idx = bisect_right(self.ends, current)
+            if idx < len(self.starts) and self.starts[idx] < current + duration:
+                # Saltar al primer slot de la grilla luego del intervalo que bloquea
+                blocked = self.ends[idx] - window_start
+                current = window_start + -(-blocked // step) * step
+                continue
+            yield current
+            current += step
+
+    def free_slots(
+        self,
+        window_start: datetime,
+        window_end: datetime,
+        duration: timedelta,
+        step: timedelta
+    ) -> list[datetime]:
+        """Lista completa de iter_free_slots."""
+        return list(self.iter_free_slots(window_start, window_end, duration, step))
+
+
+def build_busy_index(
+    rows: Iterable[tuple[int, datetime, datetime]]
+) -> dict[int, BusyIntervals]:
+    """Agrupa filas (stylist_id, inicio, fin) en un índice por estilista."""
+    grouped: dict[int, list[tuple[datetime, datetime]]] = {}
+    for stylist_id, start, end in rows:
+        grouped.setdefault(stylist_id, []).append((start, end))
+    return {stylist_id: BusyIntervals(intervals) for stylist_id, intervals in grouped.items()}
+
+
+def occupancy_mask(
+    intervals: BusyIntervals,
+    window_start: datetime,
+    step: timedelta,
+    slot_count: int
+) -> int:
+    """
+    Bitset de ocupación: el bit i se enciende si el slot
+    [window_start + i*step, window_start + (i+1)*step) toca algún intervalo ocupado.
+    """
+    window_end = window_start + step * slot_count
+    mask = 0
+    idx = bisect_right(intervals.ends, window_start)
+    while idx < len(intervals.starts) and intervals.starts[idx] < window_end:
+        first = max((intervals.starts[idx] - window_start) // step, 0)
+        last = min(-(-(intervals.ends[idx] - window_start) // step), slot_count)
+        mask |= ((1 << (last - first)) - 1) << first
+        idx += 1
+    return mask
+
+
+def fit_mask(busy_mask: int, slot_count: int, slots_needed: int) -> int:
+    """
+    Bitset de inicios posibles: el bit i se enciende si los slots
+    i .. i + slots_needed - 1 están todos libres dentro de la ventana.
+    """
+    free = ~busy_mask & ((1 << slot_count) - 1)
+    fits = free
+    for shift in range(1, slots_needed):
+        fits &= free >> shift
+    return fits
+
+
+def mask_to_bits(mask: int, slot_count: int) -> str:
+    """Representa un bitset como cadena '0'/'1' con el slot 0 a la izquierda."""
+    return format(mask, f"0{slot_count}b")[::-1] if slot_count else ""
+
+
+def default_windows(day: date) -> list[tuple[datetime, datetime]]:
+    """Ventanas de trabajo de un día sin horarios configurados: el horario del salón."""
+    return [business_window(day)]
+
+
+def stylist_openings(
+    intervals: BusyIntervals,
+    days: Iterable[date],
+    duration: timedelta,
+    step: timedelta,
+    not_before: datetime,
+    day_windows: Callable[[date], Iterable[tuple[datetime, datetime]]] = default_windows
+) -> Iterator[datetime]:
+    """
+    Huecos de un estilista en orden cronológico dentro de sus ventanas de
+    trabajo de cada día (`day_windows`, ordenadas), desde `not_before`
+    (redondeado hacia arriba a la grilla de cada ventana).
+    """
+    for day in days:
+        for window_start, window_end in day_windows(day):
+            if window_end <= not_before:
+                continue
+            if window_start < not_before:
+                window_start += -(-(not_before - window_start) // step) * step
+            yield from intervals.iter_free_slots(window_start, window_end, duration, step)
+
+
+def first_fit(
+    busy_index: dict[int, BusyIntervals],
+    stylist_ids: Iterable[int],
+    days: list[date],
+    duration: timedelta,
+    step: timedelta,
+    not_before: datetime,
+    limit: int,
+    stylist_windows: Optional[Callable[[int, date], Iterable[tuple[datetime, datetime]]]] = None
+) -> list[tuple[datetime, int]]:
+    """
+    Los `limit` huecos más tempranos entre varios estilistas como pares
+    (inicio, stylist_id). Mezcla con heapq los generadores de cada
+    estilista, así solo se calculan los huecos necesarios.
+    `stylist_windows(stylist_id, día)` da las ventanas de trabajo de cada uno.
+    """
+    empty = BusyIntervals()
+    streams = [
+        zip(
+            stylist_openings(
+                busy_index.get(stylist_id, empty), days, duration, step, not_before,
+                partial(stylist_windows, stylist_id) if stylist_windows else default_windows
+            ),
+            repeat(stylist_id)
+        )
+        for stylist_id in stylist_ids
+    ]
+    return list(islice(heapq.merge(*streams), limit))
@@ -0,0 +1,126 @@
+# app/utils/working_hours.py
+from datetime import date, datetime, time, timedelta
+from typing import Iterable, Optional
+
+from app.utils.time_slots import BUSINESS_CLOSING, BUSINESS_OPENING, BusyIntervals
+
+# Tramo de trabajo [inicio, fin) dentro de un día
+Segment = tuple[time, time]
+
+# Sin ningún horario configurado se atiende en el horario del salón todos los días
+DEFAULT_SEGMENTS: tuple[Segment, ...] = ((BUSINESS_OPENING, BUSINESS_CLOSING),)
+
+
+def day_segments(
+    start: time,
+    end: time,
+    break_start: Optional[time] = None,
+    break_end: Optional[time] = None
+) -> tuple[Segment, ...]:
+    """Tramos de trabajo de un día, partidos por el descanso si lo hay."""
+    if break_start is None or break_end is None:
+        return ((start, end),)
+    return tuple(
+        (seg_start, seg_end)
+        for seg_start, seg_end in ((start, break_start), (break_end, end))
+        if seg_start < seg_end
+    )
+
+
+class WorkingSchedules:
+    """
+    Horarios de trabajo en memoria (copia de stylist_schedules y schedule_overrides).
+
+    Para (estilista, día) gana, en orden: la excepción del estilista, la
+    excepción del salón (feriados), el horario semanal del estilista, el del
+    salón y, si no hay nada configurado, BUSINESS_OPENING–BUSINESS_CLOSING.
+    Quien tiene horario semanal no trabaja los días de la semana que no
+    tiene configurados. Las horas son UTC, igual que las citas.
+    """
+
+    __slots__ = ("weekly", "overrides")
+
+    def __init__(
+        self,
+        weekly: Optional[dict[Optional[int], dict[int, tuple[Segment, ...]]]] = None,
+        overrides: Optional[dict[tuple[Optional[int], date], tuple[Segment, ...]]] = None
+    ):
+        self.weekly = weekly or {}
+        self.overrides = overrides or {}
+
+    @classmethod
+    def from_rows(cls, schedules: Iterable, overrides: Iterable) -> "WorkingSchedules":
+        """Construir desde filas con los campos de StylistSchedule y ScheduleOverride."""
+        weekly: dict[Optional[int], dict[int, tuple[Segment, ...]]] = {}
+        for row in schedules:
+            weekly.setdefault(row.stylist_id, {})[row.weekday] = day_segments(
+                row.start_time, row.end_time, row.break_start, row.break_end
+            )
+        days: dict[tuple[Optional[int], date], tuple[Segment, ...]] = {}
+        for row in overrides:
+            closed = row.start_time is None or row.end_time is None
+            days[(row.stylist_id, row.day)] = () if closed else ((row.start_time, row.end_time),)
+        return cls(weekly, days)
+
+    def segments(self, stylist_id: Optional[int], day: date) -> tuple[Segment, ...]:
+        """Tramos de trabajo del estilista (None = salón) ese día; vacío si no trabaja."""
+        for key in ((stylist_id, day), (None, day)):
+            if key in self.overrides:
+                return self.overrides[key]
+        for owner in (stylist_id, None):
+            week = self.weekly.get(owner)
+            if week is not None:
+                return week.get(day.weekday(), ())
+        return DEFAULT_SEGMENTS
+
+    def windows(self, stylist_id: Optional[int], day: date) -> list[tuple[datetime, datetime]]:
+        """Tramos de trabajo del día como ventanas [inicio, fin)."""
+        return [
+            (datetime.combine(day, start), datetime.combine(day, end))
+            for start, end in self.segments(stylist_id, day)
+        ]
+
+    def is_working(self, stylist_id: Optional[int], at: datetime) -> bool:
+        """Indica si `at` cae dentro de un tramo de trabajo."""
+        return any(
+            window_start <= at < window_end
+            for window_start, window_end in self.windows(stylist_id, at.date())
+        )
+
+    def fits(self, stylist_id: Optional[int], start: datetime, end: datetime) -> bool:
+        """Indica si [start, end) cae completo dentro de un tramo de trabajo."""
+        return any(
+            window_start <= start and end <= window_end
+            for window_start, window_end in self.windows(stylist_id, start.date())
+        )
+
+    def off_hours(self, stylist_id: Optional[int], day: date) -> BusyIntervals:
+        """Horas del día fuera de los tramos de trabajo, como intervalos ocupados."""
+        edges = [datetime.combine(day, time.min)]
+        for window_start, window_end in self.windows(stylist_id, day):
+            edges += [window_start, window_end]
+        edges.append(datetime.combine(day + timedelta(days=1), time.min))
+        return BusyIntervals(zip(edges[::2], edges[1::2]))
+
+    def bounds(self, stylist_ids: Iterable[Optional[int]], days: Iterable[date]) -> tuple[time, time]:
+        """
+        Apertura más temprana y cierre más tardío entre los estilistas y días
+        dados (grilla común de la matriz de disponibilidad).
+        """
+        stylist_ids = list(stylist_ids)
+        segments = [
+            segment
+            for day in days
+            for stylist_id in stylist_ids
+            for segment in self.segments(stylist_id, day)
+        ]
+        if not segments:
+            return DEFAULT_SEGMENTS[0]
+        return min(start for start, _ in segments), max(end for _, end in segments)
+
+    def describe(self, stylist_id: Optional[int], day: date) -> str:
+        """Horario del día para mensajes de error, p. ej. "08:00-13:00, 14:00-20:00"."""
+        segments = self.segments(stylist_id, day)
+        if not segments:
+            return "no atiende ese día"
+        return ", ".join(f"{start:%H:%M}-{end:%H:%M}" for start, end in segments)
@@ -0,0 +1,3 @@
+"""
+Benchmarks manuales (no se ejecutan con pytest)
+"""
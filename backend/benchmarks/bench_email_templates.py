@@ -0,0 +1,70 @@
+"""
+Micro-benchmark de renders por segundo de las plantillas de correo.
+
+Compara la implementación anterior (f-string armado en cada llamada,
+tomada del commit indicado con --baseline) contra las plantillas
+precompiladas, con cache frío (cada cita distinta) y caliente (misma
+cita, distinto destinatario):
+    python -m benchmarks.bench_email_templates --renders 50000
+"""
+import argparse
+import subprocess
+import time
+import types
+from datetime import datetime, timedelta
+
+from app.utils import email_templates
+
+
+def load_baseline(revision: str):
+    """Cargar generate_appointment_email_html desde otra revisión de git"""
+    try:
+        source = subprocess.run(
+            ["git", "show", f"{revision}:./app/utils/email_templates.py"],
+            capture_output=True, text=True, check=True
+        ).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    module = types.ModuleType("email_templates_baseline")
+    exec(source, module.__dict__)
+    return module.generate_appointment_email_html
+
+
+def measure(render, renders: int, same_appointment: bool) -> float:
+    base = datetime(2026, 3, 5, 10, 0)
+    data = [
+        {
+            "service_name": "Corte",
+            "stylist_name": "Luis",
+            "date": base if same_appointment else base + timedelta(minutes=i)
+        }
+        for i in range(renders)
+    ]
+    email_templates._render_tail.cache_clear()
+    started = time.perf_counter()
+    for i in range(renders):
+        render(f"Cliente {i}", "confirmado", data[i])
+    return renders / (time.perf_counter() - started)
+
+
+def main(renders: int, baseline: str):
+    implementations = [("precompilada", email_templates.generate_appointment_email_html)]
+    legacy = load_baseline(baseline)
+    if legacy is None:
+        print(f"No se pudo cargar la versión {baseline}; solo se mide la actual")
+    else:
+        implementations.insert(0, (f"anterior ({baseline})", legacy))
+
+    print(f"{'implementación':>22} | {'cache frío':>12} | {'cache caliente':>14}")
+    for label, render in implementations:
+        cold = measure(render, renders, same_appointment=False)
+        warm = measure(render, renders, same_appointment=True)
+        print(f"{label:>22} | {cold:>10.0f}/s | {warm:>12.0f}/s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--renders", type=int, default=50000)
+    parser.add_argument("--baseline", default="HEAD~1", help="Revisión de git con la implementación anterior")
+    args = parser.parse_args()
+    main(args.renders, args.baseline)
@@ -0,0 +1,77 @@
+"""
+Benchmark de conexiones SSE ociosas: abre N suscriptores de
+notification_broker.stream() (como hace GET /notifications/stream),
+mide la memoria por conexión y la latencia de entrega de un publish.
+
+No necesita base de datos ni servidor HTTP; ejercita el mismo generador
+que usa la ruta:
+    python -m benchmarks.bench_sse_subscribers --subscribers 5000
+"""
+import argparse
+import asyncio
+import gc
+import statistics
+import time
+import tracemalloc
+
+from app.services.notification_broker import LocalFanout, NotificationBroker
+
+
+async def consume(broker: NotificationBroker, user_id: int, received: list[float], stop: asyncio.Event):
+    async def is_disconnected() -> bool:
+        return stop.is_set()
+
+    async for chunk in broker.stream(user_id, is_disconnected, keepalive=3600):
+        if chunk.startswith("id:"):
+            received.append(time.perf_counter())
+
+
+async def main(subscribers: int, users: int, rounds: int):
+    broker = NotificationBroker(LocalFanout())
+    stop = asyncio.Event()
+    received: list[float] = []
+
+    gc.collect()
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    tasks = [
+        asyncio.create_task(consume(broker, i % users, received, stop))
+        for i in range(subscribers)
+    ]
+    await asyncio.sleep(0.5)
+    gc.collect()
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    stats = broker.stats()
+    print(f"conexiones abiertas: {stats['connections']} ({stats['users']} usuarios)")
+    print(f"memoria por conexión: {(after - before) / subscribers / 1024:.2f} KiB")
+
+    # Fan-out: publicar a todos los usuarios y medir hasta la última entrega
+    latencies = []
+    for i in range(rounds):
+        received.clear()
+        started = time.perf_counter()
+        for user_id in range(users):
+            broker.publish(user_id, {"id": i, "type": "recordatorio"})
+        while len(received) < subscribers:
+            await asyncio.sleep(0)
+        latencies.append(max(received) - started)
+
+    print(f"fan-out a {subscribers} conexiones: "
+          f"mediana {statistics.median(latencies) * 1000:.1f} ms, "
+          f"máx {max(latencies) * 1000:.1f} ms")
+
+    stop.set()
+    for user_id in range(users):
+        broker.publish(user_id, {"id": -1, "type": "cierre"})
+    await asyncio.gather(*tasks)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--subscribers", type=int, default=5000)
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(main(args.subscribers, args.users, args.rounds))
@@ -55,3 +55,17 @@ def mock_httpx_client(mock_httpx_response):
         return client
 
     return _create_client
+
+
+@pytest.fixture(autouse=True)
+def default_schedules():
+    """
+    Horarios de trabajo en memoria sin configurar (8:00 - 20:00 todos los días),
+    así los servicios no consultan la base de datos mockeada para cargarlos
+    """
+    from app.services.schedule_cache import schedule_cache
+    from app.utils.working_hours import WorkingSchedules
+
+    schedule_cache.set(WorkingSchedules())
+    yield schedule_cache
+    schedule_cache.invalidate()
@@ -0,0 +1,3 @@
+"""
+Integration tests (requieren una base de datos MySQL real)
+"""
@@ -0,0 +1,69 @@
+"""
+Tests para la exportación en streaming de citas (NDJSON/CSV)
+"""
+import csv
+import io
+import json
+from collections import namedtuple
+from datetime import datetime
+
+from sqlalchemy.dialects import mysql
+
+from app.schemas.appointment import AppointmentFilters
+from app.services.appointment_export import EXPORT_FIELDS, csv_chunk, export_query, ndjson_chunk
+
+ExportRow = namedtuple("ExportRow", EXPORT_FIELDS)
+
+
+def make_row(id: int, client_name: str) -> ExportRow:
+    values = dict.fromkeys(EXPORT_FIELDS)
+    values.update(id=id, date=datetime(2026, 3, 1, 9, 30), status="completed", client_name=client_name)
+    return ExportRow(**values)
+
+
+class TestExportQuery:
+    """Consulta de exportación"""
+
+    def test_une_nombres_y_aplica_filtros(self):
+        """
+        DADO filtros de rango de fechas y estado
+        CUANDO se construye la consulta de exportación
+        ENTONCES une estilista, servicio y cliente (opcional), filtra y ordena por (date, id)
+        """
+        query = export_query(AppointmentFilters(date_from=datetime(2026, 1, 1), status="completed"))
+
+        sql = str(query.compile(dialect=mysql.dialect()))
+        assert "JOIN users AS stylist" in sql
+        assert "LEFT OUTER JOIN users AS client" in sql
+        assert "coalesce(client.name, appointments.client_name)" in sql
+        assert "appointments.date >= %s" in sql and "appointments.status = %s" in sql
+        assert sql.rstrip().endswith("ORDER BY appointments.date, appointments.id")
+
+
+class TestFormatos:
+    """Serialización por lotes"""
+
+    def test_ndjson_un_objeto_por_linea(self):
+        """
+        DADO un lote de filas
+        CUANDO se serializa a NDJSON
+        ENTONCES cada línea es un objeto JSON con fechas ISO 8601
+        """
+        chunk = ndjson_chunk([make_row(1, "Ana"), make_row(2, "Señor Pérez")])
+
+        lines = chunk.splitlines()
+        assert len(lines) == 2 and chunk.endswith("\n")
+        assert json.loads(lines[1])["client_name"] == "Señor Pérez"
+        assert json.loads(lines[0])["date"] == "2026-03-01T09:30:00"
+
+    def test_csv_con_encabezado_solo_en_el_primer_lote(self):
+        """
+        DADO dos lotes consecutivos
+        CUANDO se serializan a CSV
+        ENTONCES el encabezado aparece una sola vez y las comas se escapan
+        """
+        text = csv_chunk([], header=True) + csv_chunk([make_row(1, "Pérez, Juan")]) + csv_chunk([make_row(2, "Ana")])
+
+        rows = list(csv.DictReader(io.StringIO(text)))
+        assert [row["id"] for row in rows] == ["1", "2"]
+        assert rows[0]["client_name"] == "Pérez, Juan"
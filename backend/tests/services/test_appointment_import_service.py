@@ -0,0 +1,124 @@
+"""
+Tests para la importación masiva de citas (AppointmentImportService)
+"""
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from sqlalchemy.dialects import mysql
+
+from app.services.appointment_import_service import AppointmentImportService
+from app.services.stats_service import StatsService
+
+DAY = (datetime.now() + timedelta(days=7)).replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def at(hour: int, minute: int = 0) -> str:
+    return (DAY + timedelta(hours=hour, minutes=minute)).isoformat()
+
+
+def result(rows):
+    result = MagicMock()
+    result.all.return_value = rows
+    result.scalars.return_value.all.return_value = rows
+    return result
+
+
+@pytest.fixture
+def db():
+    session = MagicMock()
+    session.execute = AsyncMock()
+    session.commit = AsyncMock()
+    session.rollback = AsyncMock()
+    return session
+
+
+@pytest.fixture
+def service(db):
+    return AppointmentImportService(db, AsyncMock(spec=StatsService))
+
+
+def given_catalog(db, busy=()):
+    """Servicio 7 de 30 min, estilista 5, cliente 20 y los intervalos ocupados"""
+    db.execute.side_effect = [
+        result([(7, 30)]),  # servicios
+        result([5]),        # estilistas
+        result([20]),       # clientes
+        result([]),         # bloqueo de agendas
+        result(list(busy)), # intervalos existentes
+        result([]),         # insert
+    ]
+
+
+class TestParse:
+    """Validación fila por fila"""
+
+    def test_csv_rechaza_filas_invalidas_sin_cortar_el_resto(self):
+        """
+        DADO un CSV con una fila sin fecha válida
+        CUANDO se parsea
+        ENTONCES esa fila queda rechazada con su número y las demás pasan
+        """
+        content = (
+            "stylist_id,service_id,date,client_id,client_name\n"
+            f"5,7,{at(10)},20,\n"
+            "5,7,mañana,,Ana\n"
+        )
+
+        rows, rejected = AppointmentImportService.parse_csv(content)
+
+        assert [number for number, _ in rows] == [1]
+        assert rows[0][1].client_id == 20 and rows[0][1].client_name is None
+        assert rejected[0]["row"] == 2 and "date" in rejected[0]["reason"]
+
+
+class TestImport:
+    """Conflictos contra la agenda existente y dentro del mismo lote"""
+
+    async def test_rechaza_choques_e_inserta_el_resto_en_un_insert(self, service, db):
+        """
+        DADO un lote con un choque con una cita existente y otro entre filas del lote
+        CUANDO se importa
+        ENTONCES se rechazan ambos, el resto se inserta en un solo INSERT y se hace un commit
+        """
+        given_catalog(db, busy=[(5, DAY + timedelta(hours=9), DAY + timedelta(hours=9, minutes=30))])
+        rows, rejected = service.parse_rows([
+            {"stylist_id": 5, "service_id": 7, "date": at(9, 15), "client_id": 20},       # choca con la existente
+            {"stylist_id": 5, "service_id": 7, "date": at(10), "client_name": "Ana"},
+            {"stylist_id": 5, "service_id": 7, "date": at(10, 15), "client_name": "Luis"},  # choca con la fila 2
+            {"stylist_id": 5, "service_id": 7, "date": at(11), "client_id": 20},
+            {"stylist_id": 5, "service_id": 99, "date": at(12), "client_id": 20},
+        ])
+
+        report = await service.import_rows(rows, rejected, created_by=1)
+
+        assert report["received"] == 5
+        assert report["imported"] == 2
+        assert [(r["row"], r["reason"]) for r in report["rejected"]] == [
+            (1, "El estilista ya tiene una cita en ese horario"),
+            (3, "El estilista ya tiene una cita en ese horario"),
+            (5, "Servicio no encontrado"),
+        ]
+        lock_sql = str(db.execute.await_args_list[3].args[0].compile(dialect=mysql.dialect()))
+        assert "ON DUPLICATE KEY UPDATE" in lock_sql
+        inserted = db.execute.await_args_list[5].args[1]
+        assert [row["is_walk_in"] for row in inserted] == [True, False]
+        assert inserted[0]["end_time"] - inserted[0]["date"] == timedelta(minutes=30)
+        service.stats_service.apply_deltas.assert_awaited_once()
+        db.commit.assert_awaited_once()
+
+    async def test_dry_run_no_inserta(self, service, db):
+        """
+        DADO un lote válido
+        CUANDO se importa en modo dry_run
+        ENTONCES se reportan las aceptadas pero se hace rollback sin insertar
+        """
+        given_catalog(db)
+        rows, rejected = service.parse_rows([{"stylist_id": 5, "service_id": 7, "date": at(10), "client_id": 20}])
+
+        report = await service.import_rows(rows, rejected, created_by=1, dry_run=True)
+
+        assert (report["accepted"], report["imported"]) == (1, 0)
+        db.rollback.assert_awaited_once()
+        db.commit.assert_not_awaited()
+        assert db.execute.await_count == 5
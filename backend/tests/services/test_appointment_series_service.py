@@ -0,0 +1,135 @@
+"""
+Tests para las series de citas recurrentes (AppointmentSeriesService)
+"""
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.models.appointment import Appointment
+from app.models.appointment_series import AppointmentSeries
+from app.models.service import Service
+from app.schemas.appointment import AppointmentSeriesCreate
+from app.services.appointment_series_service import AppointmentSeriesService
+from app.services.notification_service import NotificationService
+from app.services.stats_service import StatsService
+
+# Próximo lunes a las 10:00 (UTC)
+_today = datetime.now().replace(hour=10, minute=0, second=0, microsecond=0)
+START = _today + timedelta(days=7 - _today.weekday())
+
+
+def result(rows):
+    result = MagicMock()
+    result.all.return_value = rows
+    result.scalars.return_value.all.return_value = rows
+    result.scalar_one.return_value = rows[0] if rows else None
+    return result
+
+
+@pytest.fixture
+def db():
+    session = MagicMock()
+    session.execute = AsyncMock()
+    session.commit = AsyncMock()
+    session.rollback = AsyncMock()
+    session.flush = AsyncMock()
+    session.refresh = AsyncMock()
+    session.get = AsyncMock(return_value=Service(id=7, duration_min=45))
+    return session
+
+
+@pytest.fixture
+def service(db):
+    return AppointmentSeriesService(db, AsyncMock(spec=NotificationService), AsyncMock(spec=StatsService))
+
+
+def series_in(**kwargs) -> AppointmentSeriesCreate:
+    data = {"client_id": 20, "stylist_id": 5, "service_id": 7, "start": START, "interval": 2, "count": 4}
+    data.update(kwargs)
+    return AppointmentSeriesCreate(**data)
+
+
+class TestCreateSeries:
+    """Todas las ocurrencias se validan con una consulta de rango"""
+
+    async def test_choque_rechaza_la_serie_completa(self, service, db):
+        """
+        DADO una serie quincenal cuya tercera cita choca con una existente
+        CUANDO se crea sin skip_conflicts
+        ENTONCES se rechaza indicando la fecha y no se inserta nada
+        """
+        third = START + timedelta(weeks=4)
+        db.execute.side_effect = [result([]), result([(5, third, third + timedelta(minutes=30))])]
+
+        with pytest.raises(ValueError, match=third.strftime("%Y-%m-%d %H:%M")):
+            await service.create_series(series_in(), created_by=1)
+
+        assert db.execute.await_count == 2  # bloqueo de agendas + intervalos ocupados
+        db.rollback.assert_awaited_once()
+        db.commit.assert_not_awaited()
+
+    async def test_skip_conflicts_crea_el_resto_en_un_insert(self, service, db):
+        """
+        DADO una serie con una ocurrencia ocupada
+        CUANDO se crea con skip_conflicts
+        ENTONCES las demás se insertan juntas, se avisa una sola vez y se hace un commit
+        """
+        third = START + timedelta(weeks=4)
+        db.execute.side_effect = [
+            result([]),                                          # bloqueo de agendas
+            result([(5, third, third + timedelta(minutes=30))]), # intervalos ocupados
+            result([]),                                          # insert
+            result([101]),                                       # primera cita
+            result([]),                                          # citas de la serie
+        ]
+
+        series, _, skipped = await service.create_series(series_in(skip_conflicts=True), created_by=1)
+
+        assert skipped == [third]
+        inserted = db.execute.await_args_list[2].args[1]
+        assert [row["date"] for row in inserted] == [START, START + timedelta(weeks=2), START + timedelta(weeks=6)]
+        assert inserted[0]["end_time"] - inserted[0]["date"] == timedelta(minutes=45)
+        service.notification_service.enqueue_notifications.assert_awaited_once_with(
+            appointment_id=101, user_id=20, type="reservado"
+        )
+        db.commit.assert_awaited_once()
+
+    async def test_fuera_de_horario(self, service, db):
+        """
+        DADO una serie que empieza a las 21:00
+        CUANDO se crea
+        ENTONCES se rechaza sin consultar la agenda
+        """
+        with pytest.raises(ValueError, match="horario"):
+            await service.create_series(series_in(start=START.replace(hour=21)), created_by=1)
+        db.execute.assert_not_awaited()
+
+
+class TestCancelSeries:
+    """Cancelación en bloque"""
+
+    async def test_cancela_las_proximas_y_avisa_una_vez(self, service, db):
+        """
+        DADO una serie con dos citas futuras activas
+        CUANDO se cancela completa
+        ENTONCES ambas quedan canceladas, la serie también y se encola un solo aviso
+        """
+        series = AppointmentSeries(id=3, client_id=20, status="active")
+        db.get.return_value = series
+        appointments = [
+            Appointment(id=i, stylist_id=5, service_id=7, client_id=20, is_walk_in=False,
+                        date=START + timedelta(weeks=2 * i), status="confirmed")
+            for i in (1, 2)
+        ]
+        db.execute.return_value = result(appointments)
+
+        assert await service.cancel_series(3, modified_by=9) == 2
+
+        assert {a.status for a in appointments} == {"cancelled"}
+        assert series.status == "cancelled"
+        service.notification_service.enqueue_notifications.assert_awaited_once_with(
+            appointment_id=1, user_id=20, type="cancelado"
+        )
+        service.stats_service.apply_deltas.assert_awaited_once()
+        db.commit.assert_awaited_once()
@@ -0,0 +1,272 @@
+"""
+Tests para los cambios de estado masivos, los listados paginados, la disponibilidad y los reintentos de AppointmentService
+"""
+from datetime import datetime, time, timedelta
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from sqlalchemy.dialects import mysql
+from sqlalchemy.exc import OperationalError
+
+from app.models.appointment import Appointment
+from app.models.service import Service
+from app.schemas.appointment import AppointmentCreateWalkIn, AppointmentFilters
+from app.services.appointment_service import BOOKING_MAX_ATTEMPTS, AppointmentService
+from app.services.notification_service import NotificationService
+from app.services.stats_service import StatsService
+from app.utils.pagination import decode_cursor, encode_cursor
+from app.utils.working_hours import WorkingSchedules
+
+
+def make_appointment(id: int, client_id: int | None, status: str = "pending") -> Appointment:
+    return Appointment(
+        id=id,
+        client_id=client_id,
+        is_walk_in=client_id is None,
+        stylist_id=5,
+        service_id=7,
+        date=datetime(2026, 11, 2, 10, 0),
+        status=status,
+    )
+
+
+@pytest.fixture
+def db():
+    session = MagicMock()
+    session.commit = AsyncMock()
+    session.execute = AsyncMock()
+    return session
+
+
+@pytest.fixture
+def service(db):
+    return AppointmentService(
+        db,
+        AsyncMock(spec=NotificationService),
+        AsyncMock(spec=StatsService),
+    )
+
+
+def scalars_result(rows):
+    result = MagicMock()
+    result.scalars.return_value.all.return_value = rows
+    return result
+
+
+class TestBulkUpdateStatus:
+    """Cambio de estado de muchas citas en una transacción"""
+
+    async def test_cancelar_varias_citas_en_una_transaccion(self, db, service):
+        """
+        DADO tres citas pendientes, una de walk-in y una ya cancelada
+        CUANDO se cancelan en bloque
+        ENTONCES el rollup y las notificaciones se escriben una sola vez y se hace un commit
+        """
+        appointments = [
+            make_appointment(1, client_id=20),
+            make_appointment(2, client_id=21),
+            make_appointment(3, client_id=None),
+            make_appointment(4, client_id=22, status="cancelled"),
+        ]
+        db.execute.side_effect = [scalars_result(appointments), scalars_result(appointments)]
+
+        result = await service.bulk_update_status([1, 2, 3, 4, 2], "cancelled", modified_by=9)
+
+        assert [a.status for a in result] == ["cancelled"] * 4
+        service.stats_service.apply_deltas.assert_awaited_once()
+        deltas = service.stats_service.apply_deltas.await_args.args[0]
+        assert deltas[(datetime(2026, 11, 2).date(), 5, 7, "pending", False)] == -2
+        assert deltas[(datetime(2026, 11, 2).date(), 5, 7, "cancelled", True)] == 1
+        service.notification_service.enqueue_many.assert_awaited_once_with(
+            [(1, 20), (2, 21)], "cancelado"
+        )
+        db.commit.assert_awaited_once()
+
+    async def test_estado_invalido(self, service):
+        """
+        DADO un estado que no existe
+        CUANDO se intenta el cambio masivo
+        ENTONCES se rechaza con ValueError
+        """
+        with pytest.raises(ValueError):
+            await service.bulk_update_status([1], "archivada", modified_by=9)
+
+
+class TestListadoPaginado:
+    """Listados de citas por keyset sobre (date, id)"""
+
+    async def test_siguiente_pagina_por_keyset(self, service, db):
+        """
+        DADO un cursor de la página anterior y filtros
+        CUANDO se lista la siguiente página
+        ENTONCES se filtra (date, id) después del cursor sin OFFSET y el nuevo cursor es la última cita
+        """
+        rows = [make_appointment(i, client_id=20) for i in (9, 8, 7)]
+        db.execute.return_value = scalars_result(rows)
+        cursor = encode_cursor(datetime(2026, 11, 2, 10, 0), 10)
+
+        appointments, next_cursor = await service.list_appointments(
+            AppointmentFilters(status="confirmed", is_walk_in=False), cursor, limit=2
+        )
+
+        assert [a.id for a in appointments] == [9, 8]
+        assert decode_cursor(next_cursor) == (datetime(2026, 11, 2, 10, 0), 8)
+        sql = str(db.execute.await_args.args[0].compile(dialect=mysql.dialect()))
+        assert "appointments.date < %s OR appointments.date = %s AND appointments.id < %s" in sql
+        assert "appointments.status = %s" in sql and "appointments.is_walk_in = false" in sql
+        assert "ORDER BY appointments.date DESC, appointments.id DESC" in sql
+        assert "OFFSET" not in sql
+
+    async def test_agenda_del_estilista_es_cronologica(self, service, db):
+        """
+        DADO la agenda de un estilista que cabe en una página
+        CUANDO se lista
+        ENTONCES se ordena por fecha ascendente y no hay cursor siguiente
+        """
+        db.execute.return_value = scalars_result([make_appointment(1, client_id=20)])
+
+        appointments, next_cursor = await service.list_stylist_appointments(5)
+
+        assert len(appointments) == 1 and next_cursor is None
+        sql = str(db.execute.await_args.args[0].compile(dialect=mysql.dialect()))
+        assert "appointments.stylist_id = %s" in sql
+        assert "ORDER BY appointments.date ASC, appointments.id ASC" in sql
+
+    async def test_cursor_invalido(self, service):
+        """
+        DADO un cursor manipulado
+        CUANDO se lista
+        ENTONCES se rechaza con ValueError
+        """
+        with pytest.raises(ValueError):
+            await service.list_appointments(cursor="no-es-un-cursor")
+
+
+class TestNextAvailable:
+    """Búsqueda de próximos huecos entre estilistas"""
+
+    async def test_una_consulta_para_todos_los_estilistas(self, service, db):
+        """
+        DADO dos estilistas, uno ocupado hasta las 9:00 y otro libre
+        CUANDO se buscan los 2 primeros huecos desde las 8:00
+        ENTONCES se resuelve con una consulta de agenda y se ordenan por hora
+        """
+        db.get = AsyncMock(return_value=Service(id=7, name="Corte", duration_min=30))
+        day = datetime(2030, 1, 15)
+        result = MagicMock()
+        result.all.return_value = [
+            (5, "Ana", day.replace(hour=8), day.replace(hour=9)),
+            (6, "Luis", None, None),
+        ]
+        db.execute.return_value = result
+
+        found = await service.find_next_available(7, limit=2, not_before=day.replace(hour=8))
+
+        assert db.execute.await_count == 1
+        assert [(s["stylist_name"], s["start"].hour, s["start"].minute) for s in found["slots"]] == [
+            ("Luis", 8, 0), ("Luis", 8, 15)
+        ]
+        assert found["slots"][0]["end"] - found["slots"][0]["start"] == timedelta(minutes=30)
+
+    async def test_horizonte_fuera_de_rango(self, service):
+        """
+        DADO un horizonte mayor al permitido
+        CUANDO se buscan huecos
+        ENTONCES se rechaza con ValueError
+        """
+        with pytest.raises(ValueError):
+            await service.find_next_available(7, horizon_days=90)
+
+
+class TestHorarioDeTrabajo:
+    """Disponibilidad y validación según el horario configurado del estilista"""
+
+    async def test_disponibilidad_respeta_el_descanso(self, service, db, default_schedules):
+        """
+        DADO un estilista de 9:00 a 13:00 y de 14:00 a 16:00 los martes
+        CUANDO se consulta su disponibilidad de un martes en slots de 1 hora
+        ENTONCES no se ofrece el horario del descanso ni fuera de su turno
+        """
+        default_schedules.set(WorkingSchedules(weekly={5: {1: ((time(9), time(13)), (time(14), time(16)))}}))
+        result = MagicMock()
+        result.all.return_value = [(5, "Ana", None, None)]
+        db.execute.return_value = result
+
+        availability = await service.get_availability("2030-01-15", stylist_id=5)
+
+        assert availability["stylists"][0]["available_slots"] == ["09:00", "10:00", "11:00", "12:00", "14:00", "15:00"]
+
+    async def test_rechaza_citas_en_el_dia_libre(self, service, default_schedules):
+        """
+        DADO un estilista que solo trabaja los martes
+        CUANDO se intenta agendar un miércoles
+        ENTONCES se rechaza sin consultar la agenda
+        """
+        default_schedules.set(WorkingSchedules(weekly={5: {1: ((time(9), time(18)),)}}))
+
+        with pytest.raises(ValueError, match="no atiende ese día"):
+            await service._validate_datetime(datetime(2030, 1, 16, 10, 0), stylist_id=5)
+
+
+def lock_error(code: int) -> OperationalError:
+    return OperationalError("INSERT INTO stylist_day_locks ...", {}, Exception(code, "lock"))
+
+
+class TestReintentoPorBloqueos:
+    """Reservas abortadas por MySQL por deadlock o espera de bloqueo"""
+
+    @pytest.fixture(autouse=True)
+    def no_backoff(self, monkeypatch):
+        monkeypatch.setattr("app.services.appointment_service.asyncio.sleep", AsyncMock())
+
+    @pytest.fixture
+    def booking(self, service, db):
+        db.rollback = AsyncMock()
+        service._validate_datetime = AsyncMock()
+        service._check_stylist_availability = AsyncMock(return_value=datetime(2030, 1, 15, 11, 0))
+        db.refresh = AsyncMock()
+        return AppointmentCreateWalkIn(
+            client_name="Walk-in", stylist_id=5, service_id=7, date=datetime(2030, 1, 15, 10, 0)
+        )
+
+    async def test_deadlock_reintenta_la_transaccion(self, service, db, booking):
+        """
+        DADO una reserva cuyo commit MySQL aborta una vez por deadlock (1213)
+        CUANDO se crea la cita
+        ENTONCES se hace rollback y la transacción completa se repite con éxito
+        """
+        db.commit.side_effect = [lock_error(1213), None]
+
+        appointment = await service.create_walk_in_appointment(booking, created_by=9)
+
+        assert appointment.stylist_id == 5
+        assert db.commit.await_count == 2
+        db.rollback.assert_awaited_once()
+        assert service._check_stylist_availability.await_count == 2
+
+    async def test_espera_de_bloqueo_agotada_se_propaga_tras_los_intentos(self, service, db, booking):
+        """
+        DADO una agenda bloqueada que siempre agota la espera (1205)
+        CUANDO se crea la cita
+        ENTONCES se intenta BOOKING_MAX_ATTEMPTS veces y se propaga el error
+        """
+        db.commit.side_effect = lock_error(1205)
+
+        with pytest.raises(OperationalError):
+            await service.create_walk_in_appointment(booking, created_by=9)
+
+        assert db.commit.await_count == BOOKING_MAX_ATTEMPTS
+
+    async def test_otros_errores_no_se_reintentan(self, service, db, booking):
+        """
+        DADO un error de MySQL que no es de bloqueo (p. ej. conexión perdida, 2013)
+        CUANDO se crea la cita
+        ENTONCES se propaga sin reintentar
+        """
+        db.commit.side_effect = lock_error(2013)
+
+        with pytest.raises(OperationalError):
+            await service.create_walk_in_appointment(booking, created_by=9)
+
+        assert db.commit.await_count == 1
+        db.rollback.assert_not_awaited()
@@ -0,0 +1,111 @@
+"""
+Tests para el cache de dashboards (TTL + invalidación por eventos)
+"""
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from app.services.dashboard_cache import DashboardCache, InMemoryCacheBackend
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def cache(clock):
+    return DashboardCache(InMemoryCacheBackend(clock=clock), ttl=30)
+
+
+def make_builder(value):
+    calls = []
+
+    async def builder():
+        calls.append(1)
+        return value
+
+    return builder, calls
+
+
+class TestGetOrBuild:
+    """Aciertos, fallos y expiración por TTL"""
+
+    async def test_segunda_lectura_es_un_acierto(self, cache):
+        builder, calls = make_builder({"total": 1})
+
+        first = await cache.get_or_build("stylist:1", builder)
+        second = await cache.get_or_build("stylist:1", builder)
+
+        assert first == second == {"total": 1}
+        assert len(calls) == 1
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+        assert cache.stats()["hit_ratio"] == 0.5
+
+    async def test_entrada_expira_al_vencer_el_ttl(self, cache, clock):
+        builder, calls = make_builder("dashboard")
+        await cache.get_or_build("client:3", builder)
+
+        clock.now = 31
+        await cache.get_or_build("client:3", builder)
+
+        assert len(calls) == 2
+
+    async def test_no_guarda_si_se_invalida_mientras_se_construye(self, cache):
+        async def builder():
+            cache.invalidate_appointment([1], [None], [date(2030, 1, 1)], ["confirmed"])
+            return "viejo"
+
+        await cache.get_or_build("stylist:1", builder)
+
+        assert cache.stats()["entries"] == 0
+
+
+class TestInvalidateAppointment:
+    """Solo se invalidan los dashboards que muestran la cita"""
+
+    async def fill(self, cache, *keys):
+        for key in keys:
+            builder, _ = make_builder(key)
+            await cache.get_or_build(key, builder)
+
+    async def test_invalida_estilista_cliente_y_admin_afectados(self, cache):
+        await self.fill(cache, "admin::", "admin:2030-01-01:2030-01-31", "stylist:1", "stylist:2", "client:5", "client:6", "receptionist")
+
+        cache.invalidate_appointment(
+            stylist_ids=[1],
+            client_ids=[5],
+            days=[date.today() + timedelta(days=10)],
+            statuses=["confirmed", "completed"]
+        )
+
+        remaining = set(cache.backend._entries)
+        assert remaining == {"stylist:2", "client:6", "receptionist"}
+
+    async def test_invalida_recepcion_si_la_cita_es_de_hoy(self, cache):
+        await self.fill(cache, "receptionist")
+
+        cache.invalidate_appointment([1], [None], [datetime.now().date()], ["confirmed"])
+
+        assert cache.stats()["entries"] == 0
+
+    async def test_invalida_recepcion_si_cambia_una_pendiente(self, cache):
+        await self.fill(cache, "receptionist")
+
+        cache.invalidate_appointment([1], [None], [date.today() + timedelta(days=3)], ["pending", "confirmed"])
+
+        assert cache.stats()["entries"] == 0
+
+
+def test_key_une_partes_y_omite_nulos():
+    assert DashboardCache.key("stylist", 7) == "stylist:7"
+    assert DashboardCache.key("admin", None, None) == "admin::"
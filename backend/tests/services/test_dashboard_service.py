@@ -0,0 +1,42 @@
+"""
+Tests para el día que usa el dashboard de recepción (DashboardService)
+"""
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock
+
+from sqlalchemy.dialects import mysql
+
+from app.services.dashboard_service import DashboardService
+
+# 23:30 en Lima (UTC-5) del 15 de enero: en UTC ya es 16 de enero
+LIMA = timezone(timedelta(hours=-5))
+LATE_EVENING = datetime(2030, 1, 15, 23, 30, tzinfo=LIMA)
+
+
+class FixedDatetime(datetime):
+    @classmethod
+    def now(cls, tz=None):
+        return LATE_EVENING.astimezone(tz) if tz else LATE_EVENING.replace(tzinfo=None)
+
+
+class TestDiaUTC:
+    """Citas de hoy por estilista con el mismo día que el rollup"""
+
+    async def test_cerca_de_medianoche_usa_el_dia_utc(self, monkeypatch, default_schedules):
+        """
+        DADO un servidor en UTC-5 a las 23:30 del 15 de enero
+        CUANDO se calculan las citas de hoy por estilista
+        ENTONCES el rollup se consulta para el 16 de enero, el día UTC
+        """
+        monkeypatch.setattr("app.services.dashboard_service.datetime", FixedDatetime)
+        result = MagicMock()
+        result.all.return_value = []
+        db = MagicMock()
+        db.execute = AsyncMock(return_value=result)
+
+        assert await DashboardService(db)._get_stylists_availability_today() == []
+
+        sql = str(db.execute.await_args.args[0].compile(
+            dialect=mysql.dialect(), compile_kwargs={"literal_binds": True}
+        ))
+        assert "daily_appointment_stats.day = '2030-01-16'" in sql
@@ -0,0 +1,120 @@
+"""
+Tests para el envío de correos (EmailService)
+"""
+import asyncio
+import smtplib
+import time
+
+from app.services.email_service import EmailService
+from app.services.smtp_pool import SMTPConnectionPool
+
+SMTP_DELAY_SECONDS = 0.3
+
+
+class SlowSMTP:
+    """SMTP de prueba que bloquea el hilo como un servidor lento"""
+
+    sent = []
+
+    def __init__(self, host, port, timeout=None):
+        SlowSMTP.connections += 1
+        time.sleep(SMTP_DELAY_SECONDS / 3)
+
+    def quit(self):
+        pass
+
+    def starttls(self):
+        time.sleep(SMTP_DELAY_SECONDS / 3)
+
+    def login(self, user, password):
+        pass
+
+    connections = 0
+
+    def send_message(self, msg):
+        time.sleep(SMTP_DELAY_SECONDS / 3)
+        if msg["To"].startswith("rechazado"):
+            raise smtplib.SMTPRecipientsRefused({msg["To"]: (550, b"No such user")})
+        SlowSMTP.sent.append(msg["To"])
+
+
+def make_service() -> EmailService:
+    pool = SMTPConnectionPool("localhost", 587, password="secreto", max_size=4, smtp_class=SlowSMTP)
+    return EmailService(pool=pool)
+
+
+class TestSendEmailAsync:
+    """El envío no debe bloquear el event loop"""
+
+    async def test_event_loop_sigue_avanzando_mientras_se_envia(self):
+        """
+        DADO un servidor SMTP lento
+        CUANDO se envía un correo con send_email_async
+        ENTONCES otras corrutinas siguen ejecutándose durante el envío
+        """
+        SlowSMTP.sent = []
+        ticks = 0
+        sending = True
+
+        async def other_request():
+            nonlocal ticks
+            while sending:
+                ticks += 1
+                await asyncio.sleep(0.01)
+
+        async def send():
+            nonlocal sending
+            try:
+                await make_service().send_email_async("cliente@example.com", "Asunto", "Cuerpo", "<p>Hola</p>")
+            finally:
+                sending = False
+
+        await asyncio.gather(send(), other_request())
+
+        assert SlowSMTP.sent == ["cliente@example.com"]
+        # Con un envío bloqueante en el loop el contador quedaría en 1
+        assert ticks >= 10
+
+    async def test_envios_concurrentes_se_solapan(self):
+        """
+        DADO varios correos enviados a la vez
+        CUANDO se esperan juntos
+        ENTONCES el tiempo total es menor a enviarlos en serie
+        """
+        SlowSMTP.sent = []
+        service = make_service()
+
+        started = time.perf_counter()
+        await asyncio.gather(*(
+            service.send_email_async(f"c{i}@example.com", "Asunto", "Cuerpo")
+            for i in range(4)
+        ))
+        elapsed = time.perf_counter() - started
+
+        assert len(SlowSMTP.sent) == 4
+        assert elapsed < SMTP_DELAY_SECONDS * 4 * 0.75
+
+
+class TestSendMessages:
+    """Lotes enviados por una misma conexión"""
+
+    def test_lote_usa_una_sola_conexion(self):
+        """
+        DADO un lote de 4 correos con un destinatario rechazado
+        CUANDO se envía con send_messages
+        ENTONCES se abre una conexión y solo el rechazado reporta error
+        """
+        SlowSMTP.sent = []
+        SlowSMTP.connections = 0
+        service = make_service()
+        messages = [
+            service.build_message(to, "Asunto", "Cuerpo")
+            for to in ["a@example.com", "rechazado@example.com", "b@example.com", "c@example.com"]
+        ]
+
+        errors = service.send_messages(messages)
+
+        assert SlowSMTP.connections == 1
+        assert SlowSMTP.sent == ["a@example.com", "b@example.com", "c@example.com"]
+        assert errors[0] is None and errors[2] is None and errors[3] is None
+        assert isinstance(errors[1], smtplib.SMTPRecipientsRefused)
@@ -0,0 +1,143 @@
+"""
+Tests para el pub/sub de notificaciones web en tiempo real (NotificationBroker)
+"""
+import asyncio
+import json
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
+
+from app.services.notification_broker import (
+    PENDING_WEB_NOTIFICATIONS,
+    LocalFanout,
+    NotificationBroker,
+    format_event,
+    notification_broker,
+)
+
+
+def payload(notification_id: int) -> dict:
+    return {"id": notification_id, "type": "reservado", "title": "Cita reservada"}
+
+
+class TestSubscribe:
+    """Cada conexión recibe solo las notificaciones de su usuario"""
+
+    async def test_publish_llega_a_todas_las_conexiones_del_usuario(self):
+        """
+        DADO un usuario con dos pestañas abiertas y otro usuario conectado
+        CUANDO se publica una notificación para el primero
+        ENTONCES ambas pestañas la reciben y el otro usuario no
+        """
+        broker = NotificationBroker(LocalFanout())
+
+        async with broker.subscribe(1) as tab_a, broker.subscribe(1) as tab_b, broker.subscribe(2) as other:
+            broker.publish(1, payload(10))
+
+            assert tab_a.get_nowait() == payload(10)
+            assert tab_b.get_nowait() == payload(10)
+            assert other.empty()
+
+        assert broker.stats()["connections"] == 0
+
+    async def test_cola_llena_descarta_el_evento_mas_antiguo(self):
+        """
+        DADO una conexión que no consume sus eventos
+        CUANDO se publican más eventos que el tamaño de la cola
+        ENTONCES se conservan los más recientes y se cuentan los descartados
+        """
+        broker = NotificationBroker(LocalFanout(), queue_size=2)
+
+        async with broker.subscribe(1) as queue:
+            for notification_id in (1, 2, 3):
+                broker.publish(1, payload(notification_id))
+
+            assert [queue.get_nowait()["id"], queue.get_nowait()["id"]] == [2, 3]
+            assert broker.stats()["dropped"] == 1
+
+
+class TestStream:
+    """Formato SSE del generador que usa GET /notifications/stream"""
+
+    async def test_reenvia_backlog_y_luego_eventos_en_vivo(self):
+        """
+        DADO un navegador que reconecta con Last-Event-ID
+        CUANDO se abre el stream y luego llega una notificación nueva
+        ENTONCES primero recibe las perdidas y después la nueva, con su id
+        """
+        broker = NotificationBroker(LocalFanout())
+        disconnected = False
+
+        async def is_disconnected() -> bool:
+            return disconnected
+
+        async def backlog() -> list[dict]:
+            return [payload(5)]
+
+        stream = broker.stream(1, is_disconnected, backlog)
+        assert await anext(stream) == "retry: 5000\n\n"
+        assert await anext(stream) == format_event(payload(5))
+
+        live = asyncio.ensure_future(anext(stream))
+        await asyncio.sleep(0)
+        broker.publish(1, payload(6))
+        chunk = await live
+
+        assert chunk.startswith("id: 6\nevent: notification\ndata: ")
+        assert json.loads(chunk.split("data: ", 1)[1]) == payload(6)
+        disconnected = True
+        await stream.aclose()
+        assert broker.stats()["connections"] == 0
+
+    async def test_envia_keep_alive_si_no_hay_eventos(self):
+        """
+        DADO una conexión sin notificaciones
+        CUANDO pasa el intervalo de keep-alive
+        ENTONCES se envía un comentario SSE
+        """
+        broker = NotificationBroker(LocalFanout())
+
+        async def is_disconnected() -> bool:
+            return False
+
+        stream = broker.stream(1, is_disconnected, keepalive=0.01)
+        await anext(stream)
+
+        assert await anext(stream) == ": keep-alive\n\n"
+        await stream.aclose()
+
+
+class TestSessionEvents:
+    """Las notificaciones web se publican solo si la transacción se confirma"""
+
+    def session_with_pending(self) -> Session:
+        session = Session(create_engine("sqlite://"))
+        session.execute(text("SELECT 1"))
+        session.info[PENDING_WEB_NOTIFICATIONS] = [(7, payload(70))]
+        return session
+
+    async def test_commit_publica(self):
+        """
+        DADO una sesión con una notificación web pendiente de publicar
+        CUANDO se hace commit
+        ENTONCES el usuario la recibe
+        """
+        async with notification_broker.subscribe(7) as queue:
+            session = self.session_with_pending()
+            session.commit()
+
+            assert queue.get_nowait() == payload(70)
+            assert PENDING_WEB_NOTIFICATIONS not in session.info
+
+    async def test_rollback_descarta(self):
+        """
+        DADO una sesión con una notificación web pendiente de publicar
+        CUANDO se hace rollback
+        ENTONCES no se publica nada
+        """
+        async with notification_broker.subscribe(7) as queue:
+            session = self.session_with_pending()
+            session.rollback()
+            session.commit()
+
+            assert queue.empty()
@@ -0,0 +1,296 @@
+"""
+Tests para el outbox de notificaciones (NotificationService)
+"""
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from sqlalchemy.dialects import mysql
+
+from app.models.appointment import Appointment
+from app.models.notification import Notification
+from app.models.service import Service
+from app.models.user import User
+from app.services.notification_service import (
+    MAX_EMAIL_ATTEMPTS,
+    MAX_MARK_READ_IDS,
+    RETRY_BASE_SECONDS,
+    NotificationService,
+)
+
+
+@pytest.fixture
+def db():
+    session = MagicMock()
+    session.flush = AsyncMock()
+    session.commit = AsyncMock()
+    session.execute = AsyncMock()
+    return session
+
+
+def utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+class TestEnqueueNotifications:
+    """Las notificaciones se escriben en la transacción de la cita"""
+
+    async def test_email_queda_pendiente_y_no_hace_commit(self, db):
+        """
+        DADO una cita recién reservada
+        CUANDO se encolan sus notificaciones
+        ENTONCES el email queda pendiente, la web enviada y no se hace commit
+        """
+        service = NotificationService(db)
+
+        email, web = await service.enqueue_notifications(appointment_id=1, user_id=2, type="reservado")
+
+        assert (email.channel, email.status) == ("email", "pendiente")
+        assert (web.channel, web.status) == ("web", "enviado")
+        assert web.sent_at is not None
+        assert db.add.call_count == 2
+        db.commit.assert_not_awaited()
+
+
+class TestClaimPendingEmails:
+    """Los workers reclaman lotes sin pisarse"""
+
+    async def test_reclama_con_skip_locked_y_reserva_las_filas(self, db):
+        """
+        DADO correos pendientes en la cola
+        CUANDO un worker reclama un lote
+        ENTONCES usa FOR UPDATE SKIP LOCKED, incrementa los intentos y hace commit
+        """
+        selected = MagicMock()
+        selected.scalars.return_value.all.return_value = [3, 7]
+        db.execute.side_effect = [selected, MagicMock()]
+
+        ids = await NotificationService(db).claim_pending_emails(limit=10)
+
+        assert ids == [3, 7]
+        claim_sql = str(db.execute.await_args_list[0].args[0].compile(dialect=mysql.dialect()))
+        assert "FOR UPDATE SKIP LOCKED" in claim_sql
+        update_sql = str(db.execute.await_args_list[1].args[0].compile(dialect=mysql.dialect()))
+        assert "attempts" in update_sql and "next_attempt_at" in update_sql
+        db.commit.assert_awaited_once()
+
+    async def test_cola_vacia_no_actualiza(self, db):
+        """
+        DADO una cola sin pendientes
+        CUANDO un worker reclama un lote
+        ENTONCES no ejecuta el UPDATE de reserva
+        """
+        selected = MagicMock()
+        selected.scalars.return_value.all.return_value = []
+        db.execute.return_value = selected
+
+        assert await NotificationService(db).claim_pending_emails(limit=10) == []
+        assert db.execute.await_count == 1
+
+
+class TestReintentos:
+    """Backoff exponencial hasta agotar los intentos"""
+
+    def test_fallo_temporal_reprograma_con_backoff(self):
+        """
+        DADO un correo en su segundo intento
+        CUANDO el envío falla
+        ENTONCES sigue pendiente y se reprograma a 2 * RETRY_BASE_SECONDS
+        """
+        notification = Notification(status="pendiente", attempts=2)
+
+        NotificationService._mark_failed_attempt(notification, "timeout")
+
+        assert notification.status == "pendiente"
+        assert notification.last_error == "timeout"
+        expected = utcnow() + timedelta(seconds=RETRY_BASE_SECONDS * 2)
+        assert abs((notification.next_attempt_at - expected).total_seconds()) < 5
+
+    def test_agotar_intentos_marca_fallido(self):
+        """
+        DADO un correo en su último intento
+        CUANDO el envío falla
+        ENTONCES queda como fallido y sin próximo intento
+        """
+        notification = Notification(status="pendiente", attempts=MAX_EMAIL_ATTEMPTS)
+
+        NotificationService._mark_failed_attempt(notification, "x" * 300)
+
+        assert notification.status == "fallido"
+        assert notification.next_attempt_at is None
+        assert len(notification.last_error) == 255
+
+
+class TestBandeja:
+    """Bandeja web paginada por cursor y marcado de leídas"""
+
+    async def test_pagina_por_keyset_y_retorna_siguiente_cursor(self, db):
+        """
+        DADO un usuario con más notificaciones que el tamaño de página
+        CUANDO pide la página siguiente a un cursor
+        ENTONCES se filtra id < cursor sin OFFSET y el nuevo cursor es el último id
+        """
+        db.execute.return_value = scalars_result([Notification(id=i) for i in (9, 8, 7)])
+
+        items, next_cursor = await NotificationService(db).list_inbox(user_id=1, cursor=10, limit=2)
+
+        assert [n.id for n in items] == [9, 8]
+        assert next_cursor == 8
+        sql = str(db.execute.await_args.args[0].compile(dialect=mysql.dialect()))
+        assert "notifications.id < %s" in sql
+        assert "OFFSET" not in sql and "ORDER BY notifications.id DESC" in sql
+
+    async def test_ultima_pagina_no_tiene_cursor(self, db):
+        """
+        DADO la última página de la bandeja
+        CUANDO se lista
+        ENTONCES next_cursor es None
+        """
+        db.execute.return_value = scalars_result([Notification(id=2)])
+
+        items, next_cursor = await NotificationService(db).list_inbox(user_id=1, limit=20)
+
+        assert len(items) == 1 and next_cursor is None
+
+    async def test_marcar_sin_ids_no_consulta(self, db):
+        """
+        DADO una lista de ids vacía
+        CUANDO se marcan como leídas
+        ENTONCES no se ejecuta ningún UPDATE
+        """
+        assert await NotificationService(db).mark_read(user_id=1, ids=[]) == 0
+        db.execute.assert_not_awaited()
+
+    async def test_marcar_demasiados_ids_falla(self, db):
+        """
+        DADO más ids que el máximo permitido
+        CUANDO se marcan como leídas
+        ENTONCES se lanza ValueError
+        """
+        with pytest.raises(ValueError):
+            await NotificationService(db).mark_read(user_id=1, ids=list(range(MAX_MARK_READ_IDS + 1)))
+
+
+class TestRetencion:
+    """Archivado y borrado de notificaciones antiguas"""
+
+    async def test_lote_excluye_pendientes_y_avanza_por_id(self, db):
+        """
+        DADO una fecha de corte
+        CUANDO se pide el siguiente lote a archivar
+        ENTONCES se filtra por created_at, se excluyen los pendientes y se continúa desde after_id
+        """
+        db.execute.return_value = scalars_result([])
+
+        await NotificationService(db).fetch_expired(utcnow(), limit=500, after_id=42)
+
+        sql = str(db.execute.await_args.args[0].compile(dialect=mysql.dialect()))
+        assert "notifications.created_at < %s" in sql
+        assert "notifications.status != %s" in sql
+        assert "notifications.id > %s" in sql and "LIMIT" in sql
+
+    def test_registro_de_archivo_es_json(self):
+        """
+        DADO una notificación con fechas
+        CUANDO se convierte a registro de archivo
+        ENTONCES incluye todas las columnas con las fechas en ISO 8601
+        """
+        created = datetime(2025, 1, 2, 10, 30)
+        notification = Notification(id=1, user_id=2, channel="web", status="enviado", created_at=created)
+
+        record = NotificationService.to_archive_record(notification)
+
+        assert record["created_at"] == "2025-01-02T10:30:00"
+        assert set(record) == {column.key for column in Notification.__table__.columns}
+
+
+def scalars_result(rows):
+    result = MagicMock()
+    result.scalars.return_value.all.return_value = rows
+    return result
+
+
+class TestSendEmailNotifications:
+    """Envío en lote con pocas consultas y una conexión SMTP"""
+
+    async def test_lote_usa_una_consulta_por_tabla(self, db):
+        """
+        DADO tres correos pendientes de dos citas
+        CUANDO se envían en lote y uno falla
+        ENTONCES se hacen 4 consultas IN, un solo envío SMTP y cada fila queda con su estado
+        """
+        notifications = [
+            Notification(id=i, appointment_id=10 + i % 2, user_id=1, type="cancelado",
+                         channel="email", status="pendiente", attempts=1)
+            for i in range(3)
+        ]
+        day = datetime(2026, 11, 2, 10, 0)
+        appointments = [
+            Appointment(id=10, stylist_id=5, service_id=7, date=day),
+            Appointment(id=11, stylist_id=5, service_id=7, date=day),
+        ]
+        users = [
+            User(id=1, name="Ana", email="ana@example.com"),
+            User(id=5, name="Luis", email="luis@example.com"),
+        ]
+        services = [Service(id=7, name="Corte")]
+        db.execute.side_effect = [
+            scalars_result(notifications),
+            scalars_result(appointments),
+            scalars_result(users),
+            scalars_result(services),
+        ]
+        service = NotificationService(db)
+        service.email_service.send_messages_async = AsyncMock(
+            return_value=[None, RuntimeError("boom"), None]
+        )
+
+        counts = await service.send_email_notifications([0, 1, 2])
+
+        assert db.execute.await_count == 4
+        service.email_service.send_messages_async.assert_awaited_once()
+        messages = service.email_service.send_messages_async.await_args.args[0]
+        assert [m["To"] for m in messages] == ["ana@example.com"] * 3
+        assert [n.status for n in notifications] == ["enviado", "pendiente", "enviado"]
+        assert counts == {"enviado": 2, "pendiente": 1, "fallido": 0}
+
+    async def test_usuario_sin_email_no_se_envia(self, db):
+        """
+        DADO una notificación de un usuario sin email
+        CUANDO se envía el lote
+        ENTONCES queda fallida sin intentar el envío
+        """
+        notification = Notification(id=1, appointment_id=10, user_id=1, type="reservado",
+                                    channel="email", status="pendiente", attempts=1)
+        db.execute.side_effect = [
+            scalars_result([notification]),
+            scalars_result([Appointment(id=10, stylist_id=5, service_id=7, date=datetime(2026, 11, 2, 10))]),
+            scalars_result([User(id=1, name="Ana", email=None)]),
+            scalars_result([]),
+        ]
+        service = NotificationService(db)
+        service.email_service.send_messages_async = AsyncMock(return_value=[])
+
+        counts = await service.send_email_notifications([1])
+
+        assert notification.status == "fallido"
+        assert service.email_service.send_messages_async.await_args.args[0] == []
+        assert counts["fallido"] == 1
+
+    async def test_solo_carga_correos_pendientes(self, db):
+        """
+        DADO ids de notificaciones que pueden ser web o ya enviadas
+        CUANDO se envía el lote
+        ENTONCES la consulta solo trae correos pendientes y no se envía nada más
+        """
+        db.execute.side_effect = [scalars_result([]), scalars_result([]), scalars_result([]), scalars_result([])]
+        service = NotificationService(db)
+        service.email_service.send_messages_async = AsyncMock(return_value=[])
+
+        counts = await service.send_email_notifications([1, 2])
+
+        query = db.execute.await_args_list[0].args[0]
+        sql = str(query.compile(dialect=mysql.dialect(), compile_kwargs={"literal_binds": True}))
+        assert "notifications.channel = 'email'" in sql
+        assert "notifications.status = 'pendiente'" in sql
+        assert counts == {"enviado": 0, "pendiente": 0, "fallido": 0}
@@ -0,0 +1,88 @@
+"""
+Tests para el programador de recordatorios (ReminderService)
+"""
+from datetime import datetime
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from sqlalchemy.dialects import mysql
+from sqlalchemy.exc import IntegrityError
+
+from app.services.reminder_service import ReminderService
+
+NOW = datetime(2026, 11, 2, 9, 0)
+
+
+@pytest.fixture
+def db():
+    session = MagicMock()
+    session.execute = AsyncMock()
+    session.flush = AsyncMock()
+    session.commit = AsyncMock()
+    session.rollback = AsyncMock()
+    return session
+
+
+class TestVentanas:
+    """Franjas de tiempo y consulta de citas por recordar"""
+
+    def test_ventanas_se_convierten_en_franjas_sin_solapes(self):
+        """
+        DADO ventanas de 24 h y 2 h en cualquier orden
+        CUANDO se calculan las franjas
+        ENTONCES cada cita cae en una sola franja
+        """
+        assert ReminderService.window_bands([1440, 120, 120]) == [(0, 120), (120, 1440)]
+
+    def test_consulta_por_rango_con_anti_join(self):
+        """
+        DADO la franja de 2 a 24 horas
+        CUANDO se arma la consulta de citas por recordar
+        ENTONCES filtra por estado y rango de fecha y excluye las ya recordadas
+        """
+        query = ReminderService.due_query(1440, 120, NOW)
+        sql = str(query.compile(dialect=mysql.dialect(), compile_kwargs={"literal_binds": True}))
+
+        assert "LEFT OUTER JOIN appointment_reminders" in sql
+        assert "appointment_reminders.window_minutes = 1440" in sql
+        assert "appointments.status IN ('pending', 'confirmed')" in sql
+        assert "appointments.date > '2026-11-02 11:00:00'" in sql
+        assert "appointments.date <= '2026-11-03 09:00:00'" in sql
+        assert "appointment_reminders.appointment_id IS NULL" in sql
+
+
+class TestEnqueueBatch:
+    """Idempotencia al encolar recordatorios"""
+
+    async def test_lote_se_registra_y_encola_en_una_transaccion(self, db):
+        """
+        DADO un lote de citas sin recordatorio
+        CUANDO se encola
+        ENTONCES se registra, se encolan las notificaciones y se hace un solo commit
+        """
+        service = ReminderService(db)
+        service.notification_service = AsyncMock()
+
+        enqueued = await service.enqueue_batch(120, [(1, 10), (2, 11)])
+
+        assert enqueued == 2
+        db.execute.assert_awaited_once()
+        service.notification_service.enqueue_many.assert_awaited_once_with([(1, 10), (2, 11)], "recordatorio")
+        db.commit.assert_awaited_once()
+
+    async def test_duplicados_se_saltan_fila_por_fila(self, db):
+        """
+        DADO un lote donde otra instancia ya registró la segunda cita
+        CUANDO se encola
+        ENTONCES se reintenta por fila y solo se encolan las que faltaban
+        """
+        duplicate = IntegrityError("INSERT", {}, Exception("Duplicate entry"))
+        db.execute.side_effect = [duplicate, None, duplicate, None]
+        service = ReminderService(db)
+        service.notification_service = AsyncMock()
+
+        enqueued = await service.enqueue_batch(120, [(1, 10), (2, 11), (3, 12)])
+
+        assert enqueued == 2
+        assert db.rollback.await_count == 2
+        assert [c.args[0] for c in service.notification_service.enqueue_many.await_args_list] == [[(1, 10)], [(3, 12)]]
@@ -0,0 +1,84 @@
+"""
+Tests para el cache en memoria de horarios de trabajo (ScheduleCache)
+"""
+from datetime import date
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.services.schedule_cache import ScheduleCache
+
+
+def rows_result(rows):
+    result = MagicMock()
+    result.all.return_value = rows
+    return result
+
+
+@pytest.fixture
+def db():
+    session = MagicMock()
+    session.execute = AsyncMock(side_effect=lambda query: rows_result([]))
+    return session
+
+
+class TestScheduleCache:
+    """Los horarios se cargan una vez y se recargan solo al invalidar o expirar"""
+
+    async def test_carga_una_vez_y_luego_responde_de_memoria(self, db):
+        """
+        DADO un cache vacío
+        CUANDO se consultan los horarios varias veces
+        ENTONCES solo la primera hace las dos consultas de carga
+        """
+        cache = ScheduleCache(ttl=300)
+
+        first = await cache.get(db)
+        second = await cache.get(db)
+
+        assert first is second
+        assert db.execute.await_count == 2
+        assert cache.loads == 1
+
+    async def test_invalidar_y_expirar_recargan(self, db):
+        """
+        DADO horarios ya cargados
+        CUANDO se invalida el cache y luego pasa el TTL
+        ENTONCES cada vez se vuelven a cargar
+        """
+        now = [0.0]
+        cache = ScheduleCache(ttl=300, clock=lambda: now[0])
+        await cache.get(db)
+
+        cache.invalidate()
+        await cache.get(db)
+        now[0] = 301
+        await cache.get(db)
+
+        assert cache.loads == 3
+
+    async def test_carga_invalidada_a_mitad_no_se_guarda(self, db):
+        """
+        DADO una carga en curso
+        CUANDO se invalida el cache antes de que termine
+        ENTONCES se usa ese resultado pero no queda guardado
+        """
+        cache = ScheduleCache(ttl=300)
+        overrides = [MagicMock(stylist_id=None, day=date(2030, 1, 14), start_time=None, end_time=None)]
+
+        calls = []
+
+        async def execute(query):
+            calls.append(query)
+            if len(calls) == 2:
+                cache.invalidate()  # un admin cambia los horarios mientras se cargan
+                return rows_result(overrides)
+            return rows_result([])
+
+        db.execute.side_effect = execute
+
+        schedules = await cache.get(db)
+        await cache.get(db)
+
+        assert schedules.windows(5, date(2030, 1, 14)) == []
+        assert cache.loads == 2
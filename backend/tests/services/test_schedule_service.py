@@ -0,0 +1,79 @@
+"""
+Tests para la administración de horarios de trabajo (ScheduleService)
+"""
+from datetime import date, time
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from sqlalchemy import UniqueConstraint
+from sqlalchemy.dialects import mysql
+
+from app.models.schedule_override import ScheduleOverride
+from app.models.stylist_schedule import StylistSchedule
+from app.schemas.schedule import ScheduleOverrideSet, StylistScheduleSet
+from app.services.schedule_service import ScheduleService
+
+
+def compiled(query) -> str:
+    return str(query.compile(dialect=mysql.dialect(), compile_kwargs={"literal_binds": True}))
+
+
+@pytest.fixture
+def db():
+    session = MagicMock()
+    session.commit = AsyncMock()
+    session.execute = AsyncMock()
+    return session
+
+
+class TestHorarioDelSalon:
+    """Las filas del salón (stylist_id NULL) también son únicas por día"""
+
+    def test_la_clave_unica_usa_owner_id(self):
+        """
+        DADO los modelos de horarios y excepciones
+        CUANDO se revisan sus restricciones únicas
+        ENTONCES cubren owner_id (0 para el salón) y no stylist_id, que admite NULL
+        """
+        for model, day_column in ((StylistSchedule, "weekday"), (ScheduleOverride, "day")):
+            uniques = [c for c in model.__table__.constraints if isinstance(c, UniqueConstraint)]
+            assert [[col.name for col in c.columns] for c in uniques] == [["owner_id", day_column]]
+
+    async def test_horario_del_salon_es_un_upsert(self, db):
+        """
+        DADO un horario general del salón para los lunes
+        CUANDO se guarda
+        ENTONCES se escribe con un solo INSERT ... ON DUPLICATE KEY UPDATE y se relee por owner_id = 0
+        """
+        saved = StylistSchedule(id=1, stylist_id=None, weekday=0, start_time=time(9), end_time=time(18))
+        result = MagicMock()
+        result.scalar_one.return_value = saved
+        db.execute.side_effect = [MagicMock(), result]
+
+        schedule = await ScheduleService(db).set_schedule(
+            StylistScheduleSet(weekday=0, start_time=time(9), end_time=time(18))
+        )
+
+        upsert, reread = (call.args[0] for call in db.execute.await_args_list)
+        assert "ON DUPLICATE KEY UPDATE" in compiled(upsert)
+        assert "stylist_schedules.owner_id = 0" in compiled(reread)
+        db.commit.assert_awaited_once()
+        assert schedule is saved
+
+    async def test_feriado_del_salon_es_un_upsert(self, db):
+        """
+        DADO un feriado de todo el salón
+        CUANDO se guarda dos veces
+        ENTONCES cada vez es un upsert sobre (owner_id, day), sin leer antes
+        """
+        holiday = ScheduleOverrideSet(day=date(2030, 1, 1), reason="Año nuevo")
+        result = MagicMock()
+        result.scalar_one.return_value = ScheduleOverride(id=1, day=date(2030, 1, 1))
+        db.execute.return_value = result
+
+        await ScheduleService(db).set_override(holiday)
+        await ScheduleService(db).set_override(holiday)
+
+        writes = [compiled(call.args[0]) for call in db.execute.await_args_list[::2]]
+        assert all("ON DUPLICATE KEY UPDATE" in sql for sql in writes)
+        assert "schedule_overrides.owner_id = 0" in compiled(db.execute.await_args_list[1].args[0])
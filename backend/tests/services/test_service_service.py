@@ -0,0 +1,61 @@
+"""
+Tests para la actualización de servicios (ServiceService)
+"""
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from sqlalchemy.dialects import mysql
+
+from app.models.service import Service
+from app.schemas.service import ServiceUpdate
+from app.services.service_service import ServiceService
+
+
+@pytest.fixture
+def db():
+    session = MagicMock()
+    session.commit = AsyncMock()
+    session.refresh = AsyncMock()
+    session.execute = AsyncMock()
+    return session
+
+
+def service_result(service):
+    result = MagicMock()
+    result.scalar_one_or_none.return_value = service
+    return result
+
+
+class TestCambioDeDuracion:
+    """end_time de las citas agendadas sigue a la duración del servicio"""
+
+    async def test_recalcula_el_fin_de_las_citas_futuras(self, db):
+        """
+        DADO un servicio de 30 minutos con citas agendadas
+        CUANDO su duración pasa a 45 minutos
+        ENTONCES en la misma transacción se recalcula end_time de sus citas activas futuras
+        """
+        db.execute.side_effect = [service_result(Service(id=7, name="Corte", duration_min=30)), MagicMock()]
+
+        service = await ServiceService(db).update_service(7, ServiceUpdate(duration_min=45))
+
+        assert service.duration_min == 45
+        assert db.execute.await_count == 2
+        sql = str(db.execute.await_args_list[1].args[0].compile(dialect=mysql.dialect()))
+        assert sql.startswith("UPDATE appointments SET end_time=timestampadd(MINUTE")
+        assert "appointments.status IN" in sql
+        assert "appointments.date >=" in sql
+        db.commit.assert_awaited_once()
+
+    async def test_sin_cambio_de_duracion_no_toca_las_citas(self, db):
+        """
+        DADO un servicio con citas agendadas
+        CUANDO solo cambia su precio
+        ENTONCES no se actualiza ninguna cita
+        """
+        db.execute.side_effect = [service_result(Service(id=7, name="Corte", duration_min=30, price=50))]
+
+        await ServiceService(db).update_service(7, ServiceUpdate(price=60))
+
+        assert db.execute.await_count == 1
+        db.commit.assert_awaited_once()
@@ -0,0 +1,251 @@
+"""
+Tests para el pool de conexiones SMTP contra un servidor SMTP local de prueba
+"""
+import smtplib
+import socketserver
+import threading
+from email.mime.text import MIMEText
+
+import pytest
+
+from app.services.smtp_pool import SMTPConnectionPool
+
+
+class FakeSMTPHandler(socketserver.StreamRequestHandler):
+    """Implementa lo mínimo del protocolo SMTP que usa smtplib"""
+
+    def reply(self, line: str):
+        self.wfile.write(line.encode() + b"\r\n")
+
+    def handle(self):
+        server = self.server
+        with server.lock:
+            server.connections += 1
+        if server.refuse_connections:
+            return
+        self.reply("220 localhost ESMTP")
+        in_data = False
+        served = 0
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            if in_data:
+                if line == b".\r\n":
+                    in_data = False
+                    served += 1
+                    with server.lock:
+                        server.messages += 1
+                    self.reply("250 OK")
+                    # Simula un servidor que corta la conexión tras N mensajes
+                    if server.drop_after and served >= server.drop_after:
+                        return
+                continue
+            command = line[:4].upper()
+            if command == b"EHLO":
+                self.wfile.write(b"250-localhost\r\n250 AUTH PLAIN LOGIN\r\n")
+            elif command == b"AUTH":
+                if server.reject_logins:
+                    self.reply("535 Authentication failed")
+                    continue
+                with server.lock:
+                    server.logins += 1
+                self.reply("235 Authentication successful")
+            elif command == b"DATA":
+                in_data = True
+                self.reply("354 End data with <CR><LF>.<CR><LF>")
+            elif command == b"QUIT":
+                self.reply("221 Bye")
+                return
+            else:
+                self.reply("250 OK")
+
+
+class FakeSMTPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), FakeSMTPHandler)
+        self.lock = threading.Lock()
+        self.connections = 0
+        self.logins = 0
+        self.messages = 0
+        self.drop_after = 0
+        self.refuse_connections = False
+        self.reject_logins = False
+
+
+@pytest.fixture
+def smtp_server():
+    server = FakeSMTPServer()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def make_pool(server, **kwargs) -> SMTPConnectionPool:
+    host, port = server.server_address
+    return SMTPConnectionPool(
+        host=host,
+        port=port,
+        username="salon@example.com",
+        password="secreto",
+        starttls=False,
+        timeout=5,
+        **kwargs
+    )
+
+
+def make_message(to_email: str) -> MIMEText:
+    msg = MIMEText("Cuerpo")
+    msg["From"] = "salon@example.com"
+    msg["To"] = to_email
+    msg["Subject"] = "Asunto"
+    return msg
+
+
+class TestReutilizacion:
+    """Los mensajes consecutivos comparten la conexión autenticada"""
+
+    def test_mensajes_consecutivos_usan_una_sola_conexion(self, smtp_server):
+        """
+        DADO un pool sin conexiones abiertas
+        CUANDO se envían 5 correos seguidos
+        ENTONCES se abre y autentica una sola conexión
+        """
+        pool = make_pool(smtp_server)
+
+        for i in range(5):
+            pool.send_message(make_message(f"c{i}@example.com"))
+
+        metrics = pool.metrics()
+        assert smtp_server.messages == 5
+        assert smtp_server.connections == 1
+        assert smtp_server.logins == 1
+        assert metrics["connections_open"] == 1
+        assert metrics["connections_idle"] == 1
+        assert metrics["messages_per_connection"] == 5
+        assert metrics["avg_handshake_ms"] > 0
+        pool.close_all()
+
+    def test_conexion_reservada_envia_varios_mensajes(self, smtp_server):
+        """
+        DADO una conexión reservada con connection()
+        CUANDO se envían varios mensajes por ella
+        ENTONCES al salir vuelve al pool para reutilizarse
+        """
+        pool = make_pool(smtp_server)
+
+        with pool.connection() as conn:
+            for i in range(3):
+                pool.send_on(conn, make_message(f"c{i}@example.com"))
+            assert pool.metrics()["connections_in_use"] == 1
+        pool.send_message(make_message("otro@example.com"))
+
+        assert smtp_server.messages == 4
+        assert smtp_server.connections == 1
+        assert pool.metrics()["connections_in_use"] == 0
+        pool.close_all()
+
+    def test_no_supera_el_tamano_maximo(self, smtp_server):
+        """
+        DADO un pool de 2 conexiones
+        CUANDO 6 hilos envían correos a la vez
+        ENTONCES nunca se abren más de 2 conexiones
+        """
+        pool = make_pool(smtp_server, max_size=2)
+        threads = [
+            threading.Thread(target=pool.send_message, args=(make_message(f"c{i}@example.com"),))
+            for i in range(6)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert smtp_server.messages == 6
+        assert smtp_server.connections <= 2
+        assert pool.metrics()["connections_open"] <= 2
+        pool.close_all()
+
+
+class TestReconexion:
+    """Conexiones cortadas o vencidas se reemplazan"""
+
+    def test_reconecta_si_el_servidor_corta_la_conexion(self, smtp_server):
+        """
+        DADO un servidor que cierra la conexión tras 2 mensajes
+        CUANDO se envían 4 correos
+        ENTONCES todos se entregan reconectando una vez
+        """
+        smtp_server.drop_after = 2
+        pool = make_pool(smtp_server)
+
+        for i in range(4):
+            pool.send_message(make_message(f"c{i}@example.com"))
+
+        metrics = pool.metrics()
+        assert smtp_server.messages == 4
+        assert smtp_server.connections == 2
+        assert metrics["reconnects"] == 1
+        assert metrics["connections_open"] == 1
+        pool.close_all()
+
+    def test_reconexion_fallida_cuenta_un_solo_cierre(self, smtp_server):
+        """
+        DADO una conexión que el servidor cortó y un servidor que ya no acepta conexiones
+        CUANDO se envía un correo y la reconexión falla
+        ENTONCES se propaga el error y la conexión cortada se cuenta cerrada una sola vez
+        """
+        smtp_server.drop_after = 1
+        pool = make_pool(smtp_server)
+        pool.send_message(make_message("a@example.com"))
+        smtp_server.refuse_connections = True
+
+        with pytest.raises(smtplib.SMTPServerDisconnected):
+            pool.send_message(make_message("b@example.com"))
+
+        metrics = pool.metrics()
+        assert metrics["connections_open"] == 0
+        assert metrics["connections_idle"] == 0
+        assert metrics["connections_in_use"] == 0
+
+    def test_reconexion_rechazada_no_vuelve_al_pool(self, smtp_server):
+        """
+        DADO una conexión que el servidor cortó y un servidor que rechaza el login
+        CUANDO se envía un correo y la reconexión falla al autenticar
+        ENTONCES la conexión cortada no vuelve al pool y el siguiente envío abre otra
+        """
+        smtp_server.drop_after = 1
+        pool = make_pool(smtp_server)
+        pool.send_message(make_message("a@example.com"))
+        smtp_server.reject_logins = True
+
+        with pytest.raises(smtplib.SMTPAuthenticationError):
+            pool.send_message(make_message("b@example.com"))
+
+        assert pool.metrics()["connections_idle"] == 0
+        smtp_server.reject_logins = False
+        pool.send_message(make_message("c@example.com"))
+        assert smtp_server.messages == 2
+        assert pool.metrics()["connections_open"] == 1
+        pool.close_all()
+
+    def test_conexiones_inactivas_se_cierran(self, smtp_server):
+        """
+        DADO un pool con idle_timeout=0
+        CUANDO se envían 2 correos
+        ENTONCES la conexión vencida se cierra y se abre otra
+        """
+        pool = make_pool(smtp_server, idle_timeout=0)
+
+        pool.send_message(make_message("a@example.com"))
+        pool.send_message(make_message("b@example.com"))
+
+        assert smtp_server.connections == 2
+        assert pool.metrics()["connections_open"] == 1
+        pool.close_all()
+        assert pool.metrics()["connections_open"] == 0
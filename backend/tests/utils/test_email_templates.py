@@ -0,0 +1,98 @@
+"""
+Tests para las plantillas de correo precompiladas (app.utils.email_templates)
+"""
+import locale
+from datetime import datetime
+
+from app.utils import email_templates
+from app.utils.email_templates import (
+    format_appointment_date,
+    generate_appointment_email_html,
+    generate_appointment_email_text,
+)
+
+APPOINTMENT = {
+    "service_name": "Corte & Peinado",
+    "stylist_name": "Luis",
+    "date": datetime(2026, 3, 5, 15, 30),
+}
+
+
+class TestFormatoDeFecha:
+    """Fechas en español sin depender del locale"""
+
+    def test_mes_en_espanol_con_locale_c(self):
+        """
+        DADO un proceso con locale "C"
+        CUANDO se formatea la fecha de una cita
+        ENTONCES el mes sale en español y la hora en formato 12h
+        """
+        locale.setlocale(locale.LC_TIME, "C")
+
+        assert format_appointment_date(APPOINTMENT["date"]) == ("05 de marzo de 2026", "03:30 PM")
+        assert format_appointment_date("2026-12-01T00:05:00Z") == ("01 de diciembre de 2026", "12:05 AM")
+
+    def test_fecha_invalida_se_muestra_tal_cual(self):
+        """
+        DADO una fecha que no se puede interpretar
+        CUANDO se formatea
+        ENTONCES se muestra el texto original y sin hora
+        """
+        assert format_appointment_date("mañana") == ("mañana", "")
+
+
+class TestRender:
+    """Render HTML y texto plano desde los esqueletos precompilados"""
+
+    def test_html_escapa_los_valores(self):
+        """
+        DADO un nombre y un servicio con caracteres especiales de HTML
+        CUANDO se genera el HTML
+        ENTONCES los valores quedan escapados y el resto de la plantilla intacto
+        """
+        html = generate_appointment_email_html("<Ana>", "confirmado", APPOINTMENT)
+
+        assert "¡Hola &lt;Ana&gt;!" in html
+        assert "Corte &amp; Peinado" in html
+        assert "05 de marzo de 2026" in html
+        assert "<title>Cita Confirmada</title>" in html
+        assert "{" not in html
+
+    def test_texto_plano_desde_la_misma_fuente(self):
+        """
+        DADO una cita cancelada
+        CUANDO se genera el texto plano
+        ENTONCES incluye el mensaje del tipo y los detalles sin escapar
+        """
+        text = generate_appointment_email_text("Ana", "cancelado", APPOINTMENT)
+
+        assert text.startswith("¡Hola Ana!")
+        assert "Lamentamos informarte" in text
+        assert "- Servicio: Corte & Peinado" in text
+        assert "- Hora: 03:30 PM" in text
+
+    def test_tipo_desconocido_usa_reservado_con_mensaje_generico(self):
+        """
+        DADO un tipo de notificación desconocido
+        CUANDO se genera el HTML
+        ENTONCES usa el estilo de "reservado" con el mensaje adicional genérico
+        """
+        html = generate_appointment_email_html("Ana", "otro", APPOINTMENT)
+
+        assert "Cita Reservada" in html
+        assert "no dudes en contactarnos" in html
+
+    def test_render_cacheado_solo_cambia_el_nombre(self):
+        """
+        DADO dos destinatarios de la misma cita
+        CUANDO se generan sus correos
+        ENTONCES el segundo reutiliza el render cacheado y solo cambia el nombre
+        """
+        email_templates._render_tail.cache_clear()
+
+        first = generate_appointment_email_html("Ana", "recordatorio", APPOINTMENT)
+        second = generate_appointment_email_html("Bea", "recordatorio", APPOINTMENT)
+
+        info = email_templates._render_tail.cache_info()
+        assert (info.hits, info.misses) == (1, 1)
+        assert first.replace("Ana", "Bea") == second
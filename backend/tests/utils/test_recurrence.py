@@ -0,0 +1,82 @@
+"""
+Tests para la expansión de reglas de recurrencia (app.utils.recurrence)
+"""
+from datetime import datetime
+
+import pytest
+
+from app.utils.recurrence import expand_occurrences
+
+# Lunes
+START = datetime(2026, 11, 2, 10, 30)
+
+
+class TestExpandOccurrences:
+    """Reglas FREQ/INTERVAL/BYDAY/COUNT/UNTIL"""
+
+    def test_cada_dos_semanas_con_count(self):
+        """
+        DADO una serie semanal cada 2 semanas con 3 citas
+        CUANDO se expande
+        ENTONCES las fechas están separadas 14 días y conservan la hora
+        """
+        occurrences = expand_occurrences(START, "weekly", interval=2, count=3)
+
+        assert occurrences == [
+            datetime(2026, 11, 2, 10, 30),
+            datetime(2026, 11, 16, 10, 30),
+            datetime(2026, 11, 30, 10, 30),
+        ]
+
+    def test_varios_dias_hasta_until_inclusivo(self):
+        """
+        DADO una serie semanal lunes y jueves hasta el lunes siguiente
+        CUANDO se expande
+        ENTONCES incluye el jueves intermedio y el until
+        """
+        occurrences = expand_occurrences(
+            START, "weekly", weekdays=[3, 0], until=datetime(2026, 11, 9, 10, 30)
+        )
+
+        assert [o.day for o in occurrences] == [2, 5, 9]
+
+    def test_dias_anteriores_al_inicio_no_cuentan(self):
+        """
+        DADO una serie que empieza un jueves con días lunes y jueves
+        CUANDO se expande
+        ENTONCES el lunes de esa misma semana (anterior al inicio) no se incluye
+        """
+        occurrences = expand_occurrences(datetime(2026, 11, 5, 9), "weekly", weekdays=[0, 3], count=2)
+
+        assert [o.day for o in occurrences] == [5, 9]
+
+    @pytest.mark.parametrize("kwargs", [
+        {"frequency": "monthly", "count": 2},
+        {"frequency": "daily"},
+        {"frequency": "daily", "until": datetime(2030, 1, 1)},
+        {"frequency": "weekly", "count": 2, "weekdays": [7]},
+    ])
+    def test_reglas_invalidas(self, kwargs):
+        """
+        DADO una regla inválida, sin fin o con demasiadas ocurrencias
+        CUANDO se expande
+        ENTONCES se lanza ValueError
+        """
+        with pytest.raises(ValueError):
+            expand_occurrences(START, **kwargs)
+
+    @pytest.mark.parametrize("kwargs", [
+        {"until": datetime(2026, 11, 1, 10, 30)},
+        # Empieza miércoles, solo lunes, hasta el jueves de esa semana
+        {"weekdays": [0], "until": datetime(2026, 11, 5, 10, 30), "start": datetime(2026, 11, 4, 10, 30)},
+    ])
+    def test_regla_sin_ocurrencias(self, kwargs):
+        """
+        DADO un until anterior al inicio o días de la semana que no caen antes del until
+        CUANDO se expande
+        ENTONCES se lanza ValueError en lugar de retornar una lista vacía
+        """
+        start = kwargs.pop("start", START)
+
+        with pytest.raises(ValueError, match="no genera ninguna cita"):
+            expand_occurrences(start, "weekly", **kwargs)
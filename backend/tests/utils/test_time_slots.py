@@ -0,0 +1,227 @@
+"""
+Tests para el motor de intervalos de disponibilidad (app.utils.time_slots)
+"""
+from datetime import date, datetime, timedelta, timezone
+
+from app.utils.time_slots import (
+    BusyIntervals,
+    build_busy_index,
+    business_window,
+    first_fit,
+    fit_mask,
+    mask_to_bits,
+    occupancy_mask,
+    stylist_openings,
+    to_naive_utc,
+)
+
+DAY = date(2030, 1, 15)
+HOUR = timedelta(hours=1)
+QUARTER = timedelta(minutes=15)
+
+
+def at(hour: int, minute: int = 0) -> datetime:
+    return datetime(DAY.year, DAY.month, DAY.day, hour, minute)
+
+
+class TestBusyIntervals:
+    """Construcción y consultas del índice de intervalos ocupados"""
+
+    def test_fusiona_intervalos_traslapados_y_contiguos(self):
+        """
+        DADO intervalos desordenados, traslapados y contiguos
+        CUANDO construyo el índice
+        ENTONCES quedan fusionados y ordenados
+        """
+        intervals = BusyIntervals([
+            (at(13), at(14)),
+            (at(9), at(10)),
+            (at(9, 30), at(11)),
+            (at(11), at(12)),
+        ])
+
+        assert list(intervals) == [(at(9), at(12)), (at(13), at(14))]
+
+    def test_overlaps_usa_intervalos_semiabiertos(self):
+        """
+        DADO una cita de 10:00 a 11:00
+        CUANDO consulto rangos que solo se tocan en el borde
+        ENTONCES no se consideran traslapes
+        """
+        intervals = BusyIntervals([(at(10), at(11))])
+
+        assert intervals.overlaps(at(9), at(10)) is False
+        assert intervals.overlaps(at(11), at(12)) is False
+        assert intervals.overlaps(at(10, 59), at(11, 30)) is True
+        assert intervals.overlaps(at(9), at(13)) is True
+
+    def test_add_fusiona_con_vecinos(self):
+        """
+        DADO dos intervalos separados
+        CUANDO agrego uno que los une
+        ENTONCES queda un único intervalo
+        """
+        intervals = BusyIntervals([(at(9), at(10)), (at(11), at(12))])
+
+        intervals.add(at(10), at(11))
+
+        assert list(intervals) == [(at(9), at(12))]
+
+    def test_free_slots_respeta_la_duracion_del_servicio(self):
+        """
+        DADO una cita de 10:00 a 11:30
+        CUANDO busco slots de 15 min para un servicio de 90 min
+        ENTONCES ningún slot se traslapa y el primero luego de la cita es 11:30
+        """
+        intervals = BusyIntervals([(at(10), at(11, 30))])
+        start, end = business_window(DAY)
+
+        slots = intervals.free_slots(start, end, timedelta(minutes=90), QUARTER)
+
+        assert at(8, 30) in slots
+        assert at(8, 45) not in slots
+        assert at(11, 30) in slots
+        assert slots[-1] == at(18, 30)
+        assert all(not intervals.overlaps(s, s + timedelta(minutes=90)) for s in slots)
+
+    def test_free_slots_sin_citas_devuelve_toda_la_grilla(self):
+        start, end = business_window(DAY)
+
+        slots = BusyIntervals().free_slots(start, end, HOUR, HOUR)
+
+        assert [s.hour for s in slots] == list(range(8, 20))
+
+
+class TestBitsets:
+    """Ocupación vectorizada por bitsets para rangos de días"""
+
+    def test_occupancy_mask_marca_slots_tocados(self):
+        """
+        DADO una cita de 9:15 a 10:00 y slots de 30 min desde las 8:00
+        CUANDO calculo la ocupación
+        ENTONCES se marcan los slots 9:00 y 9:30
+        """
+        intervals = BusyIntervals([(at(9, 15), at(10))])
+
+        mask = occupancy_mask(intervals, at(8), timedelta(minutes=30), 24)
+
+        assert mask_to_bits(mask, 24).startswith("001100")
+
+    def test_occupancy_mask_ignora_citas_fuera_de_la_ventana(self):
+        intervals = BusyIntervals([(at(6), at(7)), (at(19, 30), at(21))])
+
+        mask = occupancy_mask(intervals, at(8), HOUR, 12)
+
+        assert mask_to_bits(mask, 12) == "000000000001"
+
+    def test_fit_mask_exige_slots_consecutivos_libres(self):
+        """
+        DADO slots 0..5 con el slot 3 ocupado
+        CUANDO busco inicios para un servicio de 2 slots
+        ENTONCES solo pueden iniciar 0, 1 y 4
+        """
+        busy = 0b001000
+
+        fits = fit_mask(busy, 6, 2)
+
+        assert mask_to_bits(fits, 6) == "110010"
+
+    def test_fit_mask_coincide_con_free_slots(self):
+        intervals = BusyIntervals([(at(10), at(11, 30)), (at(15, 15), at(16))])
+        start, end = business_window(DAY)
+        step = timedelta(minutes=30)
+
+        bits = mask_to_bits(fit_mask(occupancy_mask(intervals, start, step, 24), 24, 2), 24)
+        slots = intervals.free_slots(start, end, HOUR, step)
+
+        assert [start + step * i for i, bit in enumerate(bits) if bit == "1"] == slots
+
+
+def test_build_busy_index_agrupa_por_estilista():
+    index = build_busy_index([
+        (1, at(9), at(10)),
+        (2, at(9), at(10)),
+        (1, at(9, 30), at(10, 30)),
+    ])
+
+    assert list(index[1]) == [(at(9), at(10, 30))]
+    assert list(index[2]) == [(at(9), at(10))]
+
+
+def test_to_naive_utc_convierte_fechas_con_zona_horaria():
+    lima = timezone(timedelta(hours=-5))
+
+    assert to_naive_utc(datetime(2030, 1, 15, 9, tzinfo=lima)) == at(14)
+    assert to_naive_utc(at(9)) == at(9)
+
+
+class TestFirstFit:
+    """Búsqueda de los huecos más tempranos entre estilistas"""
+
+    def test_mezcla_los_huecos_de_todos_los_estilistas_en_orden(self):
+        """
+        DADO un estilista ocupado toda la mañana y otro libre desde las 9:00
+        CUANDO se buscan los 3 primeros huecos de 1 hora desde las 8:10
+        ENTONCES se intercalan por hora de inicio, alineados a la grilla
+        """
+        busy = build_busy_index([
+            (1, at(8), at(12)),
+            (2, at(8), at(9)),
+            (2, at(10), at(11)),
+        ])
+
+        openings = first_fit(busy, [1, 2], [DAY], HOUR, QUARTER, at(8, 10), limit=3)
+
+        assert openings == [(at(9), 2), (at(11), 2), (at(11, 15), 2)]
+
+    def test_sigue_al_dia_siguiente_si_hoy_no_hay_lugar(self):
+        """
+        DADO un estilista sin huecos el resto del día
+        CUANDO se pide su próximo hueco
+        ENTONCES es la apertura del día siguiente
+        """
+        busy = BusyIntervals([(at(8), at(20))])
+        tomorrow = DAY + timedelta(days=1)
+
+        opening = next(stylist_openings(busy, [DAY, tomorrow], HOUR, QUARTER, at(15)))
+
+        assert opening == business_window(tomorrow)[0]
+
+    def test_sin_estilistas_no_hay_huecos(self):
+        """
+        DADO ningún estilista que cumpla el filtro
+        CUANDO se buscan huecos
+        ENTONCES el resultado está vacío
+        """
+        assert first_fit({}, [], [DAY], HOUR, QUARTER, at(8), limit=5) == []
+
+
+class TestVentanasDeTrabajo:
+    """Huecos restringidos a las ventanas de trabajo de cada estilista"""
+
+    def test_first_fit_etiqueta_cada_hueco_con_su_estilista(self):
+        """
+        DADO dos estilistas, el 1 libre desde las 8:00 y el 2 desde las 9:00
+        CUANDO se buscan los primeros huecos
+        ENTONCES cada hueco lleva el id del estilista que lo tiene
+        """
+        busy = build_busy_index([(2, at(8), at(9))])
+
+        openings = first_fit(busy, [1, 2], [DAY], HOUR, HOUR, at(8), limit=3)
+
+        assert openings == [(at(8), 1), (at(9), 1), (at(9), 2)]
+
+    def test_no_ofrece_huecos_que_crucen_el_descanso(self):
+        """
+        DADO un estilista que trabaja de 9:00 a 13:00 y de 14:00 a 18:00
+        CUANDO se buscan huecos de 1 hora desde las 12:15
+        ENTONCES el siguiente es a las 14:00, inicio del segundo tramo
+        """
+        windows = {1: [(at(9), at(13)), (at(14), at(18))]}
+
+        openings = first_fit(
+            {}, [1], [DAY], HOUR, QUARTER, at(12, 15), limit=2,
+            stylist_windows=lambda stylist_id, day: windows[stylist_id]
+        )
+
+        assert openings == [(at(14), 1), (at(14, 15), 1)]
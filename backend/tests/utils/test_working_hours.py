@@ -0,0 +1,110 @@
+"""
+Tests para los horarios de trabajo en memoria (app.utils.working_hours)
+"""
+from datetime import date, datetime, time, timedelta
+from types import SimpleNamespace
+
+from app.utils.working_hours import WorkingSchedules
+
+MONDAY = date(2030, 1, 14)
+TUESDAY = MONDAY + timedelta(days=1)
+
+
+def at(day: date, hour: int, minute: int = 0) -> datetime:
+    return datetime.combine(day, time(hour, minute))
+
+
+def weekly(stylist_id, weekday, start, end, break_start=None, break_end=None):
+    return SimpleNamespace(
+        stylist_id=stylist_id, weekday=weekday, start_time=start, end_time=end,
+        break_start=break_start, break_end=break_end
+    )
+
+
+def override(stylist_id, day, start=None, end=None):
+    return SimpleNamespace(stylist_id=stylist_id, day=day, start_time=start, end_time=end)
+
+
+class TestResolucion:
+    """Qué horario aplica a cada estilista y día"""
+
+    def test_sin_configuracion_usa_el_horario_del_salon(self):
+        """
+        DADO ningún horario configurado
+        CUANDO se consulta cualquier estilista
+        ENTONCES trabaja de 8:00 a 20:00
+        """
+        assert WorkingSchedules().windows(5, MONDAY) == [(at(MONDAY, 8), at(MONDAY, 20))]
+
+    def test_descanso_parte_el_dia_en_dos_tramos(self):
+        """
+        DADO un estilista de 9:00 a 18:00 con descanso de 13:00 a 14:00 los lunes
+        CUANDO se consultan sus ventanas del lunes y del martes
+        ENTONCES el lunes tiene dos tramos y el martes no trabaja
+        """
+        schedules = WorkingSchedules.from_rows(
+            [weekly(5, 0, time(9), time(18), time(13), time(14))], []
+        )
+
+        assert schedules.windows(5, MONDAY) == [
+            (at(MONDAY, 9), at(MONDAY, 13)),
+            (at(MONDAY, 14), at(MONDAY, 18)),
+        ]
+        assert schedules.windows(5, TUESDAY) == []
+        assert schedules.describe(5, TUESDAY) == "no atiende ese día"
+
+    def test_feriado_del_salon_gana_al_horario_semanal(self):
+        """
+        DADO un feriado del salón y un turno especial de otro estilista ese día
+        CUANDO se consultan ambos estilistas
+        ENTONCES el del turno especial trabaja y el resto no
+        """
+        schedules = WorkingSchedules.from_rows(
+            [weekly(5, 0, time(9), time(18))],
+            [override(None, MONDAY), override(6, MONDAY, time(10), time(14))]
+        )
+
+        assert schedules.windows(5, MONDAY) == []
+        assert schedules.windows(6, MONDAY) == [(at(MONDAY, 10), at(MONDAY, 14))]
+        assert schedules.windows(None, MONDAY) == []
+
+    def test_estilista_sin_horario_hereda_el_del_salon(self):
+        """
+        DADO un horario semanal del salón
+        CUANDO se consulta un estilista sin horario propio
+        ENTONCES usa el del salón
+        """
+        schedules = WorkingSchedules.from_rows([weekly(None, 0, time(10), time(16))], [])
+
+        assert schedules.windows(7, MONDAY) == [(at(MONDAY, 10), at(MONDAY, 16))]
+
+
+class TestValidacion:
+    """Reglas que usan la validación y la matriz de disponibilidad"""
+
+    schedules = WorkingSchedules.from_rows([weekly(5, 0, time(9), time(18), time(13), time(14))], [])
+
+    def test_la_cita_debe_caber_completa_en_un_tramo(self):
+        """
+        DADO un descanso de 13:00 a 14:00
+        CUANDO se valida una cita que lo atraviesa y otra justo después
+        ENTONCES solo la segunda cabe
+        """
+        assert self.schedules.is_working(5, at(MONDAY, 12, 30))
+        assert not self.schedules.fits(5, at(MONDAY, 12, 30), at(MONDAY, 13, 30))
+        assert self.schedules.fits(5, at(MONDAY, 14), at(MONDAY, 18))
+
+    def test_horas_libres_y_grilla_comun(self):
+        """
+        DADO un estilista con descanso y otro con el horario por defecto
+        CUANDO se piden sus horas no laborables y la grilla común
+        ENTONCES cubren el resto del día y la grilla va de 8:00 a 20:00
+        """
+        off = list(self.schedules.off_hours(5, MONDAY))
+
+        assert off == [
+            (at(MONDAY, 0), at(MONDAY, 9)),
+            (at(MONDAY, 13), at(MONDAY, 14)),
+            (at(MONDAY, 18), at(TUESDAY, 0)),
+        ]
+        assert self.schedules.bounds([5, None], [MONDAY]) == (time(8), time(20))
@@ -0,0 +1,18 @@
+const LoadMoreButton = ({ hasMore, loading, onClick }) => {
+  if (!hasMore) return null;
+
+  return (
+    <div className="text-center mt-6">
+      <button
+        type="button"
+        onClick={onClick}
+        disabled={loading}
+        className="cursor-pointer px-6 py-2 border border-pink-600 text-pink-600 rounded-lg hover:bg-pink-50 transition-colors duration-200 disabled:opacity-50"
+      >
+        {loading ? 'Cargando...' : 'Cargar más'}
+      </button>
+    </div>
+  );
+};
+
+export default LoadMoreButton;
@@ -0,0 +1,64 @@
+import { useCallback, useEffect, useRef, useState } from "react";
+
+/**
+ * Listado de citas paginado por cursor.
+ *
+ * Carga la primera página al montar y cada vez que cambian los filtros;
+ * las siguientes se piden bajo demanda con loadMore y se agregan al final.
+ *
+ * @param {Function} fetchPage - (filters, cursor) => Promise<{ appointments, nextCursor }>
+ * @param {Object} filters - Filtros que aplica el servidor (status, date_from, date_to...)
+ *
+ * @example
+ * const { appointments, hasMore, loadMore } = useAppointmentPages(
+ *   appointmentService.getMyAppointments,
+ *   { status: 'pending' }
+ * );
+ */
+export const useAppointmentPages = (fetchPage, filters = {}) => {
+  const [appointments, setAppointments] = useState([]);
+  const [nextCursor, setNextCursor] = useState(null);
+  const [loading, setLoading] = useState(true);
+  const [error, setError] = useState('');
+  // Evita que la respuesta de unos filtros anteriores pise la de los actuales
+  const requestRef = useRef(0);
+  const filtersKey = JSON.stringify(filters);
+
+  const load = useCallback(async (cursor) => {
+    const request = ++requestRef.current;
+    setLoading(true);
+    setError('');
+
+    try {
+      const page = await fetchPage(JSON.parse(filtersKey), cursor);
+      if (request !== requestRef.current) return;
+      setAppointments(prev => (cursor ? [...prev, ...page.appointments] : page.appointments));
+      setNextCursor(page.nextCursor);
+    } catch (err) {
+      if (request !== requestRef.current) return;
+      console.error('Error al cargar citas:', err);
+      setError(err.response?.data?.detail || 'No se pudieron cargar las citas');
+    } finally {
+      if (request === requestRef.current) setLoading(false);
+    }
+  }, [fetchPage, filtersKey]);
+
+  useEffect(() => {
+    load(null);
+  }, [load]);
+
+  const loadMore = useCallback(() => {
+    if (nextCursor) load(nextCursor);
+  }, [load, nextCursor]);
+
+  const reload = useCallback(() => load(null), [load]);
+
+  return {
+    appointments,
+    loading,
+    error,
+    hasMore: nextCursor !== null,
+    loadMore,
+    reload,
+  };
+};
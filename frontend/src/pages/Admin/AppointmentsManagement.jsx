@@ -1,64 +1,55 @@
-import React, { useState, useEffect } from 'react';
+import React, { useState, useEffect, useMemo } from 'react';
 import { Calendar, Clock, User, Scissors, Search, Eye, CheckCircle, XCircle, Filter } from 'lucide-react';
 import appointmentService from '../../services/appointmentService';
+import { useAppointmentPages } from '../../hooks/useAppointmentPages';
+import LoadMoreButton from '../../components/LoadMoreButton';
 
 const AppointmentsManagement = () => {
-  const [appointments, setAppointments] = useState([]);
-  const [filteredAppointments, setFilteredAppointments] = useState([]);
-  const [loading, setLoading] = useState(false);
-  const [error, setError] = useState('');
   const [searchTerm, setSearchTerm] = useState('');
   const [filterStatus, setFilterStatus] = useState('all');
+  const [updating, setUpdating] = useState(false);
   const [selectedAppointment, setSelectedAppointment] = useState(null);
   const [modalType, setModalType] = useState(null);
+  // Totales por estado del dashboard (rollup), no de las páginas cargadas
+  const [stats, setStats] = useState({ total: 0, pending: 0, confirmed: 0, completed: 0, cancelled: 0 });
 
-  useEffect(() => {
-    loadAppointments();
-  }, []);
-
-  useEffect(() => {
-    filterAppointments();
-  }, [appointments, searchTerm, filterStatus]);
-
-  const loadAppointments = async () => {
-    setLoading(true);
-    setError('');
+  // El estado se filtra en el servidor; cada cambio vuelve a la primera página
+  const filters = useMemo(
+    () => (filterStatus === 'all' ? {} : { status: filterStatus }),
+    [filterStatus]
+  );
+  const { appointments, loading, error, hasMore, loadMore, reload } = useAppointmentPages(
+    appointmentService.listAllAppointments,
+    filters
+  );
 
+  const loadStats = async () => {
     try {
-      const data = await appointmentService.listAllAppointments();
-      setAppointments(data);
+      const dashboard = await appointmentService.getDashboard();
+      setStats(dashboard.appointments_stats);
     } catch (err) {
-      console.error('Error al cargar citas:', err);
-      setError('No se pudieron cargar las citas');
-    } finally {
-      setLoading(false);
+      console.error('Error al cargar estadísticas:', err);
     }
   };
 
-  const filterAppointments = () => {
-    let filtered = [...appointments];
-
-    if (filterStatus !== 'all') {
-      filtered = filtered.filter(apt => apt.status === filterStatus);
-    }
+  useEffect(() => {
+    loadStats();
+  }, []);
 
-    if (searchTerm) {
-      filtered = filtered.filter(apt =>
+  // La búsqueda por nombre se aplica sobre las citas ya cargadas (vienen de la más reciente a la más antigua)
+  const filteredAppointments = searchTerm
+    ? appointments.filter(apt =>
         apt.client_name?.toLowerCase().includes(searchTerm.toLowerCase()) ||
         apt.stylist_name?.toLowerCase().includes(searchTerm.toLowerCase()) ||
         apt.service_name?.toLowerCase().includes(searchTerm.toLowerCase())
-      );
-    }
-
-    filtered.sort((a, b) => new Date(b.date) - new Date(a.date));
-    setFilteredAppointments(filtered);
-  };
+      )
+    : appointments;
 
   const handleUpdateStatus = async (appointmentId, newStatus) => {
     try {
-      setLoading(true);
+      setUpdating(true);
       await appointmentService.updateAppointmentStatus(appointmentId, newStatus);
-      await loadAppointments();
+      await Promise.all([reload(), loadStats()]);
       setModalType(null);
       setSelectedAppointment(null);
       alert('Estado actualizado exitosamente');
@@ -66,7 +57,7 @@ const AppointmentsManagement = () => {
       console.error('Error al actualizar estado:', err);
       alert('Error: ' + (err.response?.data?.detail || err.message));
     } finally {
-      setLoading(false);
+      setUpdating(false);
     }
   };
 
@@ -107,14 +98,6 @@ const AppointmentsManagement = () => {
     return colors[status] || 'bg-gray-100 text-gray-800 border-gray-200';
   };
 
-  const stats = {
-    total: appointments.length,
-    pending: appointments.filter(a => a.status === 'pending').length,
-    confirmed: appointments.filter(a => a.status === 'confirmed').length,
-    completed: appointments.filter(a => a.status === 'completed').length,
-    cancelled: appointments.filter(a => a.status === 'cancelled').length,
-  };
-
   if (loading && appointments.length === 0) {
     return (
       <div className="flex items-center justify-center h-screen">
@@ -331,6 +314,8 @@ const AppointmentsManagement = () => {
         </div>
       )}
 
+      <LoadMoreButton hasMore={hasMore} loading={loading} onClick={loadMore} />
+
       {/* Modal Ver Detalles */}
       {modalType === 'view' && selectedAppointment && (
         <div className="fixed inset-0 bg-black bg-opacity-40 flex items-center justify-center z-50">
@@ -381,7 +366,7 @@ const AppointmentsManagement = () => {
               </button>
               <button
                 onClick={() => handleUpdateStatus(selectedAppointment.id, 'confirmed')}
-                disabled={loading}
+                disabled={updating}
                 className="bg-green-600 text-white px-4 py-2 rounded hover:bg-green-700"
               >
                 Confirmar
@@ -406,7 +391,7 @@ const AppointmentsManagement = () => {
               </button>
               <button
                 onClick={() => handleUpdateStatus(selectedAppointment.id, 'cancelled')}
-                disabled={loading}
+                disabled={updating}
                 className="bg-red-600 text-white px-4 py-2 rounded hover:bg-red-700"
               >
                 Sí, Cancelar
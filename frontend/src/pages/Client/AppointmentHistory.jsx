@@ -1,115 +1,52 @@
-import React, { useState, useEffect } from 'react';
+import React, { useState, useMemo } from 'react';
 import { Calendar, Clock, User, Scissors, Search, TrendingUp, Award, History as HistoryIcon } from 'lucide-react';
 import appointmentService from '../../services/appointmentService';
+import { useAppointmentPages } from '../../hooks/useAppointmentPages';
+import LoadMoreButton from '../../components/LoadMoreButton';
 
 const AppointmentHistory = () => {
-  const [appointments, setAppointments] = useState([]);
-  const [filteredAppointments, setFilteredAppointments] = useState([]);
-  const [loading, setLoading] = useState(true);
-  const [error, setError] = useState('');
   const [searchTerm, setSearchTerm] = useState('');
   const [filterStatus, setFilterStatus] = useState('all');
+  // Se fija al montar para que los filtros no cambien en cada render
+  const [now] = useState(() => new Date().toISOString());
 
-  // Estadísticas
-  const [stats, setStats] = useState({
-    total: 0,
-    completed: 0,
-    cancelled: 0,
-    noShow: 0,
-    favoriteService: '',
-    favoriteStylist: ''
-  });
-
-  useEffect(() => {
-    fetchAppointments();
-    // eslint-disable-next-line react-hooks/exhaustive-deps
-  }, []);
-
-  useEffect(() => {
-    filterAppointments();
-    // eslint-disable-next-line react-hooks/exhaustive-deps
-  }, [appointments, searchTerm, filterStatus]);
-
-  const fetchAppointments = async () => {
-    setLoading(true);
-    setError('');
-
-    try {
-      const data = await appointmentService.getMyAppointments();
-      
-      // Filtrar solo citas pasadas (por fecha o por status final)
-      const now = new Date();
-      const pastAppointments = data.filter(apt => {
-        const appointmentDate = new Date(apt.date);
-        return appointmentDate < now || ['completed', 'cancelled', 'no-show'].includes(apt.status);
-      });
-      
-      setAppointments(pastAppointments);
-      calculateStats(pastAppointments);
-    } catch (err) {
-      console.error('Error al obtener historial:', err);
-      setError('No se pudo cargar el historial de citas');
-    } finally {
-      setLoading(false);
-    }
-  };
-
-  const calculateStats = (appointments) => {
-    const completed = appointments.filter(a => a.status === 'completed').length;
-    const cancelled = appointments.filter(a => a.status === 'cancelled').length;
-    const noShow = appointments.filter(a => a.status === 'no-show').length;
-
-    // Servicio más usado
-    const serviceCount = {};
-    appointments.forEach(apt => {
-      const serviceName = apt.service_name || 'Desconocido';
-      serviceCount[serviceName] = (serviceCount[serviceName] || 0) + 1;
-    });
-    const favoriteService = Object.keys(serviceCount).reduce((a, b) => 
-      serviceCount[a] > serviceCount[b] ? a : b, ''
-    );
+  // "Todas" son las citas ya pasadas; los estados finales se piden sin corte de
+  // fecha para que también aparezcan, p. ej., las canceladas por adelantado
+  const filters = useMemo(
+    () => (filterStatus === 'all' ? { date_to: now } : { status: filterStatus }),
+    [filterStatus, now]
+  );
+  const { appointments, loading, error, hasMore, loadMore } = useAppointmentPages(
+    appointmentService.getMyAppointments,
+    filters
+  );
 
-    // Estilista favorito
-    const stylistCount = {};
-    appointments.forEach(apt => {
-      const stylistName = apt.stylist_name || 'Desconocido';
-      stylistCount[stylistName] = (stylistCount[stylistName] || 0) + 1;
-    });
-    const favoriteStylist = Object.keys(stylistCount).reduce((a, b) => 
-      stylistCount[a] > stylistCount[b] ? a : b, ''
+  // Estadísticas sobre las citas cargadas
+  const stats = useMemo(() => {
+    const countBy = (key) => appointments.reduce((counts, apt) => {
+      const name = apt[key] || 'Desconocido';
+      counts[name] = (counts[name] || 0) + 1;
+      return counts;
+    }, {});
+    const mostFrequent = (counts) => Object.keys(counts).reduce((a, b) =>
+      counts[a] > counts[b] ? a : b, ''
     );
 
-    setStats({
+    return {
       total: appointments.length,
-      completed,
-      cancelled,
-      noShow,
-      favoriteService,
-      favoriteStylist
-    });
-  };
-
-  const filterAppointments = () => {
-    let filtered = [...appointments];
-
-    // Filtrar por estado
-    if (filterStatus !== 'all') {
-      filtered = filtered.filter(apt => apt.status === filterStatus);
-    }
+      completed: appointments.filter(a => a.status === 'completed').length,
+      favoriteService: mostFrequent(countBy('service_name')),
+      favoriteStylist: mostFrequent(countBy('stylist_name'))
+    };
+  }, [appointments]);
 
-    // Filtrar por búsqueda
-    if (searchTerm) {
-      filtered = filtered.filter(apt =>
+  // La búsqueda se aplica sobre las citas ya cargadas (vienen de la más reciente a la más antigua)
+  const filteredAppointments = searchTerm
+    ? appointments.filter(apt =>
         apt.service_name?.toLowerCase().includes(searchTerm.toLowerCase()) ||
         apt.stylist_name?.toLowerCase().includes(searchTerm.toLowerCase())
-      );
-    }
-
-    // Ordenar por fecha (más reciente primero)
-    filtered.sort((a, b) => new Date(b.date) - new Date(a.date));
-
-    setFilteredAppointments(filtered);
-  };
+      )
+    : appointments;
 
   const formatDate = (dateString) => {
     const date = new Date(dateString);
@@ -144,7 +81,7 @@ const AppointmentHistory = () => {
     return colors[status] || 'bg-gray-100 text-gray-800 border-gray-200';
   };
 
-  if (loading) {
+  if (loading && appointments.length === 0) {
     return (
       <div className="flex items-center justify-center h-screen">
         <div className="text-center">
@@ -220,6 +157,9 @@ const AppointmentHistory = () => {
           </div>
         </div>
       </div>
+      <p className="text-sm text-gray-500">
+        Calculado sobre las {appointments.length} citas cargadas{hasMore && ' (hay más)'}
+      </p>
 
       {/* Filtros y Búsqueda */}
       <div className="bg-white rounded-lg shadow-md p-6">
@@ -246,7 +186,7 @@ const AppointmentHistory = () => {
                   : 'bg-gray-100 text-gray-700 hover:bg-gray-200'
               }`}
             >
-              Todas ({stats.total})
+              Todas
             </button>
             <button
               onClick={() => setFilterStatus('completed')}
@@ -256,7 +196,7 @@ const AppointmentHistory = () => {
                   : 'bg-gray-100 text-gray-700 hover:bg-gray-200'
               }`}
             >
-              Completadas ({stats.completed})
+              Completadas
             </button>
             <button
               onClick={() => setFilterStatus('cancelled')}
@@ -266,7 +206,7 @@ const AppointmentHistory = () => {
                   : 'bg-gray-100 text-gray-700 hover:bg-gray-200'
               }`}
             >
-              Canceladas ({stats.cancelled})
+              Canceladas
             </button>
           </div>
         </div>
@@ -313,6 +253,7 @@ const AppointmentHistory = () => {
               </div>
             </div>
           ))}
+          <LoadMoreButton hasMore={hasMore} loading={loading} onClick={loadMore} />
         </div>
       ) : (
         <div className="bg-white rounded-lg shadow-md p-12 text-center">
@@ -1,37 +1,14 @@
-import React, { useState, useEffect } from 'react';
+import React, { useState } from 'react';
 import { Eye, Edit, Trash, Search, Calendar, Clock } from 'lucide-react';
 import appointmentService from '../../services/appointmentService';
+import { useAppointmentPages } from '../../hooks/useAppointmentPages';
+import LoadMoreButton from '../../components/LoadMoreButton';
 
 const MyAppointments = () => {
-  const [appointments, setAppointments] = useState([]);
-  const [loading, setLoading] = useState(true);
-  const [error, setError] = useState('');
   const [searchTerm, setSearchTerm] = useState('');
-
-  const fetchAppointments = async () => {
-    setLoading(true);
-    setError('');
-
-    try {
-      const data = await appointmentService.getMyAppointments();
-      setAppointments(data);
-    } catch (err) {
-      console.error('Error al obtener citas:', err);
-      if (err.response) {
-        setError(`Error: ${err.response.data.detail || 'No se pudieron cargar las citas'}`);
-      } else if (err.request) {
-        setError('No se pudo conectar con el servidor.');
-      } else {
-        setError('Error inesperado al obtener las citas.');
-      }
-    } finally {
-      setLoading(false);
-    }
-  };
-
-  useEffect(() => {
-    fetchAppointments();
-  }, []);
+  const { appointments, loading, error, hasMore, loadMore, reload } = useAppointmentPages(
+    appointmentService.getMyAppointments
+  );
 
   const handleCancel = async (appointmentId) => {
     if (!window.confirm('¿Estás seguro de cancelar esta cita?')) return;
@@ -39,7 +16,7 @@ const MyAppointments = () => {
     try {
       await appointmentService.cancelAppointment(appointmentId);
       alert('Cita cancelada exitosamente');
-      fetchAppointments(); 
+      reload();
     } catch (err) {
       alert('Error al cancelar la cita: ' + (err.response?.data?.detail || 'Error desconocido'));
     }
@@ -115,7 +92,7 @@ const MyAppointments = () => {
         </button>
       </div>
 
-      {loading ? (
+      {loading && appointments.length === 0 ? (
         <div className="text-center py-8">
           <div className="inline-block animate-spin rounded-full h-8 w-8 border-b-2 border-pink-600"></div>
           <p className="text-gray-600 mt-2">Cargando tus citas...</p>
@@ -173,6 +150,7 @@ const MyAppointments = () => {
               </div>
             </div>
           ))}
+          <LoadMoreButton hasMore={hasMore} loading={loading} onClick={loadMore} />
         </div>
       ) : (
         <div className="text-center py-12">
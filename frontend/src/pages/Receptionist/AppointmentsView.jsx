@@ -1,64 +1,40 @@
-import React, { useState, useEffect } from 'react';
+import React, { useState, useMemo } from 'react';
 import { Calendar, Clock, User, Scissors, Search, Eye, CheckCircle, XCircle } from 'lucide-react';
 import appointmentService from '../../services/appointmentService';
+import { useAppointmentPages } from '../../hooks/useAppointmentPages';
+import LoadMoreButton from '../../components/LoadMoreButton';
 
 const AppointmentsView = () => {
-  const [appointments, setAppointments] = useState([]);
-  const [filteredAppointments, setFilteredAppointments] = useState([]);
-  const [loading, setLoading] = useState(false);
-  const [error, setError] = useState('');
   const [searchTerm, setSearchTerm] = useState('');
   const [filterStatus, setFilterStatus] = useState('all');
+  const [updating, setUpdating] = useState(false);
   const [selectedAppointment, setSelectedAppointment] = useState(null);
   const [modalType, setModalType] = useState(null);
 
-  useEffect(() => {
-    loadAppointments();
-  }, []);
-
-  useEffect(() => {
-    filterAppointments();
-  }, [appointments, searchTerm, filterStatus]);
-
-  const loadAppointments = async () => {
-    setLoading(true);
-    setError('');
-
-    try {
-      const data = await appointmentService.listAllAppointments();
-      setAppointments(data);
-    } catch (err) {
-      console.error('Error al cargar citas:', err);
-      setError('No se pudieron cargar las citas');
-    } finally {
-      setLoading(false);
-    }
-  };
-
-  const filterAppointments = () => {
-    let filtered = [...appointments];
-
-    if (filterStatus !== 'all') {
-      filtered = filtered.filter(apt => apt.status === filterStatus);
-    }
+  // El estado se filtra en el servidor; cada cambio vuelve a la primera página
+  const filters = useMemo(
+    () => (filterStatus === 'all' ? {} : { status: filterStatus }),
+    [filterStatus]
+  );
+  const { appointments, loading, error, hasMore, loadMore, reload } = useAppointmentPages(
+    appointmentService.listAllAppointments,
+    filters
+  );
 
-    if (searchTerm) {
-      filtered = filtered.filter(apt =>
+  // La búsqueda por nombre se aplica sobre las citas ya cargadas (vienen de la más reciente a la más antigua)
+  const filteredAppointments = searchTerm
+    ? appointments.filter(apt =>
         apt.client_name?.toLowerCase().includes(searchTerm.toLowerCase()) ||
         apt.stylist_name?.toLowerCase().includes(searchTerm.toLowerCase()) ||
         apt.service_name?.toLowerCase().includes(searchTerm.toLowerCase())
-      );
-    }
-
-    filtered.sort((a, b) => new Date(b.date) - new Date(a.date));
-    setFilteredAppointments(filtered);
-  };
+      )
+    : appointments;
 
   const handleUpdateStatus = async (appointmentId, newStatus) => {
     try {
-      setLoading(true);
+      setUpdating(true);
       await appointmentService.updateAppointmentStatus(appointmentId, newStatus);
-      await loadAppointments();
+      await reload();
       setModalType(null);
       setSelectedAppointment(null);
       alert('Estado actualizado exitosamente');
@@ -66,7 +42,7 @@ const AppointmentsView = () => {
       console.error('Error al actualizar estado:', err);
       alert('Error: ' + (err.response?.data?.detail || err.message));
     } finally {
-      setLoading(false);
+      setUpdating(false);
     }
   };
 
@@ -161,6 +137,9 @@ const AppointmentsView = () => {
           <p className="text-3xl font-bold text-gray-800">{stats.completed}</p>
         </div>
       </div>
+      <p className="text-sm text-gray-500">
+        Conteos sobre las {appointments.length} citas cargadas{hasMore && ' (hay más)'}
+      </p>
 
       {/* Filters */}
       <div className="bg-white rounded-lg shadow-md p-6">
@@ -299,6 +278,8 @@ const AppointmentsView = () => {
         </div>
       )}
 
+      <LoadMoreButton hasMore={hasMore} loading={loading} onClick={loadMore} />
+
       {/* Modal Ver */}
       {modalType === 'view' && selectedAppointment && (
         <div className="fixed inset-0 bg-black bg-opacity-40 flex items-center justify-center z-50">
@@ -348,7 +329,7 @@ const AppointmentsView = () => {
               </button>
               <button
                 onClick={() => handleUpdateStatus(selectedAppointment.id, 'cancelled')}
-                disabled={loading}
+                disabled={updating}
                 className="bg-red-600 text-white px-4 py-2 rounded hover:bg-red-700"
               >
                 Sí, Cancelar
@@ -1,60 +1,32 @@
-import React, { useState, useEffect } from 'react';
+import React, { useState, useMemo } from 'react';
 import { Calendar, Clock, User, Scissors, Search, Eye } from 'lucide-react';
 import appointmentService from '../../services/appointmentService';
+import { useAppointmentPages } from '../../hooks/useAppointmentPages';
+import LoadMoreButton from '../../components/LoadMoreButton';
 
 const StylistAppointments = () => {
-  const [appointments, setAppointments] = useState([]);
-  const [filteredAppointments, setFilteredAppointments] = useState([]);
-  const [loading, setLoading] = useState(false);
-  const [error, setError] = useState('');
   const [searchTerm, setSearchTerm] = useState('');
   const [filterStatus, setFilterStatus] = useState('all');
   const [selectedAppointment, setSelectedAppointment] = useState(null);
   const [showModal, setShowModal] = useState(false);
 
-  useEffect(() => {
-    loadMyAppointments();
-  }, []);
-
-  useEffect(() => {
-    filterAppointments();
-  }, [appointments, searchTerm, filterStatus]);
-
-  const loadMyAppointments = async () => {
-    setLoading(true);
-    setError('');
-
-    try {
-      const data = await appointmentService.getMyAppointments();
-      setAppointments(data);
-    } catch (err) {
-      console.error('Error al cargar mis citas:', err);
-      setError('No se pudieron cargar las citas');
-    } finally {
-      setLoading(false);
-    }
-  };
-
-  const filterAppointments = () => {
-    let filtered = [...appointments];
-
-    // Filtrar por estado
-    if (filterStatus !== 'all') {
-      filtered = filtered.filter(apt => apt.status === filterStatus);
-    }
+  // El estado se filtra en el servidor; cada cambio vuelve a la primera página
+  const filters = useMemo(
+    () => (filterStatus === 'all' ? {} : { status: filterStatus }),
+    [filterStatus]
+  );
+  const { appointments, loading, error, hasMore, loadMore } = useAppointmentPages(
+    appointmentService.getMyAppointments,
+    filters
+  );
 
-    // Filtrar por búsqueda
-    if (searchTerm) {
-      filtered = filtered.filter(apt =>
+  // La búsqueda se aplica sobre las citas ya cargadas (en orden cronológico)
+  const filteredAppointments = searchTerm
+    ? appointments.filter(apt =>
         apt.client_name?.toLowerCase().includes(searchTerm.toLowerCase()) ||
         apt.service_name?.toLowerCase().includes(searchTerm.toLowerCase())
-      );
-    }
-
-    // Ordenar por fecha (más reciente primero)
-    filtered.sort((a, b) => new Date(b.date) - new Date(a.date));
-    setFilteredAppointments(filtered);
-  };
+      )
+    : appointments;
 
   const formatDate = (dateString) => {
     const date = new Date(dateString);
@@ -147,6 +119,9 @@ const StylistAppointments = () => {
           <p className="text-3xl font-bold text-gray-800">{stats.completed}</p>
         </div>
       </div>
+      <p className="text-sm text-gray-500">
+        Conteos sobre las {appointments.length} citas cargadas{hasMore && ' (hay más)'}
+      </p>
 
       {/* Filters */}
       <div className="bg-white rounded-lg shadow-md p-6">
@@ -253,6 +228,8 @@ const StylistAppointments = () => {
         </div>
       )}
 
+      <LoadMoreButton hasMore={hasMore} loading={loading} onClick={loadMore} />
+
       {/* Modal Ver Detalles */}
       {showModal && selectedAppointment && (
         <div className="fixed inset-0 bg-black bg-opacity-40 flex items-center justify-center z-50">
@@ -1,63 +1,27 @@
-import React, { useState, useEffect } from 'react';
+import React, { useState, useMemo } from 'react';
 import { History, Calendar, Clock, User, Scissors, Search } from 'lucide-react';
 import appointmentService from '../../services/appointmentService';
+import { useAppointmentPages } from '../../hooks/useAppointmentPages';
+import LoadMoreButton from '../../components/LoadMoreButton';
 
 const StylistHistory = () => {
-  const [history, setHistory] = useState([]);
-  const [filteredHistory, setFilteredHistory] = useState([]);
-  const [loading, setLoading] = useState(false);
-  const [error, setError] = useState('');
   const [searchTerm, setSearchTerm] = useState('');
+  // Se fija al montar para que los filtros no cambien en cada render
+  const [now] = useState(() => new Date().toISOString());
+
+  // Solo citas pasadas; el servidor las devuelve en orden cronológico
+  const filters = useMemo(() => ({ date_to: now }), [now]);
+  const { appointments: history, loading, error, hasMore, loadMore } = useAppointmentPages(
+    appointmentService.getMyAppointments,
+    filters
+  );
 
-  useEffect(() => {
-    loadHistory();
-  }, []);
-
-  useEffect(() => {
-    filterHistory();
-    // eslint-disable-next-line react-hooks/exhaustive-deps
-  }, [history, searchTerm]);
-
-  const loadHistory = async () => {
-    setLoading(true);
-    setError('');
-
-    try {
-      const data = await appointmentService.getMyAppointments();
-      
-      // Filtrar solo citas pasadas (completed, cancelled, no-show)
-      const now = new Date();
-      const pastAppointments = data.filter(apt => {
-        const appointmentDate = new Date(apt.date);
-        return appointmentDate < now || ['completed', 'cancelled', 'no-show'].includes(apt.status);
-      });
-      
-      setHistory(pastAppointments);
-    } catch (err) {
-      console.error('Error al cargar historial:', err);
-      setError('No se pudo cargar el historial');
-    } finally {
-      setLoading(false);
-    }
-  };
-
-  const filterHistory = () => {
-    if (!searchTerm) {
-      // Ordenar por fecha descendente (más reciente primero)
-      const sorted = [...history].sort((a, b) => new Date(b.date) - new Date(a.date));
-      setFilteredHistory(sorted);
-      return;
-    }
-
-    const filtered = history.filter(appointment =>
-      appointment.client_name?.toLowerCase().includes(searchTerm.toLowerCase()) ||
-      appointment.service_name?.toLowerCase().includes(searchTerm.toLowerCase())
-    );
-
-    // Ordenar por fecha descendente (más reciente primero)
-    const sorted = filtered.sort((a, b) => new Date(b.date) - new Date(a.date));
-    setFilteredHistory(sorted);
-  };
+  const filteredHistory = searchTerm
+    ? history.filter(appointment =>
+        appointment.client_name?.toLowerCase().includes(searchTerm.toLowerCase()) ||
+        appointment.service_name?.toLowerCase().includes(searchTerm.toLowerCase())
+      )
+    : history;
 
   const formatDate = (dateString) => {
     const date = new Date(dateString);
@@ -146,6 +110,9 @@ const StylistHistory = () => {
           <p className="text-3xl font-bold text-gray-800">{stats.noShow}</p>
         </div>
       </div>
+      <p className="text-sm text-gray-500">
+        Conteos sobre las {history.length} citas cargadas{hasMore && ' (hay más)'}
+      </p>
 
       {/* Search Bar */}
       <div className="bg-white rounded-lg shadow-md p-6">
@@ -198,6 +165,7 @@ const StylistHistory = () => {
               </div>
             </div>
           ))}
+          <LoadMoreButton hasMore={hasMore} loading={loading} onClick={loadMore} />
         </div>
       ) : (
         <div className="bg-white rounded-lg shadow-md p-12 text-center">
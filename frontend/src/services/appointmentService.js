@@ -1,17 +1,30 @@
 import api from './api';
 
+// Tamaño de página de los listados de citas (el backend acepta hasta 200)
+export const APPOINTMENTS_PAGE_SIZE = 50;
+
+// El backend pagina los listados por cursor: cada llamada trae una página y
+// el cursor de la siguiente viene en X-Next-Cursor (null si no hay más)
+const fetchPage = async (url, filters = {}, cursor = null) => {
+  const response = await api.get(url, {
+    params: { ...filters, limit: APPOINTMENTS_PAGE_SIZE, ...(cursor && { cursor }) },
+  });
+  return {
+    appointments: response.data,
+    nextCursor: response.headers['x-next-cursor'] || null,
+  };
+};
+
 const appointmentService = {
   
-  // Listar MIS citas (según rol)
-  getMyAppointments: async () => {
-    const response = await api.get('/appointments/my-appointments');
-    return response.data;
+  // Una página de MIS citas (según rol); filtros: status, date_from, date_to
+  getMyAppointments: async (filters, cursor) => {
+    return fetchPage('/appointments/my-appointments', filters, cursor);
   },
 
-  // Listar TODAS las citas (solo admin/receptionist)
-  listAllAppointments: async () => {
-    const response = await api.get('/appointments');
-    return response.data;
+  // Una página de TODAS las citas (solo admin/receptionist)
+  listAllAppointments: async (filters, cursor) => {
+    return fetchPage('/appointments', filters, cursor);
   },
 
   // Obtener una cita por ID